@@ -1,7 +1,7 @@
 #!/bin/bash
 
 # Temporarily set the PYTHONPATH to include the 'src' directory
-export PYTHONPATH=$(pwd)/src
+export PYTHONPATH=$(pwd)/src:$(pwd)/src/michael_version
 
 # Run the tests using unittest
 python3 -m unittest discover -s tests
@@ -0,0 +1,168 @@
+import numpy as np
+
+from radar import RADAR_DEGREES, RADAR_MAX_LENGTH, cast_rays
+
+# Per-action heading and speed changes, indexed by action, mirroring Car.perform_action
+TURN_ANGLES = np.array([3, 6, -3, -6, 0, 0, 0], dtype=np.float64)
+ACCELERATE, DECELERATE, REVERSE = 4, 5, 6
+
+
+class BatchCarSimulator:
+    """Structure-of-arrays simulator for many cars sharing one environment.
+
+    Car state lives in NumPy arrays of length num_cars and every step (actions, kinematics,
+    collision and radar) is applied to all cars at once. Nothing here touches pygame, so it
+    runs without a display.
+    """
+
+    def __init__(self, environment, num_cars, car_width=10, car_height=10, radar_degrees=RADAR_DEGREES,
+                 radar_length=RADAR_MAX_LENGTH, visit_cell_size=None):
+        self.environment = environment
+        self.num_cars = num_cars
+        self.car_width = car_width
+        self.car_height = car_height
+        self.radar_degrees = np.asarray(radar_degrees, dtype=np.float64)
+        self.radar_length = radar_length
+        self.state_size = 2 + len(self.radar_degrees)  # Speed + Angle + radar distances, as in Car.get_state
+
+        self.x = np.zeros(num_cars)
+        self.y = np.zeros(num_cars)
+        self.angle = np.zeros(num_cars)
+        self.speed = np.zeros(num_cars)
+        self.alive = np.ones(num_cars, dtype=bool)
+
+        beams = (num_cars, len(self.radar_degrees))
+        self.radar_xs = np.zeros(beams, dtype=np.int64)
+        self.radar_ys = np.zeros(beams, dtype=np.int64)
+        self.radar_distances = np.full(beams, radar_length, dtype=np.int64)
+
+        # Optional per-car visited grid for the novelty reward, like Car.map; None leaves that term out
+        self.visit_cell_size = visit_cell_size
+        self.visited = None
+        if visit_cell_size is not None:
+            rows = -(-environment.screen_height // visit_cell_size)
+            columns = -(-environment.screen_width // visit_cell_size)
+            self.visited = np.zeros((num_cars, rows, columns), dtype=bool)
+
+    def reset(self, indices=None):
+        """Put the selected cars (default all) back at the environment's start and return all states."""
+        if indices is None:
+            indices = slice(None)
+        self.x[indices] = self.environment.start_x
+        self.y[indices] = self.environment.start_y
+        self.angle[indices] = 0
+        self.speed[indices] = 0
+        self.alive[indices] = True
+        self.radar_distances[indices] = self.radar_length
+        if self.visited is not None:
+            self.visited[indices] = False
+        return self.get_states()
+
+    def rect_lefts(self):
+        # pygame.Rect rounds float coordinates half away from zero
+        return np.trunc(self.x + np.copysign(0.5, self.x)).astype(np.int64)
+
+    def rect_tops(self):
+        return np.trunc(self.y + np.copysign(0.5, self.y)).astype(np.int64)
+
+    def centers(self):
+        return self.rect_lefts() + self.car_width // 2, self.rect_tops() + self.car_height // 2
+
+    def perform_actions(self, actions):
+        """Apply one action per car with the same semantics as Car.perform_action."""
+        actions = np.asarray(actions)
+        live = self.alive
+        self.angle += np.where(live, TURN_ANGLES[actions], 0)
+
+        accelerate = live & (actions == ACCELERATE)
+        decelerate = live & (actions == DECELERATE)
+        reverse = live & (actions == REVERSE)
+        self.speed[accelerate] = np.minimum(self.speed[accelerate] + 0.5, 10)
+        self.speed[decelerate] = np.maximum(self.speed[decelerate] - 0.5, 2)
+        self.speed[reverse] = -np.minimum(np.abs(self.speed[reverse]) + 0.5, 2)
+
+        self.alive &= ~self.detect_collisions()
+
+    def update(self):
+        """Move every live car, sense with radar and kill the cars that collided."""
+        live = np.flatnonzero(self.alive)
+        radians = np.radians(self.angle[live])
+        self.x[live] += np.cos(radians) * self.speed[live]
+        self.y[live] += np.sin(radians) * self.speed[live]
+
+        if self.visited is not None:
+            self.mark_visited(live, self.x[live], self.y[live])  # Car.update marks its top-left corner
+        self.sense(live)
+        self.alive &= ~self.detect_collisions()
+
+    def mark_visited(self, indices, xs, ys):
+        """Mark the cells under the selected cars' points as visited, like ExplorationMap.mark_visited.
+
+        Returns a mask of the points that fell in a cell the car had not visited before; points off
+        the map are ignored and never new.
+        """
+        xs, ys = np.trunc(xs).astype(np.int64), np.trunc(ys).astype(np.int64)
+        inside = (xs >= 0) & (ys >= 0) & (xs < self.environment.screen_width) & (ys < self.environment.screen_height)
+        cars, rows, columns = indices[inside], ys[inside] // self.visit_cell_size, xs[inside] // self.visit_cell_size
+        new = np.zeros(len(xs), dtype=bool)
+        new[inside] = ~self.visited[cars, rows, columns]
+        self.visited[cars, rows, columns] = True
+        return new
+
+    def sense(self, indices):
+        """Cast the radar beams of the selected cars in one batch."""
+        center_xs, center_ys = self.centers()
+        center_xs, center_ys = center_xs[indices], center_ys[indices]
+        angles = np.radians(self.angle[indices, None] + self.radar_degrees)
+        origin_xs = np.broadcast_to(center_xs[:, None], angles.shape).astype(np.float64)
+        origin_ys = np.broadcast_to(center_ys[:, None], angles.shape).astype(np.float64)
+        xs, ys, distances = cast_rays(self.environment, origin_xs, origin_ys, angles, self.radar_length)
+        self.radar_xs[indices] = xs
+        self.radar_ys[indices] = ys
+        self.radar_distances[indices] = distances
+
+    def detect_collisions(self):
+        """Return a mask of cars that are out of bounds or whose center is on an obstacle."""
+        lefts, tops = self.rect_lefts(), self.rect_tops()
+        out_of_bounds = ((lefts < 0) | (lefts + self.car_width > self.environment.screen_width) |
+                         (tops < 0) | (tops + self.car_height > self.environment.screen_height))
+        return out_of_bounds | self.environment.are_positions_obstacles(lefts + self.car_width // 2,
+                                                                        tops + self.car_height // 2)
+
+    def step(self, actions):
+        """Apply actions, advance the simulation and return (states, rewards, dones) for every car."""
+        self.perform_actions(actions)
+        self.update()
+        rewards = self.get_rewards()
+        return self.get_states(), rewards, ~self.alive
+
+    def get_states(self):
+        """Return the (num_cars, state_size) float32 observations: speed, angle and radar distances."""
+        states = np.empty((self.num_cars, self.state_size), dtype=np.float32)
+        states[:, 0] = self.speed
+        states[:, 1] = self.angle
+        states[:, 2:] = self.radar_distances
+        return states
+
+    def get_rewards(self):
+        """Vectorized Car.get_reward; the novelty term is only included when visits are tracked."""
+        distances = self.radar_distances
+        min_distances = distances.min(axis=1)
+        rewards = np.where(min_distances < 35, -(35 - min_distances) * 2.0, 0.0)
+        rewards += np.where(self.speed > 0, 0.1, 0)
+
+        if self.visited is not None:
+            center_xs, center_ys = self.centers()
+            new_cells = self.mark_visited(np.arange(self.num_cars), center_xs, center_ys)
+            rewards += np.where(new_cells, 50, -0.1)
+
+        rewards += np.where(min_distances > 50, 5, 0)
+
+        third = distances.shape[1] // 3
+        left_values = distances[:, :third].sum(axis=1)
+        right_values = distances[:, -third:].sum(axis=1)
+        forward_values = distances[:, third:-third].sum(axis=1)
+        rewards += np.where(forward_values >= np.maximum(left_values, right_values), 2, 1)
+
+        rewards -= np.where(self.alive, 0, 100)
+        return rewards
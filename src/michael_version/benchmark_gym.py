@@ -0,0 +1,69 @@
+import sys
+import time
+
+import gymnasium as gym
+
+import gym_env  # Registers the environment IDs
+
+
+def time_vector_env(env, steps):
+    """Return environment steps per second for random actions on a gymnasium vector env."""
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(env.action_space.sample())
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps * env.num_envs / elapsed
+
+
+def time_single_env(env_id, steps):
+    env = gym.make(env_id)
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps / elapsed
+
+
+def time_sb3(env_id, num_envs, timesteps):
+    """Time SB3 DQN and PPO learning on SubprocVecEnv workers, if stable_baselines3 is installed."""
+    try:
+        from stable_baselines3 import DQN, PPO
+        from stable_baselines3.common.env_util import make_vec_env
+        from stable_baselines3.common.vec_env import SubprocVecEnv
+    except ImportError:
+        print("stable_baselines3 is not installed; skipping the SB3 comparison")
+        return
+
+    for algorithm in (DQN, PPO):
+        vec_env = make_vec_env(env_id, n_envs=num_envs, vec_env_cls=SubprocVecEnv)
+        model = algorithm('MlpPolicy', vec_env, verbose=0)
+        start = time.perf_counter()
+        model.learn(total_timesteps=timesteps)
+        elapsed = time.perf_counter() - start
+        vec_env.close()
+        print(f"SB3 {algorithm.__name__} on SubprocVecEnv x{num_envs}: {timesteps / elapsed:10.0f} steps/s")
+
+
+def run_benchmark(env_id='CarObstacles-v0', num_envs=8, steps=500):
+    print(f"{env_id}, {num_envs} envs, {steps} vector steps")
+    print(f"Single CarGymEnv:           {time_single_env(env_id, steps):10.0f} steps/s")
+    for mode in ('sync', 'async'):
+        env = gym.make_vec(env_id, num_envs=num_envs, vectorization_mode=mode)
+        print(f"{mode:>5} vector env x{num_envs}:     {time_vector_env(env, steps):10.0f} steps/s")
+    env = gym_env.CarVectorEnv(num_envs, gym_env.ENV_IDS[env_id])
+    print(f"CarVectorEnv x{num_envs}:            {time_vector_env(env, steps):10.0f} steps/s")
+    time_sb3(env_id, num_envs, steps * num_envs)
+
+
+if __name__ == "__main__":
+    # Usage: python benchmark_gym.py [env_id] [num_envs] [steps]
+    env_id = sys.argv[1] if len(sys.argv) > 1 else 'CarObstacles-v0'
+    num_envs = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    run_benchmark(env_id, num_envs, steps)
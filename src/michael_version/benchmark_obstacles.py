@@ -0,0 +1,83 @@
+import random
+import sys
+import time
+
+from environment import Environment
+from rect import Rect
+
+SCREEN_SIZE = 6000  # Square screen large enough for tens of thousands of small obstacles
+OBSTACLE_SIZE = (5, 20)
+MIN_GAP = 4
+
+
+def generate_obstacles_linear(environment):
+    """The previous placement loop: every candidate is checked against every placed obstacle."""
+    min_size, max_size = environment.obstacle_size
+    min_gap = environment.min_gap
+    obstacles = []
+    for _ in range(environment.obstacle_count):
+        for attempt in range(1000):
+            width = environment.rng.randint(min_size, max_size)
+            height = environment.rng.randint(min_size, max_size)
+            x = environment.rng.randint(0, environment.screen_width - width)
+            y = environment.rng.randint(0, environment.screen_height - height)
+            new_obstacle = Rect(x, y, width, height)
+            if all(not new_obstacle.colliderect(existing.inflate(min_gap, min_gap)) for existing in obstacles):
+                obstacles.append(new_obstacle)
+                break
+    return obstacles
+
+
+def _time_per_call(query, arguments):
+    start = time.perf_counter()
+    for argument in arguments:
+        query(*argument)
+    return (time.perf_counter() - start) / len(arguments) * 1e6
+
+
+def time_queries(environment, queries=2000, seed=0):
+    """Return microseconds per rect query and per point query, indexed and by linear scan."""
+    rng = random.Random(seed)
+    rects = [((rng.randrange(SCREEN_SIZE), rng.randrange(SCREEN_SIZE), 40, 40),) for _ in range(queries)]
+    points = [(rng.randrange(SCREEN_SIZE), rng.randrange(SCREEN_SIZE)) for _ in range(queries)]
+    obstacles = environment.obstacles
+
+    def rect_linear(rect):
+        return [obstacle for obstacle in obstacles if obstacle.colliderect(rect)]
+
+    def point_linear(x, y):
+        return next((o for o in obstacles if o.x <= x < o.right and o.y <= y < o.bottom), None)
+
+    return (_time_per_call(environment.obstacles_in_rect, rects), _time_per_call(rect_linear, rects),
+            _time_per_call(environment.obstacle_at, points), _time_per_call(point_linear, points))
+
+
+def run_benchmark(counts=(100, 1000, 5000, 10000, 20000), linear_limit=5000):
+    """Sweep the obstacle count; the O(n^2) placement is only timed up to linear_limit obstacles."""
+    print(f"{SCREEN_SIZE}x{SCREEN_SIZE} screen, obstacles {OBSTACLE_SIZE[0]}-{OBSTACLE_SIZE[1]} px")
+    print(f"{'count':>7} {'placed':>7} {'generate':>10} {'linear':>10} "
+          f"{'rect us':>8} {'linear':>8} {'point us':>9} {'linear':>8}")
+    for count in counts:
+        start = time.perf_counter()
+        environment = Environment(SCREEN_SIZE, SCREEN_SIZE, count, seed=0, obstacle_size=OBSTACLE_SIZE,
+                                  min_gap=MIN_GAP)
+        generate = time.perf_counter() - start
+
+        linear = '-'
+        if count <= linear_limit:
+            environment.rng = random.Random(0)
+            start = time.perf_counter()
+            generate_obstacles_linear(environment)
+            linear = f"{time.perf_counter() - start:.2f}s"
+
+        rect_indexed, rect_linear, point_indexed, point_linear = time_queries(environment)
+        print(f"{count:>7} {len(environment.obstacles):>7} {generate:>9.2f}s {linear:>10} "
+              f"{rect_indexed:>8.1f} {rect_linear:>8.1f} {point_indexed:>9.1f} {point_linear:>8.1f}")
+
+
+if __name__ == "__main__":
+    # Usage: python benchmark_obstacles.py [count ...]
+    if len(sys.argv) > 1:
+        run_benchmark(tuple(int(count) for count in sys.argv[1:]))
+    else:
+        run_benchmark()
@@ -0,0 +1,60 @@
+import sys
+import time
+
+import numpy as np
+
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
+
+
+def fill_buffer(buffer):
+    """Mark every slot as filled without paying for capacity individual inserts."""
+    buffer.states[:] = np.random.rand(*buffer.states.shape)
+    buffer.next_states[:] = buffer.states
+    buffer.actions[:] = np.random.randint(0, 7, size=buffer.capacity)
+    buffer.rewards[:] = np.random.randn(buffer.capacity)
+    buffer.size = buffer.capacity
+    if isinstance(buffer, PrioritizedReplayBuffer):
+        buffer.tree.update(np.arange(buffer.capacity), np.random.rand(buffer.capacity) ** buffer.alpha)
+
+
+def time_sampling(buffer, batch_size, iterations):
+    """Return the mean wall-clock time in microseconds of one minibatch sample."""
+    buffer.sample(batch_size)  # Warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        buffer.sample(batch_size)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def time_priority_update(buffer, batch_size, iterations):
+    """Return the mean wall-clock time in microseconds of refreshing one batch of priorities."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        indices = np.random.randint(0, buffer.size, size=batch_size)
+        buffer.update_priorities(indices, np.random.randn(batch_size))
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_benchmark(capacities=(100_000, 1_000_000), state_size=26, batch_size=64, iterations=1000):
+    print(f"Replay sampling benchmark (state size {state_size}, batch size {batch_size})")
+    print(f"{'capacity':>10} {'uniform us':>12} {'prioritized us':>15} {'priority update us':>19}")
+    for capacity in capacities:
+        uniform = ReplayBuffer(capacity, state_size)
+        fill_buffer(uniform)
+        uniform_time = time_sampling(uniform, batch_size, iterations)
+        del uniform
+
+        prioritized = PrioritizedReplayBuffer(capacity, state_size)
+        fill_buffer(prioritized)
+        prioritized_time = time_sampling(prioritized, batch_size, iterations)
+        update_time = time_priority_update(prioritized, batch_size, iterations)
+        del prioritized
+
+        print(f"{capacity:>10} {uniform_time:>12.1f} {prioritized_time:>15.1f} {update_time:>19.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_benchmark(capacities=tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run_benchmark()
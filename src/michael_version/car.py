@@ -1,34 +1,70 @@
 import math
-import pygame
+from collections import deque
+
+import numpy as np
+
+from collision import sweep_environment
 from colours import BLACK, GREEN
+from exploration_map import ExplorationMap
+from radar import RADAR_DEGREES, RADAR_MAX_LENGTH, cast_radar
+from rect import Rect
+
+TRAIL_COLORKEY = (255, 0, 255)
+
+# 'center' checks the rect's center pixel after each move; 'swept' tests the rect's whole motion
+COLLISION_MODES = ('center', 'swept')
+
+RADAR_COUNT = len(RADAR_DEGREES)
+STATE_SIZE = 2 + RADAR_COUNT  # Speed + Angle + radar distances
+# Multipliers that bring speed, angle (in turns) and radar distances to roughly unit scale
+STATE_SCALE = np.array([1 / 10, 1 / 360] + [1 / RADAR_MAX_LENGTH] * RADAR_COUNT, dtype=np.float32)
 
 class Car:
-    def __init__(self, x, y, environment, visualize=False):
+    def __init__(self, x, y, environment, visualize=False, map_resolution=1, path_limit=None, path_stride=1,
+                 collision_mode='center'):
+        if collision_mode not in COLLISION_MODES:
+            raise ValueError(f"Unknown collision mode {collision_mode!r}, expected one of {COLLISION_MODES}")
+        self.collision_mode = collision_mode
         self.x = x
         self.y = y
         self.angle = 0
         self.speed = 0
         self.environment = environment
         self.is_alive = True
-        self.visited_positions = set()
-        self.path = []
-        self.radars = []
+        # Every path_stride-th position, keeping at most path_limit of the newest ones (None keeps all)
+        self.path = deque(maxlen=path_limit)
+        self.path_stride = path_stride
+        self.path_steps = 0
+        # Latest radar scan; distances read max length until the first scan
+        self.radar_xs = np.zeros(RADAR_COUNT, dtype=np.int64)
+        self.radar_ys = np.zeros(RADAR_COUNT, dtype=np.int64)
+        self.radar_distances = np.full(RADAR_COUNT, RADAR_MAX_LENGTH, dtype=np.float32)
+        self.radar_scanned = False
+        # get_state alternates between two buffers, so the previous state stays valid for one more step
+        self.state_buffers = np.zeros((2, STATE_SIZE), dtype=np.float32)
+        self.state_index = 0
         self.visualize = visualize
-        self.map = {}
+        # Visited cells and radar-detected obstacles, one byte per map cell
+        self.map = ExplorationMap(environment.screen_width, environment.screen_height, map_resolution)
 
         # Car dimensions
         self.width = 10
         self.height = 10
         self.color = GREEN
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect = Rect(self.x, self.y, self.width, self.height)
+
+        # Persistent trail layer: each frame only draws the segments added since the previous frame
+        self.trail_surface = None
+        self.trail_points = []  # Path points not yet drawn onto the trail layer
+        self.trail_end = None  # Last point drawn onto the trail layer
 
     def draw(self, screen):
         if not self.visualize:
             return
+        import pygame  # Only needed when rendering, so headless runs never load it
 
         # Draw the path taken by the car
-        for i in range(1, len(self.path)):
-            pygame.draw.line(screen, BLACK, self.path[i - 1], self.path[i], 2)
+        self.draw_trail(screen)
 
         # Draw the car on the screen as a rectangle
         pygame.draw.rect(screen, self.color, self.rect)
@@ -36,59 +72,94 @@ class Car:
         # Draw radar lines and values
         self.draw_radar(screen)
 
-    def update(self, environment):
+    def update(self, environment, sense=True):
+        """Move the car one physics step; sense=False skips the radar sweep, e.g. on repeated-action substeps."""
         # Update the car's position
+        start_x, start_y = self.x, self.y
+        start_rect = tuple(self.rect)
         self.x += math.cos(math.radians(self.angle)) * self.speed
         self.y += math.sin(math.radians(self.angle)) * self.speed
         self.rect.topleft = (self.x, self.y)
 
-        # Store the position in the path and mark the current position as visited
-        self.path.append((self.x, self.y))
-        self.visited_positions.add((int(self.x), int(self.y)))
-        self.map[(int(self.x), int(self.y))] = 'visited'
-
-        # Clear radar data
-        self.radars.clear()
+        collided = False
+        if self.collision_mode == 'swept':
+            # Test the whole move at once, so fast cars cannot pass through thin walls between steps
+            impact = sweep_environment(environment, start_rect, self.rect.x - start_rect[0],
+                                       self.rect.y - start_rect[1])
+            if impact is not None:
+                collided = True
+                # Stop where the rect first touches the obstacle instead of inside or beyond it
+                self.x = start_x + (self.x - start_x) * impact
+                self.y = start_y + (self.y - start_y) * impact
+                self.rect.topleft = (self.x, self.y)
 
-        # Check radar distances at various angles (360 degrees)
-        for d in range(0, 360, 15):  # Increased resolution of radar beams
-            self.check_radar(d, environment)
+        # Store the position in the path and mark the current position as visited
+        if self.path_steps % self.path_stride == 0:
+            self.path.append((self.x, self.y))
+            if self.visualize:
+                self.trail_points.append((self.x, self.y))
+        self.path_steps += 1
+        self.map.mark_visited(self.x, self.y)
 
-        # Mark obstacles on the map
-        for radar in self.radars:
-            position, distance = radar
-            if environment.is_position_obstacle(position[0], position[1]):
-                self.map[(int(position[0]), int(position[1]))] = 'obstacle'
+        if sense:
+            self.sense(environment)
 
         # Check collision with obstacles or out of bounds
-        if self.detect_collision(environment):
+        if collided or (self.collision_mode == 'center' and self.detect_collision(environment)):
             self.is_alive = False
 
-    def check_radar(self, degree, environment):
-        radar_length = 0
-        x = int(self.rect.centerx)
-        y = int(self.rect.centery)
-
-        angle_rad = math.radians(self.angle + degree)
-        while radar_length < 100:  # Max radar length
-            radar_length += 1
-            x = int(self.rect.centerx + math.cos(angle_rad) * radar_length)
-            y = int(self.rect.centery + math.sin(angle_rad) * radar_length)
+    def sense(self, environment):
+        """Sweep the radar from the car's current position and mark the obstacles it hits on the map."""
+        # Check radar distances at various angles (360 degrees), casting every beam at once
+        xs, ys, distances = cast_radar(environment, self.rect.centerx, self.rect.centery, self.angle)
+        self.radar_xs, self.radar_ys = xs, ys
+        self.radar_distances[:] = distances
+        self.radar_scanned = True
 
-            # Break if radar is out of bounds
-            if x < 0 or y < 0 or x >= environment.screen_width or y >= environment.screen_height:
-                break
-
-            # Check for obstacles
-            if environment.is_position_obstacle(x, y):
-                break
+        # Mark obstacles on the map
+        hits = environment.are_positions_obstacles(xs, ys)
+        if hits.any():
+            self.map.mark_obstacles(xs[hits], ys[hits])
+
+    def draw_trail(self, screen):
+        import pygame
+
+        if self.trail_surface is None or self.trail_surface.get_size() != screen.get_size():
+            # Magenta never appears in the trail, so it marks the transparent pixels
+            self.trail_surface = pygame.Surface(screen.get_size())
+            self.trail_surface.fill(TRAIL_COLORKEY)
+            self.trail_surface.set_colorkey(TRAIL_COLORKEY)
+            self.trail_end = None
+            self.trail_points = list(self.path)
+
+        points = self.trail_points if self.trail_end is None else [self.trail_end] + self.trail_points
+        for i in range(1, len(points)):
+            pygame.draw.line(self.trail_surface, BLACK, points[i - 1], points[i], 2)
+        if points:
+            self.trail_end = points[-1]
+        self.trail_points.clear()
+
+        screen.blit(self.trail_surface, (0, 0))
+
+    @property
+    def radars(self):
+        """The latest scan as [(x, y), distance] pairs, built on demand for drawing and inspection."""
+        if not self.radar_scanned:
+            return []
+        return [[(x, y), distance] for x, y, distance in
+                zip(self.radar_xs.tolist(), self.radar_ys.tolist(), self.radar_distances.astype(np.int64).tolist())]
 
-        dist = int(math.sqrt(math.pow(x - self.rect.centerx, 2) + math.pow(y - self.rect.centery, 2)))
-        self.radars.append([(x, y), dist])
+    def check_radar(self, degree, environment):
+        """Cast a single radar beam at degree relative to the car's heading and return [(x, y), distance]."""
+        xs, ys, distances = cast_radar(environment, self.rect.centerx, self.rect.centery, self.angle, [degree],
+                                       RADAR_MAX_LENGTH)
+        return [(int(xs[0]), int(ys[0])), int(distances[0])]
 
     def draw_radar(self, screen):
         if not self.visualize:
             return
+        import pygame
+        from fonts import render_text
 
         # Draw radar lines on the screen
         for radar in self.radars:
@@ -96,9 +167,7 @@ class Car:
             pygame.draw.line(screen, GREEN, self.rect.center, position, 1)
             pygame.draw.circle(screen, GREEN, position, 3)
 
-            font = pygame.font.Font(None, 24)
-            text = font.render(str(distance), True, BLACK)
-            screen.blit(text, position)
+            screen.blit(render_text(str(distance), 24, BLACK), position)
 
     def perform_action(self, action):
         if action == 0:  # Small left turn
@@ -126,56 +195,54 @@ class Car:
         self.angle = 0
         self.speed = 0
         self.is_alive = True
-        self.radars.clear()
-        self.visited_positions.clear()
+        self.radar_distances[:] = RADAR_MAX_LENGTH
+        self.radar_scanned = False
         self.path.clear()
+        self.path_steps = 0
+        self.trail_points.clear()
+        self.trail_end = None
+        if self.trail_surface is not None:
+            self.trail_surface.fill(TRAIL_COLORKEY)
         self.map.clear()
         self.rect.topleft = (self.x, self.y)
 
-        # Initialize radars to some default values (e.g., max distance)
-        for d in range(0, 360, 30):
-            self.radars.append([(self.x, self.y), 100])
-
-    def get_state(self):
-        state = [self.speed, self.angle]
-
-        fixed_radar_count = 24  # Increased radar count for better sensing
-
-        while len(self.radars) < fixed_radar_count:
-            self.radars.append([(self.x, self.y), 100])
-
-        for radar in self.radars:
-            state.append(radar[1])
-
-        fixed_state_size = 26  # Speed + Angle + 24 radar distances
-        while len(state) < fixed_state_size:
-            state.append(0)
-
-        return state
+    def get_state(self, out=None, normalize=False):
+        """Write speed, angle and the radar distances into a float32 array and return it.
+
+        Without out, the two internal buffers are used in turn: the returned array is overwritten
+        two calls later, so copy it to keep it longer. normalize scales the values by STATE_SCALE.
+        """
+        if out is None:
+            out = self.state_buffers[self.state_index]
+            self.state_index ^= 1
+        out[0] = self.speed
+        out[1] = self.angle
+        out[2:] = self.radar_distances
+        if normalize:
+            out *= STATE_SCALE
+        return out
 
     def get_reward(self):
         reward = 0
 
-        min_distance_to_obstacle = min(radar[1] for radar in self.radars)
+        distances = self.radar_distances
+        min_distance_to_obstacle = float(distances.min())
         if min_distance_to_obstacle < 35:
             reward -= (35 - min_distance_to_obstacle) * 2
 
         if self.speed > 0:
             reward += 0.1
 
-        current_position = (int(self.rect.centerx), int(self.rect.centery))
-        if current_position not in self.visited_positions:
+        if self.map.mark_visited(self.rect.centerx, self.rect.centery):
             reward += 50  # Heavily reward for exploring a new area
-            self.visited_positions.add(current_position)
         else:
             reward -= 0.1  # Small penalty for revisiting an area
 
         if min_distance_to_obstacle > 50:
             reward += 5
 
-        left_value = sum(radar[1] for radar in self.radars[:len(self.radars) // 3])
-        right_value = sum(radar[1] for radar in self.radars[-len(self.radars) // 3:])
-        forward_value = sum(radar[1] for radar in self.radars[len(self.radars) // 3:-len(self.radars) // 3])
+        # The first, middle and last third of the beams
+        left_value, forward_value, right_value = distances.reshape(3, -1).sum(axis=1).tolist()
 
         if forward_value >= max(left_value, right_value):
             reward += 2
@@ -193,6 +260,10 @@ class Car:
         return self.is_alive
 
     def detect_collision(self, environment):
+        if self.collision_mode == 'swept':
+            # The whole rect, rather than its center, must be clear of obstacles
+            return sweep_environment(environment, tuple(self.rect), 0, 0) is not None
+
         if (self.rect.left < 0 or self.rect.right > environment.screen_width or
                 self.rect.top < 0 or self.rect.bottom > environment.screen_height):
             return True
@@ -203,14 +274,15 @@ class Car:
 
         return False
 
+    def frontier_index(self):
+        # Neighbours one car length away, converted to map cells
+        step_x = max(1, self.width // self.map.resolution)
+        step_y = max(1, self.height // self.map.resolution)
+        return self.map.track_frontiers(step_x, step_y)
+
     def find_frontiers(self):
-        frontiers = []
-        for (x, y) in self.visited_positions:
-            neighbors = [(x + self.width, y), (x - self.width, y), (x, y + self.height), (x, y - self.height)]
-            for nx, ny in neighbors:
-                if (nx, ny) not in self.visited_positions and (nx, ny) not in self.map:
-                    frontiers.append((nx, ny))
-        return frontiers
+        resolution = self.map.resolution
+        return [(column * resolution, row * resolution) for column, row in self.frontier_index()]
 
     def choose_frontier(self, frontiers):
         min_distance = float('inf')
@@ -222,6 +294,14 @@ class Car:
                 target_frontier = frontier
         return target_frontier
 
+    def nearest_frontier(self):
+        """Return the frontier closest to the car, in pixels, without scanning every frontier."""
+        resolution = self.map.resolution
+        cell = self.frontier_index().nearest(self.x / resolution, self.y / resolution)
+        if cell is None:
+            return None
+        return cell[0] * resolution, cell[1] * resolution
+
     def move_to_frontier(self, frontier):
         dx = frontier[0] - self.x
         dy = frontier[1] - self.y
@@ -238,48 +318,21 @@ class Car:
         self.speed = min(2, math.hypot(dx, dy))
 
     def explore(self):
-        frontiers = self.find_frontiers()
-        if frontiers:
-            target_frontier = self.choose_frontier(frontiers)
-            if target_frontier:
-                self.move_to_frontier(target_frontier)
+        target_frontier = self.nearest_frontier()
+        if target_frontier:
+            self.move_to_frontier(target_frontier)
         else:
             self.speed = 0
 
     def visualize_map(self):
-        min_x = min_y = float('inf')
-        max_x = max_y = float('-inf')
-
-        for (x, y) in self.map:
-            if self.map[(x, y)] in ['visited', 'obstacle']:
-                if x < min_x: min_x = x
-                if y < min_y: min_y = y
-                if x > max_x: max_x = x
-                if y > max_y: max_y = y
-
-        for y in range(min_y, max_y + 1):
-            row = ""
-            for x in range(min_x, max_x + 1):
-                if (x, y) in self.map:
-                    if self.map[(x, y)] == 'visited':
-                        row += '.'
-                    elif self.map[(x, y)] == 'obstacle':
-                        row += '#'
-                else:
-                    row += ' '
+        # Print only the part of the map that has been seen
+        for row in self.map.to_string(crop=True).splitlines():
             if row.strip():
                 print(row)
 
     def visualize_map_to_string(self):
-        map_str = ""
-        for y in range(self.environment.screen_height):
-            for x in range(self.environment.screen_width):
-                if (x, y) in self.map:
-                    if self.map[(x, y)] == 'visited':
-                        map_str += '.'
-                    elif self.map[(x, y)] == 'obstacle':
-                        map_str += '#'
-                else:
-                    map_str += ' '
-            map_str += '\n'
-        return map_str
+        return self.map.to_string()
+
+    def save_map(self, path, format='txt', downsample=1):
+        """Save the explored map as 'txt', 'npy' or 'png', optionally shrunk by downsample."""
+        self.map.save(path, format, downsample)
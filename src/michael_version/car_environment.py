@@ -1,17 +1,24 @@
-import pygame
-
-from colours import WHITE
-
 class CarEnvironment:
-    def __init__(self, car, environment, visualize=True):
+    def __init__(self, car, environment, visualize=True, render_on_step=True, action_repeat=1):
+        if action_repeat < 1:
+            raise ValueError("action_repeat must be at least 1")
         self.car = car
         self.environment = environment
         self.visualize = visualize
+        self.render_on_step = render_on_step  # False when a ThrottledRenderer decides when to draw
+        self.action_repeat = action_repeat  # Physics substeps per step; the radar only sweeps on the last one
+        self.background = None  # Pre-rendered static layout, rebuilt after every reset
         if visualize:
+            import pygame  # Headless environments never load pygame or open a display
             self.screen = pygame.display.set_mode((environment.screen_width, environment.screen_height))
 
-    def reset(self):
-        self.environment.reset()  # Reset the environment (i.e., regenerate the maze)
+    def reset(self, layout_index=None):
+        # Reset the environment (i.e., regenerate the maze, or load a layout from its layout bank)
+        if layout_index is None:
+            self.environment.reset()
+        else:
+            self.environment.reset(layout_index)
+        self.background = None  # The layout may have changed
         self.car.reset()  # Reset the car
         if self.visualize:
             self.render()  # Only render if visualize is True
@@ -19,19 +26,36 @@ class CarEnvironment:
 
     def render(self):
         if self.visualize:
-            self.screen.fill((255, 255, 255))  # Clear screen
-            self.environment.draw(self.screen)  # Draw environment
+            import pygame
+            from renderer import render_background
+
+            # The maze or obstacles only change on reset, so they are drawn once and blitted every frame
+            if self.background is None:
+                self.background = render_background(self.environment)
+            self.screen.blit(self.background, (0, 0))
             self.car.draw(self.screen)  # Draw the car
             pygame.display.flip()  # Update the display
 
     def step(self, action):
-        """Perform an action and return the new state, reward, and done flag."""
-        self.car.perform_action(action)
-        self.car.update(self.environment)  # Pass the environment to the update method
-        reward = self.car.get_reward()
+        """Perform an action for action_repeat substeps and return the new state, summed reward, and done flag.
+
+        Substeps before the last one skip the radar sweep, so their rewards use the latest scan.
+        A crash ends the step early.
+        """
+        reward = 0
+        for substep in range(self.action_repeat):
+            final = substep == self.action_repeat - 1
+            self.car.perform_action(action)
+            self.car.update(self.environment, sense=final)  # Pass the environment to the update method
+            if not self.car.is_alive and not final:
+                self.car.sense(self.environment)  # The returned state still gets a fresh scan
+            reward += self.car.get_reward()
+            if not self.car.is_alive:
+                break
         done = not self.car.is_alive
         state = self.car.get_state()
-        self.render()  # Render the environment after the step
+        if self.render_on_step:
+            self.render()  # Render the environment after the step
         return state, reward, done
 
     def get_state(self):
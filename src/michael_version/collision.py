@@ -0,0 +1,77 @@
+import math
+
+# Thickness of the slabs standing in for everything beyond the screen edges
+_OUTSIDE = 1_000_000
+
+
+def sweep_rects(x, y, width, height, dx, dy, rects):
+    """Swept AABB test of a width x height box moving from (x, y) by (dx, dy) against static rects.
+
+    Returns the earliest fraction t of the move, in [0, 1), at which the box starts to overlap
+    one of the (x, y, width, height) rects with a positive area, or None if it never does. A box
+    that already overlaps a rect collides at t = 0. Each rect is grown by the box's size, so the
+    test becomes a ray from (x, y) against the grown rects, solved per axis with slabs. Only a
+    handful of rects near the move are tested at a time, so plain Python beats NumPy here.
+    """
+    earliest = None
+    for rect_x, rect_y, rect_width, rect_height in rects:
+        if rect_width <= 0 or rect_height <= 0:
+            continue
+        x_entry, x_exit = _slab(x, dx, rect_x - width, rect_x + rect_width)
+        y_entry, y_exit = _slab(y, dy, rect_y - height, rect_y + rect_height)
+        entry, exit = max(x_entry, y_entry), min(x_exit, y_exit)
+        if entry < exit and entry < 1 and exit > 0 and (earliest is None or entry < earliest):
+            earliest = entry
+    return None if earliest is None else max(earliest, 0.0)
+
+
+def _slab(position, delta, low, high):
+    """Times at which position + t * delta enters and leaves the open interval (low, high)."""
+    if delta == 0:
+        return (-math.inf, math.inf) if low < position < high else (math.inf, -math.inf)
+    first, second = (low - position) / delta, (high - position) / delta
+    return (first, second) if first < second else (second, first)
+
+
+def _screen_edges(environment):
+    # Leaving the screen is a collision, so the area beyond each edge is one more obstacle
+    width, height = environment.screen_width, environment.screen_height
+    return [(-_OUTSIDE, -_OUTSIDE, _OUTSIDE, height + 2 * _OUTSIDE),
+            (width, -_OUTSIDE, _OUTSIDE, height + 2 * _OUTSIDE),
+            (-_OUTSIDE, -_OUTSIDE, width + 2 * _OUTSIDE, _OUTSIDE),
+            (-_OUTSIDE, height, width + 2 * _OUTSIDE, _OUTSIDE)]
+
+
+def _maze_walls(environment, left, top, right, bottom):
+    """Wall cells of a maze touching the box [left, right) x [top, bottom), off-grid cells included."""
+    size = environment.cell_size
+    grid = environment.grid
+    walls = []
+    for row in range(top // size, (bottom - 1) // size + 1):
+        for column in range(left // size, (right - 1) // size + 1):
+            inside = 0 <= column < environment.columns and 0 <= row < environment.rows
+            if not inside or grid[row][column] == 1:
+                walls.append((column * size, row * size, size, size))
+    return walls
+
+
+def sweep_environment(environment, rect, dx, dy):
+    """Swept AABB test of rect moving by (dx, dy) against the screen edges and the environment.
+
+    Maze walls (and cells off the grid) or obstacle rects are gathered from the area the box
+    sweeps over, using the obstacle index where the environment has one. Returns the fraction
+    of the move at which the first collision happens, or None.
+    """
+    x, y, width, height = rect
+    left, top = min(x, x + dx), min(y, y + dy)
+    right, bottom = max(x, x + dx) + width, max(y, y + dy) + height
+    candidates = _screen_edges(environment)
+
+    if getattr(environment, 'grid', None) is not None and hasattr(environment, 'cell_size'):
+        candidates += _maze_walls(environment, math.floor(left), math.floor(top), math.ceil(right), math.ceil(bottom))
+    elif hasattr(environment, 'obstacles_in_rect'):
+        swept = (math.floor(left), math.floor(top), math.ceil(right - left) + 1, math.ceil(bottom - top) + 1)
+        candidates += [tuple(obstacle) for obstacle in environment.obstacles_in_rect(swept)]
+    else:
+        candidates += [tuple(obstacle) for obstacle in environment.obstacles]
+    return sweep_rects(x, y, width, height, dx, dy, candidates)
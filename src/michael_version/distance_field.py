@@ -0,0 +1,169 @@
+import math
+
+import numpy as np
+
+# Squared distance standing in for "no obstacle in this column"; large enough to never win, small
+# enough that differences between two such values stay exact in float64
+_FAR = 1e12
+
+
+def _column_distances(occupied):
+    """Squared distance along axis 0 from every cell to the nearest occupied cell in its column."""
+    rows = occupied.shape[0]
+    indices = np.arange(rows, dtype=np.float64)[:, None]
+    above = np.maximum.accumulate(np.where(occupied, indices, -np.inf), axis=0)
+    below = np.minimum.accumulate(np.where(occupied, indices, np.inf)[::-1], axis=0)[::-1]
+    distances = np.minimum(indices - above, below - indices)
+    return np.where(np.isinf(distances), _FAR, distances ** 2)
+
+
+def _envelope_pass(f):
+    """Felzenszwalb's lower envelope of parabolas along axis 1, run for all rows at once.
+
+    f holds squared distances; returns min over i of (x - i) ** 2 + f[:, i] for every x.
+    """
+    rows, n = f.shape
+    all_rows = np.arange(rows)
+    positions = np.arange(n, dtype=np.float64)
+    heights = f + positions ** 2  # Parabola at i: x ** 2 - 2 * i * x + heights[i]
+    vertices = np.zeros((rows, n), dtype=np.int64)  # Parabolas on the envelope, left to right
+    bounds = np.full((rows, n + 1), np.inf)  # bounds[k] is where parabola k takes over
+    bounds[:, 0] = -np.inf
+    k = np.zeros(rows, dtype=np.int64)
+
+    for q in range(1, n):
+        candidates = all_rows
+        intersections = np.empty(rows)
+        while candidates.size:
+            v = vertices[candidates, k[candidates]]
+            intersections[candidates] = (heights[candidates, q] - heights[candidates, v]) / (2 * (q - v))
+            # Parabolas that the new one hides completely are dropped from the envelope
+            hidden = intersections[candidates] <= bounds[candidates, k[candidates]]
+            candidates = candidates[hidden]
+            k[candidates] -= 1
+        k += 1
+        vertices[all_rows, k] = q
+        bounds[all_rows, k] = intersections
+        bounds[all_rows, k + 1] = np.inf
+
+    result = np.empty((rows, n))
+    k[:] = 0
+    for q in range(n):
+        while True:
+            advance = bounds[all_rows, k + 1] < q
+            if not advance.any():
+                break
+            k += advance
+        v = vertices[all_rows, k]
+        result[:, q] = (q - v) ** 2 + f[all_rows, v]
+    return result
+
+
+def distance_transform(occupied, outside_occupied=False):
+    """Exact Euclidean distance from every cell of a boolean [y, x] grid to the nearest occupied cell.
+
+    Occupied cells are 0; with no occupied cells at all every distance is inf. outside_occupied
+    treats the cells just beyond the grid as occupied too.
+    """
+    occupied = np.asarray(occupied, dtype=bool)
+    if outside_occupied:
+        padded = np.ones((occupied.shape[0] + 2, occupied.shape[1] + 2), dtype=bool)
+        padded[1:-1, 1:-1] = occupied
+        return distance_transform(padded)[1:-1, 1:-1]
+    if not occupied.any():
+        return np.full(occupied.shape, np.inf, dtype=np.float32)
+
+    # One scan along the longer axis, then the envelope pass loops over the shorter one
+    transpose = occupied.shape[0] < occupied.shape[1]
+    if transpose:
+        occupied = occupied.T
+    squared = _envelope_pass(_column_distances(occupied))
+    distances = np.sqrt(squared).astype(np.float32)
+    return distances.T.copy() if transpose else distances
+
+
+class DistanceField:
+    """Distance from any point to the nearest obstacle, sampled every resolution pixels.
+
+    Built once per layout; queries between samples are bilinearly interpolated, and points off
+    the sampled area are clamped to its edge.
+    """
+
+    def __init__(self, occupied, resolution=1, outside_occupied=False):
+        self.resolution = resolution
+        self.distances = distance_transform(occupied, outside_occupied) * np.float32(resolution)
+        self.max_row, self.max_column = self.distances.shape[0] - 1, self.distances.shape[1] - 1
+        self.empty = bool(np.isinf(self.distances).all())  # No obstacles anywhere
+
+    def distance(self, x, y):
+        """Interpolated distance at one point."""
+        if self.empty:
+            return math.inf
+        fx = min(max(x / self.resolution, 0.0), self.max_column)
+        fy = min(max(y / self.resolution, 0.0), self.max_row)
+        column, row = int(fx), int(fy)
+        next_column, next_row = min(column + 1, self.max_column), min(row + 1, self.max_row)
+        tx, ty = fx - column, fy - row
+        d = self.distances
+        top = d[row, column] * (1 - tx) + d[row, next_column] * tx
+        bottom = d[next_row, column] * (1 - tx) + d[next_row, next_column] * tx
+        return float(top * (1 - ty) + bottom * ty)
+
+    def distances_at(self, xs, ys):
+        """Interpolated distances at arrays of points."""
+        if self.empty:
+            return np.full(np.broadcast(xs, ys).shape, np.inf)
+        fx = np.clip(np.asarray(xs, dtype=np.float64) / self.resolution, 0, self.max_column)
+        fy = np.clip(np.asarray(ys, dtype=np.float64) / self.resolution, 0, self.max_row)
+        columns, rows = fx.astype(np.int64), fy.astype(np.int64)
+        next_columns, next_rows = np.minimum(columns + 1, self.max_column), np.minimum(rows + 1, self.max_row)
+        tx, ty = fx - columns, fy - rows
+        d = self.distances
+        top = d[rows, columns] * (1 - tx) + d[rows, next_columns] * tx
+        bottom = d[next_rows, columns] * (1 - tx) + d[next_rows, next_columns] * tx
+        return top * (1 - ty) + bottom * ty
+
+    @staticmethod
+    def for_environment(environment, resolution=1):
+        """Build the field for an Environment (occupancy bitmap) or MazeEnvironment (wall grid).
+
+        Maze positions outside the grid count as walls, as in MazeEnvironment.is_position_obstacle.
+        """
+        width, height = environment.screen_width, environment.screen_height
+        xs = np.arange(0, width, resolution)
+        ys = np.arange(0, height, resolution)
+        grid = getattr(environment, 'grid', None)
+        if grid is not None:
+            walls = np.asarray(grid) == 1
+            rows, columns = walls.shape
+            cell_xs, cell_ys = xs // environment.cell_size, ys // environment.cell_size
+            occupied = np.ones((len(ys), len(xs)), dtype=bool)
+            inside_xs, inside_ys = cell_xs < columns, cell_ys < rows
+            occupied[np.ix_(inside_ys, inside_xs)] = walls[np.ix_(cell_ys[inside_ys], cell_xs[inside_xs])]
+            return DistanceField(occupied, resolution, outside_occupied=True)
+        return DistanceField(environment.occupancy[::resolution, ::resolution], resolution)
+
+
+class DistanceFieldCache:
+    """Per-environment cache of distance fields, keyed by layout bank index and resolution.
+
+    Fields of bank layouts are kept (up to max_size of them) since those layouts never change;
+    the field of a generated layout is dropped by invalidate() whenever the layout changes.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self.fields = {}
+
+    def get(self, environment, resolution=1):
+        key = (environment.layout_index, resolution)
+        field = self.fields.get(key)
+        if field is None:
+            field = DistanceField.for_environment(environment, resolution)
+            if len(self.fields) >= self.max_size:
+                del self.fields[next(iter(self.fields))]  # Oldest first
+            self.fields[key] = field
+        return field
+
+    def invalidate(self):
+        self.fields = {key: field for key, field in self.fields.items() if key[0] is not None}
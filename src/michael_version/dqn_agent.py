@@ -3,7 +3,7 @@ import torch.nn as nn
 import torch.optim as optim
 import random
 import numpy as np
-from collections import deque
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
 
 class DQN(nn.Module):
     def __init__(self, state_size, action_size):
@@ -18,10 +18,9 @@ class DQN(nn.Module):
         return self.fc3(x)
 
 class DQNAgent:
-    def __init__(self, state_size, action_size):
+    def __init__(self, state_size, action_size, batched_replay=True, memory_size=2000, prioritized_replay=False):
         self.state_size = state_size
         self.action_size = action_size
-        self.memory = deque(maxlen=2000)
         self.gamma = 0.99
         self.epsilon = 1.0
         self.epsilon_min = 0.01
@@ -29,8 +28,17 @@ class DQNAgent:
         self.learning_rate = 0.001
         self.batch_size = 64
         self.train_start = 1000
+        # Legacy per-sample updates are kept behind this flag so learning curves can be compared
+        self.batched_replay = batched_replay
+        self.prioritized_replay = prioritized_replay
+        if prioritized_replay and not batched_replay:
+            raise ValueError("Prioritized replay requires batched replay")
 
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        if prioritized_replay:
+            self.memory = PrioritizedReplayBuffer(memory_size, state_size, self.device)
+        else:
+            self.memory = ReplayBuffer(memory_size, state_size, self.device)
 
         self.model = DQN(state_size, action_size).to(self.device)
         self.target_model = DQN(state_size, action_size).to(self.device)
@@ -38,29 +46,93 @@ class DQNAgent:
 
         self.optimizer = optim.Adam(self.model.parameters(), lr=self.learning_rate)
         self.criterion = nn.SmoothL1Loss()  # Huber Loss
+        self.weighted_criterion = nn.SmoothL1Loss(reduction='none')  # Per-sample Huber Loss for importance sampling
 
     def update_target_model(self):
         self.target_model.load_state_dict(self.model.state_dict())
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.append(state, action, reward, next_state, done)
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        self.memory.append_batch(states, actions, rewards, next_states, dones)
 
-    def act(self, state):
-        if np.random.rand() <= self.epsilon:
+    def act(self, state, epsilon=None):
+        if np.ndim(state) > 1:
+            return self.act_batch(state, epsilon)
+        if np.random.rand() <= (self.epsilon if epsilon is None else epsilon):
             return random.randrange(self.action_size)
-        state = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-        act_values = self.model(state)
+        # as_tensor shares memory with a float32 array instead of copying it element by element
+        state = torch.as_tensor(np.asarray(state, dtype=np.float32)).unsqueeze(0).to(self.device)
+        with torch.no_grad():
+            act_values = self.model(state)
         return torch.argmax(act_values[0]).item()
 
+    def act_batch(self, states, epsilons=None):
+        """Pick epsilon-greedy actions for a batch of states with a single forward pass.
+
+        epsilons may be a scalar or one value per state; it defaults to the agent's epsilon.
+        """
+        if epsilons is None:
+            epsilons = self.epsilon
+        states = torch.as_tensor(np.asarray(states, dtype=np.float32)).to(self.device)
+        with torch.no_grad():
+            actions = self.model(states).argmax(dim=1).cpu().numpy()
+
+        explore = np.random.rand(len(actions)) <= epsilons
+        actions[explore] = np.random.randint(0, self.action_size, size=np.count_nonzero(explore))
+        return actions
+
+    def get_env_epsilons(self, num_envs, alpha=7):
+        """Spread exploration across parallel environments, from the current epsilon down to epsilon ** (1 + alpha)."""
+        if num_envs == 1:
+            return np.array([self.epsilon])
+        exponents = 1 + alpha * np.arange(num_envs) / (num_envs - 1)
+        return self.epsilon ** exponents
+
     def replay(self):
         if len(self.memory) < self.train_start:
             return
 
-        minibatch = random.sample(self.memory, min(len(self.memory), self.batch_size))
+        minibatch = self.memory.sample(min(len(self.memory), self.batch_size))
 
-        for state, action, reward, next_state, done in minibatch:
-            state = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-            next_state = torch.FloatTensor(next_state).unsqueeze(0).to(self.device)
+        if self.prioritized_replay:
+            *minibatch, indices, weights = minibatch
+            td_errors = self.replay_batch(*minibatch, weights=weights)
+            self.memory.update_priorities(indices, td_errors)
+        elif self.batched_replay:
+            self.replay_batch(*minibatch)
+        else:
+            self.replay_per_sample(*minibatch)
+
+        if self.epsilon > self.epsilon_min:
+            self.epsilon *= self.epsilon_decay
+
+    def replay_batch(self, states, actions, rewards, next_states, dones, weights=None):
+        """Update the model on the whole minibatch with a single optimizer step and return the TD errors."""
+        with torch.no_grad():
+            # Double DQN: Select actions using the main network, then evaluate with target network
+            next_actions = self.model(next_states).argmax(dim=1, keepdim=True)
+            next_q_values = self.target_model(next_states).gather(1, next_actions).squeeze(1)
+            targets = rewards + self.gamma * next_q_values * (1 - dones)
+
+        q_values = self.model(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+        if weights is None:
+            loss = self.criterion(q_values, targets)
+        else:
+            loss = (weights * self.weighted_criterion(q_values, targets)).mean()
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+
+        return (targets - q_values.detach()).cpu().numpy()
+
+    def replay_per_sample(self, states, actions, rewards, next_states, dones):
+        """Legacy update: one forward, backward and optimizer step per transition."""
+        for state, action, reward, next_state, done in zip(states, actions, rewards, next_states, dones):
+            state = state.unsqueeze(0)
+            next_state = next_state.unsqueeze(0)
+            action = action.item()
 
             target = self.model(state).detach()
             if done:
@@ -77,9 +149,6 @@ class DQNAgent:
             loss.backward()
             self.optimizer.step()
 
-        if self.epsilon > self.epsilon_min:
-            self.epsilon *= self.epsilon_decay
-
     def load(self, name):
         self.model.load_state_dict(torch.load(name))
 
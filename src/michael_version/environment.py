@@ -1,15 +1,84 @@
 import random
-import pygame
+import numpy as np
 
 from colours import RED
+from distance_field import DistanceFieldCache
+from rect import Rect
+from spatial_hash import SpatialHash
+
+
+def _rebuilds(method):
+    # Wrap a list method so the owning Environment is rebuilt after it runs
+    def mutate(self, *args):
+        result = method(self, *args)
+        self._changed()
+        return result
+    mutate.__name__ = method.__name__
+    return mutate
+
+
+class ObstacleList(list):
+    """List of obstacle rects that keeps its Environment's bitmap, index and caches in sync.
+
+    append() marks the new obstacle incrementally; any other in-place change rebuilds them all.
+    Moving a rect in place is not seen, so replace it (obstacles[i] = ...) instead.
+    """
+
+    def __init__(self, obstacles=(), environment=None):
+        super().__init__(obstacles)
+        self.environment = environment
+
+    def _changed(self):
+        if self.environment is not None:
+            self.environment.update_occupancy()
+
+    def append(self, obstacle):
+        super().append(obstacle)
+        if self.environment is not None:
+            self.environment.mark_obstacle(obstacle)
+
+    __setitem__ = _rebuilds(list.__setitem__)
+    __delitem__ = _rebuilds(list.__delitem__)
+    __iadd__ = _rebuilds(list.__iadd__)
+    __imul__ = _rebuilds(list.__imul__)
+    extend = _rebuilds(list.extend)
+    insert = _rebuilds(list.insert)
+    pop = _rebuilds(list.pop)
+    remove = _rebuilds(list.remove)
+    clear = _rebuilds(list.clear)
+
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self._changed()  # Index queries return obstacles in list order
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
 
 
 class Environment:
-    def __init__(self, screen_width, screen_height, obstacle_count=10):
+    def __init__(self, screen_width, screen_height, obstacle_count=10, seed=None, layout_bank=None,
+                 obstacle_size=(30, 100), min_gap=10, index_cell_size=128):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.obstacle_count = obstacle_count
+        self.obstacle_size = obstacle_size  # Smallest and largest obstacle side
+        self.min_gap = min_gap  # Minimum gap between generated obstacles
+        # Uniform grid over the obstacles for rect and point queries
+        self.obstacle_index = SpatialHash(index_cell_size)
+        # A seeded generator makes the layouts reproducible; otherwise the global random module is used
+        self.rng = random.Random(seed) if seed is not None else random
+        # Boolean bitmap indexed [y, x]; True where a pixel is covered by an obstacle
+        self.occupancy = np.zeros((screen_height, screen_width), dtype=bool)
+        self.distance_fields = DistanceFieldCache()
+        self.layout_index = None
         self.obstacles = []
+        self.layout_bank = layout_bank  # Optional LayoutBank of pre-generated obstacle layouts
+
+        if layout_bank is not None:
+            layout_bank.check_environment(self)
+            self.load_layout(self.rng.randrange(len(layout_bank)))
+            return
 
         # Generate random obstacles
         self.generate_obstacles()
@@ -24,8 +93,8 @@ class Environment:
 
         for _ in range(attempt_limit):
             # Generate a random position
-            x = random.randint(0, self.screen_width - car_width)
-            y = random.randint(0, self.screen_height - car_height)
+            x = self.rng.randint(0, self.screen_width - car_width)
+            y = self.rng.randint(0, self.screen_height - car_height)
             if self.is_position_free((x, y), (car_width, car_height)):
                 return x, y
 
@@ -35,19 +104,26 @@ class Environment:
 
     def generate_obstacles(self):
         attempt_limit = 1000  # Limit the number of attempts to place an obstacle
-        min_gap = 10  # Minimum gap between obstacles
+        min_gap = self.min_gap
+        min_size, max_size = self.obstacle_size
+        # The existing obstacles grown by the gap, so each placement check only looks at nearby ones
+        placed = SpatialHash(self.obstacle_index.cell_size)
+        for existing in self.obstacles:
+            placed.insert(existing.inflate(min_gap, min_gap))
+
         for _ in range(self.obstacle_count):
             for attempt in range(attempt_limit):
                 # Randomize position and size of the obstacle
-                width = random.randint(30, 100)
-                height = random.randint(30, 100)
-                x = random.randint(0, self.screen_width - width)
-                y = random.randint(0, self.screen_height - height)
-                new_obstacle = pygame.Rect(x, y, width, height)
+                width = self.rng.randint(min_size, max_size)
+                height = self.rng.randint(min_size, max_size)
+                x = self.rng.randint(0, self.screen_width - width)
+                y = self.rng.randint(0, self.screen_height - height)
+                new_obstacle = Rect(x, y, width, height)
 
                 # Check if the new obstacle overlaps any existing ones
-                if all(not new_obstacle.colliderect(existing.inflate(min_gap, min_gap)) for existing in self.obstacles):
-                    self.obstacles.append(new_obstacle)
+                if not placed.overlaps(new_obstacle):
+                    self.obstacles.append(new_obstacle)  # Marked in the bitmap and index as it is added
+                    placed.insert(new_obstacle.inflate(min_gap, min_gap))
                     break
             else:
                 print("Failed to place an obstacle after multiple attempts.")
@@ -56,22 +132,106 @@ class Environment:
         if len(self.obstacles) < self.obstacle_count:
             print(f"Only {len(self.obstacles)} out of {self.obstacle_count} obstacles were placed.")
 
+    @property
+    def obstacles(self):
+        """The obstacle rects; edits made to this list, in place or not, update the bitmap and index."""
+        return self._obstacles
+
+    @obstacles.setter
+    def obstacles(self, obstacles):
+        self._obstacles = ObstacleList(obstacles, self)
+        self.update_occupancy()
+
+    def add_obstacle(self, obstacle):
+        """Add an obstacle and mark it in the occupancy bitmap."""
+        self._obstacles.append(obstacle)
+
+    def mark_obstacle(self, obstacle):
+        """Mark one newly added obstacle in the bitmap and index without rebuilding them."""
+        self.rasterize_obstacle(obstacle)
+        self.obstacle_index.insert(obstacle)
+        self.layout_changed()
+
+    def layout_changed(self):
+        # The obstacles no longer match a bank layout, and cached distance fields are stale
+        self.layout_index = None
+        self.distance_fields.invalidate()
+
+    def distance_field(self, resolution=1):
+        """Return the DistanceField of the current layout, building it on first use."""
+        return self.distance_fields.get(self, resolution)
+
+    def update_occupancy(self):
+        """Rebuild the occupancy bitmap and the obstacle index from the current obstacles."""
+        self.occupancy[:] = False
+        self.obstacle_index.clear()
+        for obstacle in self._obstacles:
+            self.rasterize_obstacle(obstacle)
+            self.obstacle_index.insert(obstacle)
+        self.layout_changed()
+
+    def rasterize_obstacle(self, obstacle):
+        left, top = max(obstacle.left, 0), max(obstacle.top, 0)
+        right, bottom = min(obstacle.right, self.screen_width), min(obstacle.bottom, self.screen_height)
+        if right > left and bottom > top:
+            self.occupancy[top:bottom, left:right] = True
+
+    def reset(self, layout_index=None):
+        # With a layout bank, switch to the given (or a random) stored layout instead of generating one
+        if self.layout_bank is not None:
+            if layout_index is None:
+                layout_index = self.rng.randrange(len(self.layout_bank))
+            self.load_layout(layout_index)
+            return self.obstacles
+
+        # Regenerate the obstacles each time the environment is reset
+        self.obstacles = []
+        self.generate_obstacles()
+        self.start_x, self.start_y = self.find_open_start()  # Update start position
+        return self.obstacles
+
+    def load_layout(self, index):
+        """Replace the obstacles and start position with layout index of the layout bank."""
+        self.obstacles = [Rect(rect) for rect in self.layout_bank.obstacle_rects(index)]
+        self.start_x, self.start_y = self.layout_bank.start(index)
+        self.layout_index = index
+
     def draw(self, screen):
+        import pygame  # Only needed when rendering, so headless runs never load it
+
         # Draw the obstacles
         for obstacle in self.obstacles:
             pygame.draw.rect(screen, RED, obstacle)
 
     def is_position_free(self, pos, size):
         """Check if a given position is free from obstacles."""
-        new_rect = pygame.Rect(pos[0], pos[1], size[0], size[1])
-        for obstacle in self.obstacles:
-            if new_rect.colliderect(obstacle):
-                return False
-        return True
+        left, top = max(int(pos[0]), 0), max(int(pos[1]), 0)
+        right = min(int(pos[0]) + int(size[0]), self.screen_width)
+        bottom = min(int(pos[1]) + int(size[1]), self.screen_height)
+        if right <= left or bottom <= top:
+            return True
+        return not self.occupancy[top:bottom, left:right].any()
+
+    def obstacles_in_rect(self, rect):
+        """Return the obstacles that overlap an (x, y, width, height) rect."""
+        return self.obstacle_index.query_rect(rect)
+
+    def obstacle_at(self, x, y):
+        """Return the obstacle covering the (x, y) position, or None."""
+        found = self.obstacle_index.query_point(x, y)
+        return found[0] if found else None
 
     def is_position_obstacle(self, x, y):
         """Check if the given (x, y) position is occupied by an obstacle."""
-        for obstacle in self.obstacles:
-            if obstacle.collidepoint(x, y):
-                return True
-        return False
+        x, y = int(x), int(y)
+        if x < 0 or y < 0 or x >= self.screen_width or y >= self.screen_height:
+            return False
+        return bool(self.occupancy[y, x])
+
+    def are_positions_obstacles(self, xs, ys):
+        """Vectorized is_position_obstacle: a boolean array with one entry per (x, y) point."""
+        xs, ys = np.asarray(xs).astype(np.int64), np.asarray(ys).astype(np.int64)  # Truncates like int()
+        inside = (xs >= 0) & (ys >= 0) & (xs < self.screen_width) & (ys < self.screen_height)
+        result = np.zeros(xs.shape, dtype=bool)
+        result[inside] = self.occupancy[ys[inside], xs[inside]]
+        return result
@@ -0,0 +1,20 @@
+from environment import Environment
+from layout_bank import LayoutBank
+from maze_environment import MazeEnvironment
+
+ENVIRONMENT_TYPES = ('default', 'maze')
+
+
+def create_environment(environment_type, layout_bank=None):
+    """Build the environment for the selected environment type.
+
+    layout_bank is an optional directory written by LayoutBank.build_obstacles / build_mazes; the
+    environment then resets onto those stored layouts instead of generating new ones.
+    """
+    bank = LayoutBank(layout_bank) if layout_bank is not None else None
+    if environment_type == 'default':
+        return Environment(1200, 800, obstacle_count=10, layout_bank=bank)
+    elif environment_type == 'maze':
+        return MazeEnvironment(1200, 800, cell_size=120, layout_bank=bank)
+    else:
+        raise ValueError(f"Unknown environment type: {environment_type}")
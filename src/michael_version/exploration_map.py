@@ -0,0 +1,271 @@
+import math
+
+import numpy as np
+
+from colours import BLACK, RED, WHITE
+
+# Cell codes stored in ExplorationMap.grid
+UNKNOWN = 0
+VISITED = 1
+OBSTACLE = 2
+
+MAP_CHARACTERS = np.frombuffer(b' .#', dtype=np.uint8)  # ASCII codes indexed by cell code
+MAP_COLOURS = np.array([WHITE, BLACK, RED], dtype=np.uint8)  # PNG colours indexed by cell code
+MAP_FORMATS = ('txt', 'npy', 'png')
+
+
+class FrontierIndex:
+    """Unknown cells that lie step_x / step_y cells from a visited cell, kept up to date incrementally.
+
+    Frontier cells are also filed into square buckets of bucket_size cells so the nearest one can be
+    found by searching outwards from the query instead of scanning every frontier.
+    """
+
+    def __init__(self, grid, step_x=1, step_y=1, bucket_size=16):
+        self.grid = grid  # The ExplorationMap grid, indexed [row, column]; read but never written
+        self.rows, self.columns = grid.shape
+        self.step_x = step_x
+        self.step_y = step_y
+        self.bucket_size = bucket_size
+        self.offsets = ((step_x, 0), (-step_x, 0), (0, step_y), (0, -step_y))
+        self.frontiers = set()  # (column, row) cells
+        self.buckets = {}  # (bucket column, bucket row) -> set of cells
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.frontiers)
+
+    def __iter__(self):
+        return iter(self.frontiers)
+
+    def __contains__(self, cell):
+        return cell in self.frontiers
+
+    def rebuild(self):
+        """Recompute every frontier from the grid in one vectorized scan."""
+        self.frontiers.clear()
+        self.buckets.clear()
+        rows, columns = np.nonzero(self.grid == VISITED)
+        for dx, dy in self.offsets:
+            neighbour_columns, neighbour_rows = columns + dx, rows + dy
+            inside = ((neighbour_columns >= 0) & (neighbour_rows >= 0) &
+                      (neighbour_columns < self.columns) & (neighbour_rows < self.rows))
+            neighbour_columns, neighbour_rows = neighbour_columns[inside], neighbour_rows[inside]
+            unknown = self.grid[neighbour_rows, neighbour_columns] == UNKNOWN
+            for cell in zip(neighbour_columns[unknown].tolist(), neighbour_rows[unknown].tolist()):
+                self._add(cell)
+
+    def refresh(self, cells):
+        """Update the index after the given (column, row) cells changed state."""
+        for column, row in cells:
+            self._update(column, row)
+            for dx, dy in self.offsets:
+                self._update(column + dx, row + dy)
+
+    def _update(self, column, row):
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return
+        if self._is_frontier(column, row):
+            self._add((column, row))
+        else:
+            self._discard((column, row))
+
+    def _is_frontier(self, column, row):
+        if self.grid[row, column] != UNKNOWN:
+            return False
+        for dx, dy in self.offsets:
+            neighbour_column, neighbour_row = column + dx, row + dy
+            if (0 <= neighbour_column < self.columns and 0 <= neighbour_row < self.rows and
+                    self.grid[neighbour_row, neighbour_column] == VISITED):
+                return True
+        return False
+
+    def _add(self, cell):
+        if cell in self.frontiers:
+            return
+        self.frontiers.add(cell)
+        key = (cell[0] // self.bucket_size, cell[1] // self.bucket_size)
+        self.buckets.setdefault(key, set()).add(cell)
+
+    def _discard(self, cell):
+        if cell not in self.frontiers:
+            return
+        self.frontiers.discard(cell)
+        key = (cell[0] // self.bucket_size, cell[1] // self.bucket_size)
+        bucket = self.buckets[key]
+        bucket.discard(cell)
+        if not bucket:
+            del self.buckets[key]
+
+    def nearest(self, column, row):
+        """Return the frontier cell closest to the (fractional) cell position, or None if there are none."""
+        if not self.frontiers:
+            return None
+
+        size = self.bucket_size
+        center_column, center_row = int(column // size), int(row // size)
+        max_ring = max(center_column, center_row, -(-self.columns // size) - center_column,
+                       -(-self.rows // size) - center_row)
+        best, best_distance = None, math.inf
+        for ring in range(max_ring + 1):
+            # Every cell in this ring of buckets is at least (ring - 1) buckets away
+            if best_distance <= (ring - 1) * size:
+                break
+            for key in self._ring(center_column, center_row, ring):
+                for cell in self.buckets.get(key, ()):
+                    distance = math.hypot(cell[0] - column, cell[1] - row)
+                    if distance < best_distance:
+                        best, best_distance = cell, distance
+        return best
+
+    @staticmethod
+    def _ring(center_column, center_row, ring):
+        if ring == 0:
+            yield center_column, center_row
+            return
+        for offset in range(-ring, ring + 1):
+            yield center_column + offset, center_row - ring
+            yield center_column + offset, center_row + ring
+        for offset in range(-ring + 1, ring):
+            yield center_column - ring, center_row + offset
+            yield center_column + ring, center_row + offset
+
+
+class ExplorationMap:
+    """What a car has seen of its environment, stored as a fixed-size uint8 grid.
+
+    Each cell covers resolution x resolution pixels, so memory depends on the map size only,
+    however long the car drives. A cell holds one code, so a radar hit can overwrite a visited
+    cell; whether a cell was ever visited is kept apart in visited, which obstacles never clear.
+    """
+
+    def __init__(self, width, height, resolution=1):
+        self.width = width
+        self.height = height
+        self.resolution = resolution
+        self.rows = -(-height // resolution)
+        self.columns = -(-width // resolution)
+        self.grid = np.zeros((self.rows, self.columns), dtype=np.uint8)  # Indexed [row, column]
+        self.visited = np.zeros((self.rows, self.columns), dtype=bool)  # Cells the car has been in
+        self.frontier_index = None  # Built on first use by track_frontiers
+
+    def cell(self, x, y):
+        """Return the (column, row) holding pixel (x, y), or None if it is off the map."""
+        x, y = int(x), int(y)
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return None
+        return x // self.resolution, y // self.resolution
+
+    def get(self, x, y):
+        cell = self.cell(x, y)
+        if cell is None:
+            return UNKNOWN
+        return self.grid[cell[1], cell[0]]
+
+    def is_visited(self, x, y):
+        cell = self.cell(x, y)
+        return cell is not None and bool(self.visited[cell[1], cell[0]])
+
+    def mark_visited(self, x, y):
+        """Mark the cell under (x, y) as visited and return True if it was never visited before.
+
+        A radar hit marked in the cell since the last visit is overwritten, but does not make
+        the cell new again.
+        """
+        cell = self.cell(x, y)
+        if cell is None:
+            return False
+        column, row = cell
+        new = not self.visited[row, column]
+        self.visited[row, column] = True
+        if self.grid[row, column] != VISITED:
+            self.grid[row, column] = VISITED
+            if self.frontier_index is not None:
+                self.frontier_index.refresh([(column, row)])
+        return new
+
+    def mark_obstacles(self, xs, ys):
+        """Mark the cells under the given pixel coordinates as obstacles, ignoring any off the map."""
+        xs, ys = np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64)
+        inside = (xs >= 0) & (ys >= 0) & (xs < self.width) & (ys < self.height)
+        rows, columns = ys[inside] // self.resolution, xs[inside] // self.resolution
+        if self.frontier_index is not None:
+            changed = self.grid[rows, columns] != OBSTACLE
+            self.grid[rows, columns] = OBSTACLE
+            self.frontier_index.refresh(set(zip(columns[changed].tolist(), rows[changed].tolist())))
+        else:
+            self.grid[rows, columns] = OBSTACLE
+
+    def clear(self):
+        self.grid.fill(UNKNOWN)
+        self.visited.fill(False)
+        if self.frontier_index is not None:
+            self.frontier_index.rebuild()
+
+    def track_frontiers(self, step_x=1, step_y=1):
+        """Return a FrontierIndex kept in sync with every later change to the map."""
+        index = self.frontier_index
+        if index is None or (index.step_x, index.step_y) != (step_x, step_y):
+            self.frontier_index = FrontierIndex(self.grid, step_x, step_y)
+        return self.frontier_index
+
+    def frontiers(self, step_x=1, step_y=1):
+        """Return the unknown cells step_x / step_y cells away from a visited cell, as pixel coordinates."""
+        rows, columns = np.nonzero(self.grid == VISITED)
+        offsets = ((step_x, 0), (-step_x, 0), (0, step_y), (0, -step_y))
+        neighbour_columns = np.concatenate([columns + dx for dx, _ in offsets])
+        neighbour_rows = np.concatenate([rows + dy for _, dy in offsets])
+        inside = ((neighbour_columns >= 0) & (neighbour_rows >= 0) &
+                  (neighbour_columns < self.columns) & (neighbour_rows < self.rows))
+        neighbour_columns, neighbour_rows = neighbour_columns[inside], neighbour_rows[inside]
+        unknown = self.grid[neighbour_rows, neighbour_columns] == UNKNOWN
+        # Several visited cells can share a neighbour; keep each frontier cell once
+        cells = np.unique(neighbour_rows[unknown] * self.columns + neighbour_columns[unknown])
+        xs, ys = (cells % self.columns) * self.resolution, (cells // self.columns) * self.resolution
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def downsampled(self, factor):
+        """Return the grid shrunk by factor in each direction, keeping the highest code in every block.
+
+        Codes are ordered unknown < visited < obstacle, so obstacles survive downsampling.
+        """
+        if factor == 1:
+            return self.grid
+        rows, columns = -(-self.rows // factor), -(-self.columns // factor)
+        padded = np.zeros((rows * factor, columns * factor), dtype=np.uint8)
+        padded[:self.rows, :self.columns] = self.grid
+        return padded.reshape(rows, factor, columns, factor).max(axis=(1, 3))
+
+    def to_string(self, crop=False, downsample=1):
+        """Render the map as text: '.' for visited cells, '#' for obstacles and ' ' for unknown.
+
+        With crop, only the bounding box of the known cells is rendered.
+        """
+        grid = self.downsampled(downsample)
+        if crop:
+            rows, columns = np.nonzero(grid)
+            if rows.size == 0:
+                return ''
+            grid = grid[rows.min():rows.max() + 1, columns.min():columns.max() + 1]
+        # One lookup per cell plus a newline column, encoded in a single pass
+        characters = np.empty((grid.shape[0], grid.shape[1] + 1), dtype=np.uint8)
+        characters[:, :-1] = MAP_CHARACTERS[grid]
+        characters[:, -1] = ord('\n')
+        return characters.tobytes().decode('ascii')
+
+    def save(self, path, format='txt', downsample=1):
+        """Write the map as ASCII text ('txt'), the raw uint8 grid ('npy') or an image ('png')."""
+        if format not in MAP_FORMATS:
+            raise ValueError(f"Unknown map format {format!r}, expected one of {MAP_FORMATS}")
+
+        if format == 'txt':
+            with open(path, 'w') as map_file:
+                map_file.write(self.to_string(downsample=downsample))
+        elif format == 'npy':
+            np.save(path, self.downsampled(downsample))
+        else:
+            import pygame  # Only needed for PNG output
+            grid = self.downsampled(downsample)
+            pixels = np.ascontiguousarray(MAP_COLOURS[grid])
+            image = pygame.image.frombuffer(pixels.tobytes(), (grid.shape[1], grid.shape[0]), 'RGB')
+            pygame.image.save(image, path)
@@ -0,0 +1,25 @@
+import functools
+
+import pygame
+
+
+def _clear_on_quit():
+    # Fonts and surfaces made by one pygame session are invalid after pygame.quit()
+    get_font.cache_clear()
+    render_text.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name=None, size=24):
+    """Return a shared font; each (name, size) is loaded once instead of on every frame."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if get_font.cache_info().currsize == 0:
+        pygame.register_quit(_clear_on_quit)
+    return pygame.font.Font(name, size)
+
+
+@functools.lru_cache(maxsize=512)
+def render_text(text, size=24, colour=(0, 0, 0), name=None, antialias=True):
+    """Return a rendered text surface, reusing it while the same label keeps being drawn."""
+    return get_font(name, size).render(text, antialias, colour)
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 class GeometryHelper:
     @staticmethod
@@ -49,3 +51,46 @@ class GeometryHelper:
                         min_distance = distance
 
         return min_distance
+
+    @staticmethod
+    def get_distance_to_nearest_obstacle(point, environment):
+        """Distance from a point to the nearest obstacle or maze wall, from the layout's cached distance field."""
+        return environment.distance_field().distance(point[0], point[1])
+
+    # Array versions of the queries above, answering many points in one call
+
+    @staticmethod
+    def calculate_distances(points1, points2):
+        """Pairwise Euclidean distances: an (n, m) matrix for n points and m points given as (x, y) pairs."""
+        points1 = np.asarray(points1, dtype=np.float64).reshape(-1, 2)
+        points2 = np.asarray(points2, dtype=np.float64).reshape(-1, 2)
+        return np.hypot(points1[:, None, 0] - points2[None, :, 0], points1[:, None, 1] - points2[None, :, 1])
+
+    @staticmethod
+    def get_min_distances_to_obstacles(points, obstacles):
+        """Distance from each point to the nearest obstacle center; inf when there are no obstacles."""
+        if not obstacles:
+            return np.full(len(points), np.inf)
+        centers = [obstacle.center for obstacle in obstacles]
+        return GeometryHelper.calculate_distances(points, centers).min(axis=1)
+
+    @staticmethod
+    def get_min_distances_to_border(rects, environment):
+        """Distance from each (x, y, width, height) rect to the nearest border of the environment."""
+        lefts, tops, widths, heights = np.asarray(rects).reshape(-1, 4).T
+        return np.minimum(np.minimum(lefts, environment.screen_width - (lefts + widths)),
+                          np.minimum(tops, environment.screen_height - (tops + heights)))
+
+    @staticmethod
+    def get_min_distances_to_maze_obstacle(points, grid, cell_size):
+        """Distance from each point to the nearest maze wall center; inf when the maze has no walls."""
+        rows, columns = np.nonzero(np.asarray(grid) == 1)
+        if rows.size == 0:
+            return np.full(len(points), np.inf)
+        centers = np.stack([columns * cell_size + cell_size // 2, rows * cell_size + cell_size // 2], axis=1)
+        return GeometryHelper.calculate_distances(points, centers).min(axis=1)
+
+    @staticmethod
+    def get_distances_to_nearest_obstacle(xs, ys, environment):
+        """Array version of get_distance_to_nearest_obstacle."""
+        return environment.distance_field().distances_at(xs, ys)
@@ -0,0 +1,174 @@
+import random
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector.utils import batch_space
+
+from batch_simulator import BatchCarSimulator
+from car import Car
+from car_environment import CarEnvironment
+from environment_factory import create_environment
+from radar import RADAR_MAX_LENGTH
+
+# gymnasium 1.x declares how vector envs autoreset; 0.29 always resets in the same step
+AutoresetMode = getattr(gym.vector, 'AutoresetMode', None)
+
+ACTION_COUNT = 7
+RADAR_COUNT = 24
+MAX_EPISODE_STEPS = 2000  # Same episode cap as train_dqn
+VISIT_CELL_SIZE = 10  # Novelty reward cells, one car in size, for both the single and the vector env
+
+# Registered IDs and the environment_type each one builds
+ENV_IDS = {
+    'CarObstacles-v0': 'default',
+    'CarMaze-v0': 'maze',
+}
+
+
+def observation_space():
+    """Speed, heading angle wrapped to [-180, 180) degrees and the 24 radar distances."""
+    # Hit points are truncated to whole pixels, which can put them up to a pixel further away per axis
+    low = np.array([-2, -180] + [0] * RADAR_COUNT, dtype=np.float32)
+    high = np.array([10, 180] + [RADAR_MAX_LENGTH + 1] * RADAR_COUNT, dtype=np.float32)
+    return spaces.Box(low, high, dtype=np.float32)
+
+
+def _wrap_angles(observations):
+    # The car's angle accumulates every turn; observations report it as a heading
+    observations[..., 1] = (observations[..., 1] + 180) % 360 - 180
+    return observations
+
+
+def _seed_environment(environment, seed):
+    # Environments draw their layouts from .rng; a seeded generator makes them reproducible
+    if seed is not None:
+        environment.rng = random.Random(seed)
+
+
+class CarGymEnv(gym.Env):
+    """gymnasium.Env adapter around a CarEnvironment with a single car.
+
+    Episodes terminate when the car crashes; truncation after max_episode_steps comes from the
+    TimeLimit wrapper that gymnasium.make adds for the registered IDs.
+    """
+
+    metadata = {'render_modes': ['human'], 'render_fps': 30}
+
+    def __init__(self, environment_type='default', layout_bank=None, render_mode=None,
+                 visit_cell_size=VISIT_CELL_SIZE):
+        if render_mode is not None and render_mode not in self.metadata['render_modes']:
+            raise ValueError(f"Unsupported render_mode {render_mode!r}")
+        self.render_mode = render_mode
+        self.environment = create_environment(environment_type, layout_bank)
+        visualize = render_mode == 'human'
+        self.car = Car(self.environment.start_x, self.environment.start_y, self.environment, visualize,
+                       map_resolution=visit_cell_size)
+        self.car_env = CarEnvironment(self.car, self.environment, visualize, render_on_step=False)
+        self.observation_space = observation_space()
+        self.action_space = spaces.Discrete(ACTION_COUNT)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        _seed_environment(self.environment, seed)
+        layout_index = (options or {}).get('layout_index')
+        state = self.car_env.reset(layout_index)
+        return _wrap_angles(state.copy()), {}
+
+    def step(self, action):
+        state, reward, done = self.car_env.step(int(action))
+        if self.render_mode == 'human':
+            self.car_env.render()
+        # Car reuses its state buffers, and callers may keep observations for longer
+        return _wrap_angles(state.copy()), float(reward), done, False, {}
+
+    def render(self):
+        if self.render_mode == 'human':
+            self.car_env.render()
+
+    def close(self):
+        if self.render_mode == 'human':
+            import pygame
+            pygame.quit()
+
+
+class CarVectorEnv(gym.vector.VectorEnv):
+    """Native vector env: num_envs cars driving on one shared layout, stepped by a BatchCarSimulator.
+
+    Cars that crash or run out of steps are put back at the start in the same step; their last
+    observation is returned in infos under "final_obs" ("final_observation" on gymnasium 0.29).
+    Every car drives the same layout, which only changes on a full reset(); for a layout per
+    env, vectorize CarGymEnv with gymnasium's SyncVectorEnv or AsyncVectorEnv instead.
+
+    Rewards match CarGymEnv's for the same visit_cell_size. Visits take one byte per cell per
+    car, about 96 MB for 10k cars on 1200x800 at the default car-sized cells; None leaves the
+    novelty term out.
+    """
+
+    metadata = {'render_modes': [], 'autoreset_mode': AutoresetMode.SAME_STEP if AutoresetMode else None}
+
+    def __init__(self, num_envs, environment_type='default', layout_bank=None, max_episode_steps=MAX_EPISODE_STEPS,
+                 visit_cell_size=VISIT_CELL_SIZE):
+        single_observation_space = observation_space()
+        single_action_space = spaces.Discrete(ACTION_COUNT)
+        if AutoresetMode is None:
+            super().__init__(num_envs, single_observation_space, single_action_space)
+        else:
+            self.num_envs = num_envs
+            self.single_observation_space = single_observation_space
+            self.single_action_space = single_action_space
+            self.observation_space = batch_space(single_observation_space, num_envs)
+            self.action_space = batch_space(single_action_space, num_envs)
+        self.render_mode = None
+        self.final_obs_key = 'final_observation' if AutoresetMode is None else 'final_obs'
+
+        self.environment = create_environment(environment_type, layout_bank)
+        self.simulator = BatchCarSimulator(self.environment, num_envs, visit_cell_size=visit_cell_size)
+        self.max_episode_steps = max_episode_steps
+        self.step_counts = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self, *, seed=None, options=None):
+        _seed_environment(self.environment, seed)
+        layout_index = (options or {}).get('layout_index')
+        if layout_index is None:
+            self.environment.reset()
+        else:
+            self.environment.reset(layout_index)
+        self.step_counts[:] = 0
+        return _wrap_angles(self.simulator.reset()), {}
+
+    def step(self, actions):
+        states, rewards, terminations = self.simulator.step(np.asarray(actions))
+        _wrap_angles(states)
+        self.step_counts += 1
+        truncations = ~terminations & (self.step_counts >= self.max_episode_steps)
+
+        infos = {}
+        ended = np.flatnonzero(terminations | truncations)
+        if ended.size:
+            final_observations = np.empty(self.num_envs, dtype=object)
+            final_observations[ended] = list(states[ended])
+            mask = terminations | truncations
+            infos = {self.final_obs_key: final_observations, f'_{self.final_obs_key}': mask,
+                     'final_info': np.array([{} for _ in range(self.num_envs)], dtype=object), '_final_info': mask}
+            self.step_counts[ended] = 0
+            self.simulator.reset(ended)
+            states = _wrap_angles(self.simulator.get_states())
+
+        return states, rewards, terminations, truncations, infos
+
+
+def register_envs():
+    """Register the single-car IDs (with a vector entry point where gymnasium supports one)."""
+    for env_id, environment_type in ENV_IDS.items():
+        if env_id in gym.registry:
+            continue
+        kwargs = {'environment_type': environment_type}
+        try:
+            gym.register(env_id, entry_point=CarGymEnv, max_episode_steps=MAX_EPISODE_STEPS, kwargs=kwargs,
+                         vector_entry_point=CarVectorEnv)
+        except TypeError:  # gymnasium 0.29 has no vector entry points
+            gym.register(env_id, entry_point=CarGymEnv, max_episode_steps=MAX_EPISODE_STEPS, kwargs=kwargs)
+
+
+register_envs()
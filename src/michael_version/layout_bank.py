@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+from environment import Environment
+from maze_environment import MazeEnvironment
+
+LAYOUT_KINDS = ('maze', 'obstacles')
+
+
+class LayoutBank:
+    """A fixed set of pre-generated, seeded layouts stored as .npy files in one directory.
+
+    The arrays are memory-mapped, so loading a bank is instant and worker processes that open the
+    same directory share its pages. Environments given a bank reset by picking a layout index
+    instead of generating a new layout.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'metadata.json')) as metadata_file:
+            self.metadata = json.load(metadata_file)
+        self.kind = self.metadata['kind']
+        if self.kind not in LAYOUT_KINDS:
+            raise ValueError(f"Unknown layout kind {self.kind!r} in {directory}")
+
+        self.seeds = self._load('seeds')
+        self.starts = self._load('starts')  # (count, 2) start x, y
+        if self.kind == 'maze':
+            self.grids = self._load('grids')  # (count, rows, columns) int8, 1 for walls
+        else:
+            self.obstacles = self._load('obstacles')  # (count, max obstacles, 4) x, y, width, height
+            self.obstacle_counts = self._load('obstacle_counts')
+
+    def _load(self, name):
+        return np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.starts)
+
+    def check_environment(self, environment):
+        """Raise ValueError if the bank's layouts were generated for a different screen."""
+        size = (self.metadata['screen_width'], self.metadata['screen_height'])
+        if size != (environment.screen_width, environment.screen_height):
+            raise ValueError(f"Layout bank {self.directory} is for a {size[0]}x{size[1]} screen, not "
+                             f"{environment.screen_width}x{environment.screen_height}")
+        if self.kind == 'maze' and self.metadata['cell_size'] != environment.cell_size:
+            raise ValueError(f"Layout bank {self.directory} uses cell_size {self.metadata['cell_size']}")
+
+    def start(self, index):
+        x, y = self.starts[index]
+        return int(x), int(y)
+
+    def grid(self, index):
+        # Copied out of the memory map so the environment can modify its own grid
+        return np.array(self.grids[index])
+
+    def obstacle_rects(self, index):
+        """Return the (x, y, width, height) tuples of the obstacles in one layout."""
+        return [tuple(rect) for rect in self.obstacles[index, :self.obstacle_counts[index]].tolist()]
+
+    @staticmethod
+    def _save(directory, metadata, arrays):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f'{name}.npy'), array)
+        with open(os.path.join(directory, 'metadata.json'), 'w') as metadata_file:
+            json.dump(metadata, metadata_file)
+        return LayoutBank(directory)
+
+    @staticmethod
+    def build_mazes(directory, count, screen_width, screen_height, cell_size=80, algorithm='backtracker', seed=0):
+        """Generate count mazes, layout i from seed + i, and save them as a bank in directory."""
+        grids, starts = [], []
+        for i in range(count):
+            environment = MazeEnvironment(screen_width, screen_height, cell_size, algorithm, seed=seed + i)
+            grids.append(environment.grid)
+            starts.append((environment.start_x, environment.start_y))
+
+        metadata = {'kind': 'maze', 'screen_width': screen_width, 'screen_height': screen_height,
+                    'cell_size': cell_size, 'algorithm': algorithm, 'seed': seed}
+        return LayoutBank._save(directory, metadata, {
+            'seeds': np.arange(seed, seed + count, dtype=np.int64),
+            'starts': np.array(starts, dtype=np.int32).reshape(count, 2),
+            'grids': np.array(grids, dtype=np.int8),
+        })
+
+    @staticmethod
+    def build_obstacles(directory, count, screen_width, screen_height, obstacle_count=10, seed=0):
+        """Generate count obstacle layouts, layout i from seed + i, and save them as a bank in directory."""
+        obstacles = np.zeros((count, obstacle_count, 4), dtype=np.int32)
+        obstacle_counts = np.zeros(count, dtype=np.int32)
+        starts = np.zeros((count, 2), dtype=np.int32)
+        for i in range(count):
+            environment = Environment(screen_width, screen_height, obstacle_count, seed=seed + i)
+            for j, obstacle in enumerate(environment.obstacles):
+                obstacles[i, j] = (obstacle.x, obstacle.y, obstacle.width, obstacle.height)
+            obstacle_counts[i] = len(environment.obstacles)
+            starts[i] = (environment.start_x, environment.start_y)
+
+        metadata = {'kind': 'obstacles', 'screen_width': screen_width, 'screen_height': screen_height,
+                    'obstacle_count': obstacle_count, 'seed': seed}
+        return LayoutBank._save(directory, metadata, {
+            'seeds': np.arange(seed, seed + count, dtype=np.int64),
+            'starts': starts,
+            'obstacles': obstacles,
+            'obstacle_counts': obstacle_counts,
+        })
+
+
+if __name__ == "__main__":
+    # Usage: python layout_bank.py <directory> <maze|obstacles> <count> [seed]
+    if len(sys.argv) < 4 or sys.argv[2] not in LAYOUT_KINDS:
+        print("Usage: python layout_bank.py <directory> <maze|obstacles> <count> [seed]")
+        sys.exit(1)
+
+    directory, kind, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    # Same screens as train_dqn.create_environment
+    if kind == 'maze':
+        bank = LayoutBank.build_mazes(directory, count, 1200, 800, cell_size=120, seed=seed)
+    else:
+        bank = LayoutBank.build_obstacles(directory, count, 1200, 800, obstacle_count=10, seed=seed)
+    print(f"Saved {len(bank)} {kind} layouts to {directory}")
@@ -1,20 +1,35 @@
 import random
-import pygame
+
+import numpy as np
+
+from distance_field import DistanceFieldCache
+from maze_generation import generate_maze
 
 # Define some colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
 class MazeEnvironment:
-    def __init__(self, screen_width, screen_height, cell_size=80):
+    def __init__(self, screen_width, screen_height, cell_size=80, algorithm='backtracker', seed=None,
+                 layout_bank=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.cell_size = cell_size
         self.columns = screen_width // cell_size
         self.rows = screen_height // cell_size
-        self.grid = [[1 for _ in range(self.columns)] for _ in range(self.rows)]
-        self.visited = []
-        self.stack = []
+        self.algorithm = algorithm  # One of maze_generation.MAZE_ALGORITHMS
+        # A seeded generator makes the mazes reproducible; otherwise the global random module is used
+        self.rng = random.Random(seed) if seed is not None else random
+        self.distance_fields = DistanceFieldCache()
+        self.field_grid = None  # Copy of the grid the cached distance fields were built from
+        self.layout_index = None
+        self.grid = np.ones((self.rows, self.columns), dtype=np.int8)
+        self.layout_bank = layout_bank  # Optional LayoutBank of pre-generated mazes
+
+        if layout_bank is not None:
+            layout_bank.check_environment(self)
+            self.load_layout(self.rng.randrange(len(layout_bank)))
+            return
 
         # Generate the maze
         self.generate_maze()
@@ -22,40 +37,48 @@ class MazeEnvironment:
         # Set an open starting position for the car
         self.start_x, self.start_y = self.find_open_start()
 
-    def generate_maze(self):
-        # Initialize the maze grid with walls (1)
-        self.grid = [[1 for _ in range(self.columns)] for _ in range(self.rows)]
-
-        # Start the maze generation from the top-left corner
-        current_cell = (0, 0)
-        self.visited = [current_cell]
-        self.stack = [current_cell]
-        self.grid[0][0] = 0  # Mark the start as an open path
-
-        while self.stack:
-            current_cell = self.stack[-1]
-            neighbors = self.get_neighbors(current_cell)
-
-            if neighbors:
-                next_cell = random.choice(neighbors)
-                self.remove_wall(current_cell, next_cell)
-                self.stack.append(next_cell)
-                self.visited.append(next_cell)
-            else:
-                self.stack.pop()
+    @property
+    def grid(self):
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        self._grid = grid
+        self.layout_changed()
+
+    def layout_changed(self):
+        # The grid no longer matches a bank layout, and cached distance fields are stale
+        self.layout_index = None
+        self.distance_fields.invalidate()
+        self.field_grid = None
+
+    def distance_field(self, resolution=1):
+        """Return the DistanceField of the current maze, building it on first use.
+
+        The grid is compared with the one the cached fields were built from, so cells edited in
+        place (grid[row, column] = 1) are picked up too.
+        """
+        if self.field_grid is None or not np.array_equal(self.field_grid, self._grid):
+            if self.field_grid is not None:
+                self.layout_changed()
+            self.field_grid = np.array(self._grid)
+        return self.distance_fields.get(self, resolution)
 
-        print(f"Maze grid generated: {self.grid}")
+    def generate_maze(self):
+        # Walls are 1 and open paths 0, indexed [row, column]
+        self.grid = generate_maze(self.columns, self.rows, self.algorithm, self.rng)
 
     def get_neighbors(self, cell):
         neighbors = []
         x, y = cell
-        if x > 1 and (x - 2, y) not in self.visited:  # Left (skip 1 cell for wall)
+        # Rooms that are still walls have not been carved into yet
+        if x > 1 and self.grid[y, x - 2] == 1:  # Left (skip 1 cell for wall)
             neighbors.append((x - 2, y))
-        if x < self.columns - 2 and (x + 2, y) not in self.visited:  # Right
+        if x < self.columns - 2 and self.grid[y, x + 2] == 1:  # Right
             neighbors.append((x + 2, y))
-        if y > 1 and (x, y - 2) not in self.visited:  # Up
+        if y > 1 and self.grid[y - 2, x] == 1:  # Up
             neighbors.append((x, y - 2))
-        if y < self.rows - 2 and (x, y + 2) not in self.visited:  # Down
+        if y < self.rows - 2 and self.grid[y + 2, x] == 1:  # Down
             neighbors.append((x, y + 2))
         return neighbors
 
@@ -63,27 +86,42 @@ class MazeEnvironment:
         x1, y1 = current
         x2, y2 = next
 
-        self.grid[y2][x2] = 0  # Mark next cell as a path
+        self.grid[y2, x2] = 0  # Mark next cell as a path
 
         # Remove the wall between the current cell and the next cell
         if x1 == x2:  # Moving vertically
-            self.grid[min(y1, y2) + 1][x1] = 0
+            self.grid[min(y1, y2) + 1, x1] = 0
         elif y1 == y2:  # Moving horizontally
-            self.grid[y1][min(x1, x2) + 1] = 0
+            self.grid[y1, min(x1, x2) + 1] = 0
+        self.layout_changed()
+
+    def reset(self, layout_index=None):
+        # With a layout bank, switch to the given (or a random) stored maze instead of generating one
+        if self.layout_bank is not None:
+            if layout_index is None:
+                layout_index = self.rng.randrange(len(self.layout_bank))
+            self.load_layout(layout_index)
+            return self.grid
 
-    def reset(self):
         # Regenerate the maze each time the environment is reset
         self.generate_maze()
         self.start_x, self.start_y = self.find_open_start()  # Update start position
         return self.grid
 
+    def load_layout(self, index):
+        """Replace the maze and start position with layout index of the layout bank."""
+        self.grid = self.layout_bank.grid(index)
+        self.start_x, self.start_y = self.layout_bank.start(index)
+        self.layout_index = index
+
     def draw(self, screen):
-        # Draw the maze on the screen
+        import pygame  # Only needed when rendering, so headless runs never load it
+
+        # Draw the maze on the screen: one pixel per cell, scaled up by cell_size in a single blit
         screen.fill(WHITE)
-        for y in range(self.rows):
-            for x in range(self.columns):
-                if self.grid[y][x] == 1:  # Wall
-                    pygame.draw.rect(screen, BLACK, pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size))
+        colours = np.where(self.grid.T[..., None] == 1, BLACK, WHITE).astype(np.uint8)  # Indexed [x, y]
+        cells = pygame.surfarray.make_surface(colours)
+        screen.blit(pygame.transform.scale(cells, (self.columns * self.cell_size, self.rows * self.cell_size)), (0, 0))
 
     def is_position_obstacle(self, x, y):
         """Check if the given (x, y) position is occupied by a maze wall."""
@@ -91,12 +129,24 @@ class MazeEnvironment:
         grid_y = y // self.cell_size
         if grid_x >= self.columns or grid_y >= self.rows or grid_x < 0 or grid_y < 0:
             return True  # Treat out-of-bounds as obstacles
-        return self.grid[grid_y][grid_x] == 1  # Return True if it's a wall (1)
+        return bool(self.grid[grid_y, grid_x] == 1)  # Return True if it's a wall (1)
+
+    def are_positions_obstacles(self, xs, ys):
+        """Vectorized is_position_obstacle: a boolean array, True for walls and anything off the grid."""
+        grid_xs = np.floor_divide(np.asarray(xs), self.cell_size).astype(np.int64)
+        grid_ys = np.floor_divide(np.asarray(ys), self.cell_size).astype(np.int64)
+        inside = (grid_xs >= 0) & (grid_ys >= 0) & (grid_xs < self.columns) & (grid_ys < self.rows)
+        result = np.ones(grid_xs.shape, dtype=bool)
+        result[inside] = np.asarray(self.grid)[grid_ys[inside], grid_xs[inside]] == 1
+        return result
 
     def find_open_start(self):
         """Find an open position in the middle of a path to start."""
-        for y in range(1, self.rows - 1):
-            for x in range(1, self.columns - 1):
-                if self.grid[y][x] == 0 and self.grid[y - 1][x] == 0 and self.grid[y + 1][x] == 0 and self.grid[y][x - 1] == 0 and self.grid[y][x + 1] == 0:
-                    return x * self.cell_size + self.cell_size // 2, y * self.cell_size + self.cell_size // 2
-        return 50, 50  # Default to (50, 50) if no open path is found
+        # Open cells whose four neighbours are open too, first in row-major order
+        open_cells = self.grid == 0
+        candidates = (open_cells[1:-1, 1:-1] & open_cells[:-2, 1:-1] & open_cells[2:, 1:-1] &
+                      open_cells[1:-1, :-2] & open_cells[1:-1, 2:])
+        if not candidates.any():
+            return 50, 50  # Default to (50, 50) if no open path is found
+        y, x = np.unravel_index(np.argmax(candidates), candidates.shape)
+        return (int(x) + 1) * self.cell_size + self.cell_size // 2, (int(y) + 1) * self.cell_size + self.cell_size // 2
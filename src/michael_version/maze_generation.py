@@ -0,0 +1,225 @@
+"""Perfect maze generation on a NumPy grid.
+
+Mazes are carved on a lattice of "rooms" at even (x, y) grid positions; the odd cells between
+two rooms are the walls that get knocked through. Each algorithm below works on flat room
+indices (room_y * room_columns + room_x) and returns the spanning tree as two sequences of
+connected rooms, which generate_maze then carves into the grid in one go.
+
+A 1000 x 1000 cell maze takes about 0.25 s with backtracker, prim or kruskal. wilson is the
+exception: its loop-erased random walks are inherently sequential and take 0.7-2 s at that size,
+depending on how long the first walks wander before they hit the tree.
+"""
+import random
+
+import numpy as np
+
+
+def _backtracker(room_columns, room_rows, rng):
+    """Recursive backtracker (randomized depth-first search), run iteratively with an explicit stack."""
+    size = room_columns * room_rows
+    last_column = room_columns - 1
+    visited = bytearray(size)
+    visited[0] = 1
+    stack = [0]
+    sources, targets = [], []
+    rand = rng.random
+
+    while stack:
+        cell = stack[-1]
+        x = cell % room_columns
+        neighbors = []
+        if x and not visited[cell - 1]:
+            neighbors.append(cell - 1)
+        if x != last_column and not visited[cell + 1]:
+            neighbors.append(cell + 1)
+        if cell >= room_columns and not visited[cell - room_columns]:
+            neighbors.append(cell - room_columns)
+        if cell + room_columns < size and not visited[cell + room_columns]:
+            neighbors.append(cell + room_columns)
+
+        if not neighbors:
+            stack.pop()
+            continue
+        next_cell = neighbors[int(rand() * len(neighbors))] if len(neighbors) > 1 else neighbors[0]
+        visited[next_cell] = 1
+        sources.append(cell)
+        targets.append(next_cell)
+        stack.append(next_cell)
+
+    return sources, targets
+
+
+def _room_neighbors(cells, room_columns, size):
+    """Left, right, up and down neighbours of each room as a (len(cells), 4) array, and which exist."""
+    xs = cells % room_columns
+    neighbors = cells[:, None] + np.array([-1, 1, -room_columns, room_columns])
+    valid = np.stack([xs > 0, xs < room_columns - 1, cells >= room_columns, cells + room_columns < size], axis=1)
+    return neighbors, valid
+
+
+def _prim(room_columns, room_rows, rng, attach_probability=0.25):
+    """Randomized Prim's, run in rounds: every frontier room joins the tree with attach_probability.
+
+    Each joining room is attached to a random neighbour that was already in the maze, so rooms
+    joining in the same round never connect to each other. Picking a quarter of the frontier per
+    round keeps the texture of the one-room-at-a-time version (about 35% dead ends) while the
+    work is done on arrays.
+    """
+    size = room_columns * room_rows
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    in_maze = np.zeros(size, dtype=bool)
+    in_frontier = np.zeros(size, dtype=bool)
+    sources, targets = [], []
+
+    def add(cells):
+        in_maze[cells] = True
+        neighbors, valid = _room_neighbors(cells, room_columns, size)
+        neighbors = neighbors[valid]
+        neighbors = np.unique(neighbors[~in_maze[neighbors] & ~in_frontier[neighbors]])
+        in_frontier[neighbors] = True
+        return neighbors
+
+    frontier = add(np.array([int(rng.random() * size)]))
+    while frontier.size:
+        chosen = np_rng.random(frontier.size) < attach_probability
+        cells, frontier = frontier[chosen], frontier[~chosen]
+        if not cells.size:
+            continue
+        in_frontier[cells] = False
+        neighbors, valid = _room_neighbors(cells, room_columns, size)
+        candidates = valid & in_maze[np.where(valid, neighbors, 0)]
+        scores = np.where(candidates, np_rng.random(candidates.shape), -1)
+        sources.append(neighbors[np.arange(cells.size), scores.argmax(axis=1)])
+        targets.append(cells)
+        frontier = np.concatenate([frontier, add(cells)])
+
+    if not sources:
+        return [], []  # A single room
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def _kruskal(room_columns, room_rows, rng):
+    """Randomized Kruskal's: the minimum spanning tree of the walls weighted in shuffled order.
+
+    The tree is found with Boruvka's algorithm, which joins every component to its lightest wall
+    in each round, so there are only O(log rooms) rounds of array work. With distinct weights the
+    tree is the same one Kruskal's edge-by-edge union-find would build.
+    """
+    size = room_columns * room_rows
+    rooms = np.arange(size).reshape(room_rows, room_columns)
+    sources = np.concatenate([rooms[:, :-1].ravel(), rooms[:-1, :].ravel()])
+    targets = np.concatenate([rooms[:, 1:].ravel(), rooms[1:, :].ravel()])
+    order = np.random.default_rng(rng.getrandbits(64)).permutation(len(sources))
+    sources, targets = sources[order], targets[order]
+
+    component = np.arange(size)
+    edges = np.arange(len(sources))  # Walls still between two components, lightest first
+    kept = []
+    while True:
+        source_components, target_components = component[sources[edges]], component[targets[edges]]
+        between = source_components != target_components
+        edges = edges[between]
+        source_components, target_components = source_components[between], target_components[between]
+        if not edges.size:
+            break
+
+        # Both ends of every wall, in weight order. Sorting component * n + position groups them by
+        # component with the lightest wall first, without a slower stable argsort
+        ends = np.column_stack([source_components, target_components]).ravel()
+        n = ends.size
+        keys = np.sort(ends * n + np.arange(n))
+        keys = keys[np.concatenate([[True], keys[1:] // n != keys[:-1] // n])]
+        owners, first = keys // n, keys % n
+        lightest = first // 2
+        chosen = np.zeros(edges.size, dtype=bool)
+        chosen[lightest] = True  # Two components can pick the same wall
+        kept.append(edges[chosen])
+
+        # Hook each component onto the one across its lightest wall; pairs that chose the same wall
+        # point at each other, and the smaller label becomes their root
+        hook = np.arange(size)
+        hook[owners] = np.where(ends[first] == source_components[lightest], target_components[lightest],
+                                source_components[lightest])
+        roots = owners[(hook[hook[owners]] == owners) & (owners < hook[owners])]
+        hook[roots] = roots
+        while True:
+            jumped = hook[hook]
+            if np.array_equal(jumped, hook):
+                break
+            hook = jumped
+        component = hook[component]
+
+    if not kept:
+        return [], []
+    kept = np.concatenate(kept)
+    return sources[kept], targets[kept]
+
+
+def _wilson(room_columns, room_rows, rng):
+    """Wilson's algorithm: loop-erased random walks, giving a uniformly random spanning tree."""
+    size = room_columns * room_rows
+    in_maze = bytearray(size)
+    in_maze[int(rng.random() * size)] = 1
+    next_cell = [0] * size  # Last exit taken from each room on the current walk; later exits erase loops
+    sources, targets = [], []
+    rand = rng.random
+
+    for start in range(size):
+        if in_maze[start]:
+            continue
+        cell = start
+        while not in_maze[cell]:
+            x = cell % room_columns
+            neighbors = []
+            if x > 0:
+                neighbors.append(cell - 1)
+            if x < room_columns - 1:
+                neighbors.append(cell + 1)
+            if cell >= room_columns:
+                neighbors.append(cell - room_columns)
+            if cell + room_columns < size:
+                neighbors.append(cell + room_columns)
+            next_cell[cell] = neighbors[int(rand() * len(neighbors))]
+            cell = next_cell[cell]
+
+        # Retrace the loop-erased walk and add it to the maze
+        cell = start
+        while not in_maze[cell]:
+            in_maze[cell] = 1
+            sources.append(cell)
+            targets.append(next_cell[cell])
+            cell = next_cell[cell]
+
+    return sources, targets
+
+
+MAZE_ALGORITHMS = {
+    'backtracker': _backtracker,
+    'prim': _prim,
+    'kruskal': _kruskal,
+    'wilson': _wilson,
+}
+
+
+def generate_maze(columns, rows, algorithm='backtracker', rng=None):
+    """Generate a perfect maze as a (rows, columns) int8 grid where 1 is a wall and 0 is open.
+
+    Rooms sit at even (x, y) positions and every room is reachable from every other one. rng is a
+    random.Random; pass a seeded one for reproducible mazes.
+    """
+    if algorithm not in MAZE_ALGORITHMS:
+        raise ValueError(f"Unknown maze algorithm {algorithm!r}, expected one of {sorted(MAZE_ALGORITHMS)}")
+    if rng is None:
+        rng = random.Random()
+
+    grid = np.ones((rows, columns), dtype=np.int8)
+    room_columns, room_rows = (columns + 1) // 2, (rows + 1) // 2
+    if room_columns == 0 or room_rows == 0:
+        return grid
+
+    sources, targets = MAZE_ALGORITHMS[algorithm](room_columns, room_rows, rng)
+    grid[0::2, 0::2] = 0
+    sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+    # The wall between two neighbouring rooms sits at the sum of their room coordinates
+    grid[sources // room_columns + targets // room_columns, sources % room_columns + targets % room_columns] = 0
+    return grid
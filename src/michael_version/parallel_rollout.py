@@ -0,0 +1,152 @@
+import random
+import time
+
+import numpy as np
+import torch
+
+from car import Car
+from car_environment import CarEnvironment
+from dqn_agent import DQN
+
+
+class SharedTransitionQueue:
+    """Single-producer, single-consumer ring of transitions in shared memory.
+
+    A rollout worker writes transitions straight into the shared arrays and the learner copies
+    them into its replay buffer in bulk, so nothing is pickled on the way.
+    """
+
+    def __init__(self, capacity, state_size, ctx):
+        self.capacity = capacity
+        self.state_size = state_size
+        self._states = ctx.RawArray('f', capacity * state_size)
+        self._next_states = ctx.RawArray('f', capacity * state_size)
+        self._actions = ctx.RawArray('q', capacity)
+        self._rewards = ctx.RawArray('f', capacity)
+        self._dones = ctx.RawArray('f', capacity)
+        # Monotonic counters; the locks double as memory barriers between the two processes
+        self.write_count = ctx.Value('q', 0)
+        self.read_count = ctx.Value('q', 0)
+        self._views = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_views'] = None  # NumPy views are rebuilt on the other side
+        return state
+
+    def _arrays(self):
+        if self._views is None:
+            self._views = (
+                np.frombuffer(self._states, dtype=np.float32).reshape(self.capacity, self.state_size),
+                np.frombuffer(self._actions, dtype=np.int64),
+                np.frombuffer(self._rewards, dtype=np.float32),
+                np.frombuffer(self._next_states, dtype=np.float32).reshape(self.capacity, self.state_size),
+                np.frombuffer(self._dones, dtype=np.float32),
+            )
+        return self._views
+
+    def put(self, state, action, reward, next_state, done):
+        """Write one transition; returns False without writing if the learner has fallen a full ring behind."""
+        write_count = self.write_count.value
+        if write_count - self.read_count.value >= self.capacity:
+            return False
+
+        states, actions, rewards, next_states, dones = self._arrays()
+        i = write_count % self.capacity
+        states[i] = state
+        actions[i] = action
+        rewards[i] = reward
+        next_states[i] = next_state
+        dones[i] = done
+
+        with self.write_count.get_lock():
+            self.write_count.value = write_count + 1
+        return True
+
+    def drain(self, replay_buffer):
+        """Copy every unread transition into the replay buffer and return how many were copied."""
+        read_count = self.read_count.value
+        count = self.write_count.value - read_count
+        if count == 0:
+            return 0
+
+        indices = (read_count + np.arange(count)) % self.capacity
+        states, actions, rewards, next_states, dones = self._arrays()
+        replay_buffer.append_batch(states[indices], actions[indices], rewards[indices], next_states[indices],
+                                   dones[indices])
+
+        with self.read_count.get_lock():
+            self.read_count.value = read_count + count
+        return count
+
+
+class SharedWeights:
+    """Flat copy of the learner's DQN parameters (and current epsilon) that workers sync from."""
+
+    def __init__(self, model, ctx):
+        self.size = sum(parameter.numel() for parameter in model.parameters())
+        self._buffer = ctx.RawArray('f', self.size)
+        self.version = ctx.Value('q', 0)
+        self.epsilon = ctx.RawValue('d', 1.0)
+
+    def publish(self, model, epsilon):
+        """Copy the model parameters into shared memory and bump the version."""
+        vector = torch.nn.utils.parameters_to_vector(model.parameters()).detach().cpu().numpy()
+        with self.version.get_lock():
+            np.frombuffer(self._buffer, dtype=np.float32)[:] = vector
+            self.epsilon.value = epsilon
+            self.version.value += 1
+
+    def pull(self, model, known_version):
+        """Load the shared parameters into model if they changed and return (version, epsilon)."""
+        with self.version.get_lock():
+            version = self.version.value
+            epsilon = self.epsilon.value
+            if version != known_version:
+                vector = torch.from_numpy(np.frombuffer(self._buffer, dtype=np.float32).copy())
+        if version != known_version:
+            torch.nn.utils.vector_to_parameters(vector, model.parameters())
+        return version, epsilon
+
+
+def rollout_worker(worker_id, environment_factory, transition_queue, shared_weights, epsilon_exponent, stop_event,
+                   episode_queue, seed, action_size=7, max_steps=2000, sync_steps=100, action_repeat=1):
+    """Run episodes with a periodically synced copy of the DQN and stream the transitions to the learner."""
+    torch.set_num_threads(1)  # Each worker owns a single core
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    environment = environment_factory()
+    car = Car(environment.start_x, environment.start_y, environment)
+    env = CarEnvironment(car, environment, visualize=False, action_repeat=action_repeat)
+    model = DQN(transition_queue.state_size, action_size)
+    version, epsilon = shared_weights.pull(model, -1)
+
+    while not stop_event.is_set():
+        state = env.reset()
+        total_reward = 0
+
+        for time_step in range(max_steps):
+            if time_step % sync_steps == 0:
+                version, epsilon = shared_weights.pull(model, version)
+
+            # Every worker explores at its own fixed power of the learner's epsilon
+            if np.random.rand() <= epsilon ** epsilon_exponent:
+                action = random.randrange(action_size)
+            else:
+                with torch.no_grad():
+                    action = torch.argmax(model(torch.from_numpy(state))).item()
+
+            next_state, reward, done = env.step(action)
+            while not transition_queue.put(state, action, reward, next_state, done):
+                if stop_event.is_set():
+                    return
+                time.sleep(0.001)  # Wait for the learner to catch up
+
+            state = next_state
+            total_reward += reward
+            if done or stop_event.is_set():
+                break
+
+        episode_queue.put((worker_id, total_reward))
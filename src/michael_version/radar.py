@@ -0,0 +1,289 @@
+import numpy as np
+
+RADAR_DEGREES = np.arange(0, 360, 15)  # Beam offsets from the car's heading
+RADAR_MAX_LENGTH = 100
+MAX_SAMPLES_AT_ONCE = 1_000_000  # Above this many ray samples, beams are marched in chunks
+MAX_CLIP_RETRIES = 4  # Clipped walls cast_rays_grid skips before marching a ray sample by sample
+
+
+def cast_radar(environment, origin_x, origin_y, heading, degrees=RADAR_DEGREES, max_length=RADAR_MAX_LENGTH):
+    """Cast every radar beam from one origin at once.
+
+    Returns integer arrays (xs, ys, distances) with one entry per beam, matching what
+    Car.check_radar produces one beam at a time.
+    """
+    angles = np.radians(heading + np.asarray(degrees, dtype=np.float64))
+    origin_xs = np.full(angles.shape, origin_x, dtype=np.float64)
+    origin_ys = np.full(angles.shape, origin_y, dtype=np.float64)
+    return cast_rays(environment, origin_xs, origin_ys, angles, max_length)
+
+
+def cast_rays(environment, origin_xs, origin_ys, angles, max_length=RADAR_MAX_LENGTH):
+    """Cast rays with arbitrary origins and angles (radians), picking the fastest method the environment supports."""
+    grid = getattr(environment, 'grid', None)
+    cell_size = getattr(environment, 'cell_size', None)
+    if isinstance(cell_size, int) and isinstance(grid, (list, np.ndarray)):
+        return cast_rays_grid(np.asarray(grid) == 1, cell_size, environment.screen_width, environment.screen_height,
+                              origin_xs, origin_ys, angles, max_length)
+
+    occupancy = getattr(environment, 'occupancy', None)
+    if isinstance(occupancy, np.ndarray):
+        if angles.size * max_length > MAX_SAMPLES_AT_ONCE and hasattr(environment, 'distance_field'):
+            # Too many samples to take at once: skip through open space using the distance field
+            return cast_rays_traced(occupancy, environment.distance_field().distances, origin_xs, origin_ys, angles,
+                                    max_length)
+        return cast_rays_occupancy(occupancy, origin_xs, origin_ys, angles, max_length)
+
+    return cast_rays_probe(environment, origin_xs, origin_ys, angles, max_length)
+
+
+def _sample_points(origin_xs, origin_ys, angles, lengths):
+    # astype truncates towards zero, the same as int() in the per-pixel radar loop
+    xs = (origin_xs[..., None] + np.cos(angles)[..., None] * lengths).astype(np.int64)
+    ys = (origin_ys[..., None] + np.sin(angles)[..., None] * lengths).astype(np.int64)
+    return xs, ys
+
+
+def _first_stop(xs, ys, stopped, origin_xs, origin_ys):
+    """Pick the first stopped sample along the last axis, or the last sample if none stopped."""
+    shape, samples = xs.shape[:-1], xs.shape[-1]
+    stopped = stopped.reshape(-1, samples)
+    rays = np.arange(len(stopped))
+    first = stopped.argmax(axis=-1)
+    first[~stopped[rays, first]] = samples - 1
+    hit_xs = xs.reshape(-1, samples)[rays, first].reshape(shape)
+    hit_ys = ys.reshape(-1, samples)[rays, first].reshape(shape)
+    distances = np.sqrt((hit_xs - origin_xs) ** 2 + (hit_ys - origin_ys) ** 2).astype(np.int64)
+    return hit_xs, hit_ys, distances
+
+
+def cast_rays_occupancy(occupancy, origin_xs, origin_ys, angles, max_length=RADAR_MAX_LENGTH):
+    """Sample every ray at every integer length over a [y, x] occupancy bitmap and keep the first hit."""
+    if angles.size * max_length > MAX_SAMPLES_AT_ONCE:
+        return _cast_rays_occupancy_chunked(occupancy, origin_xs, origin_ys, angles, max_length)
+
+    height, width = occupancy.shape
+    xs, ys = _sample_points(origin_xs, origin_ys, angles, np.arange(1, max_length + 1))
+
+    # A beam stops when it leaves the screen or reaches an obstacle
+    inside = (xs >= 0) & (ys >= 0) & (xs < width) & (ys < height)
+    stopped = occupancy.ravel()[np.where(inside, ys * width + xs, 0)]
+    stopped |= ~inside
+    return _first_stop(xs, ys, stopped, origin_xs, origin_ys)
+
+
+def _cast_rays_occupancy_chunked(occupancy, origin_xs, origin_ys, angles, max_length, chunk_length=16):
+    """March many rays a chunk of lengths at a time, dropping rays as soon as they stop."""
+    height, width = occupancy.shape
+    shape = angles.shape
+    flat_occupancy = occupancy.ravel()
+    origin_xs, origin_ys, angles = origin_xs.ravel(), origin_ys.ravel(), angles.ravel()
+    dx, dy = np.cos(angles), np.sin(angles)
+    hit_xs = np.empty(angles.shape, dtype=np.int64)
+    hit_ys = np.empty(angles.shape, dtype=np.int64)
+    active = np.arange(angles.size)
+
+    for start in range(1, max_length + 1, chunk_length):
+        lengths = np.arange(start, min(start + chunk_length, max_length + 1))
+        xs = (origin_xs[active, None] + dx[active, None] * lengths).astype(np.int64)
+        ys = (origin_ys[active, None] + dy[active, None] * lengths).astype(np.int64)
+        inside = (xs >= 0) & (ys >= 0) & (xs < width) & (ys < height)
+        stopped = flat_occupancy[np.where(inside, ys * width + xs, 0)]
+        stopped |= ~inside
+
+        # Rays still running at max_length end on their last sample
+        if lengths[-1] == max_length:
+            stopped[:, -1] = True
+        rays = np.flatnonzero(stopped.any(axis=1))
+        first = stopped[rays].argmax(axis=1)
+        hit_xs[active[rays]] = xs[rays, first]
+        hit_ys[active[rays]] = ys[rays, first]
+        active = np.delete(active, rays)
+        if active.size == 0:
+            break
+
+    distances = np.sqrt((hit_xs - origin_xs) ** 2 + (hit_ys - origin_ys) ** 2).astype(np.int64)
+    return hit_xs.reshape(shape), hit_ys.reshape(shape), distances.reshape(shape)
+
+
+def cast_rays_traced(occupancy, distances, origin_xs, origin_ys, angles, max_length=RADAR_MAX_LENGTH):
+    """Sphere-trace rays over an occupancy bitmap, giving exactly the hits of cast_rays_occupancy.
+
+    distances is the exact distance transform of occupancy (DistanceField.distances at resolution
+    1). From each sample a ray jumps over every later sample that is provably free: truncating
+    both the sample and a later point to pixels moves each by less than sqrt(2), so samples
+    closer than the distance at this pixel minus 2 * sqrt(2) cannot be blocked.
+    """
+    height, width = occupancy.shape
+    shape = angles.shape
+    origin_xs, origin_ys, angles = origin_xs.ravel(), origin_ys.ravel(), angles.ravel()
+    dx, dy = np.cos(angles), np.sin(angles)
+    hit_xs = np.empty(angles.shape, dtype=np.int64)
+    hit_ys = np.empty(angles.shape, dtype=np.int64)
+    active = np.arange(angles.size)
+    lengths = np.ones(angles.size)
+    margin = 2 * np.sqrt(2)
+
+    while active.size:
+        # Same arithmetic as _sample_points, so the samples land on the same pixels
+        xs = (origin_xs[active] + dx[active] * lengths).astype(np.int64)
+        ys = (origin_ys[active] + dy[active] * lengths).astype(np.int64)
+        inside = (xs >= 0) & (ys >= 0) & (xs < width) & (ys < height)
+        flat = np.where(inside, ys * width + xs, 0)
+        stopped = ~inside | occupancy.ravel()[flat] | (lengths == max_length)
+
+        rays = active[stopped]
+        hit_xs[rays] = xs[stopped]
+        hit_ys[rays] = ys[stopped]
+
+        running = ~stopped
+        xs, ys, flat = xs[running], ys[running], flat[running]
+        # Leaving the screen stops a beam too, so the border is one more obstacle
+        clearance = np.minimum(distances.ravel()[flat], np.minimum(np.minimum(xs + 1, ys + 1),
+                                                                   np.minimum(width - xs, height - ys)))
+        steps = np.maximum(np.floor(clearance - margin) + 1, 1)
+        lengths = np.minimum(lengths[running] + steps, max_length)
+        active = active[running]
+
+    distances = np.sqrt((hit_xs - origin_xs) ** 2 + (hit_ys - origin_ys) ** 2).astype(np.int64)
+    return hit_xs.reshape(shape), hit_ys.reshape(shape), distances.reshape(shape)
+
+
+def cast_rays_grid(walls, cell_size, screen_width, screen_height, origin_xs, origin_ys, angles,
+                   max_length=RADAR_MAX_LENGTH):
+    """Traverse the wall grid cell by cell (DDA) to find where each ray first enters a wall.
+
+    walls is a [row, column] boolean array. Cells outside the grid or the screen count as walls,
+    as in MazeEnvironment.is_position_obstacle. Results match the per-pixel march of
+    cast_rays_probe exactly: a wall the ray only clips between two integer samples (a corner, or
+    the wall the ray starts in) is not a hit there either, and the traversal carries on past it.
+    """
+    shape = angles.shape
+    origin_xs, origin_ys, angles = (np.ravel(a) for a in np.broadcast_arrays(origin_xs, origin_ys, angles))
+    rows, columns = walls.shape
+    width, height = min(screen_width, columns * cell_size), min(screen_height, rows * cell_size)
+    # A ring of cells lets the traversal index freely; leaving the open area is handled separately.
+    # int() truncates samples in (-1, 0) to 0, so the ring above and left of the grid repeats the
+    # first row and column
+    padded = np.zeros((rows + 2, columns + 2), dtype=bool)
+    padded[1:-1, 1:-1] = walls
+    padded[0, 1:-1], padded[1:-1, 0], padded[0, 0] = walls[0], walls[:, 0], walls[0, 0]
+    padded = padded.ravel()
+
+    # A beam whose truncated samples keep one coordinate over its whole length (an axis-aligned
+    # beam, whose cos or sin is only rounding noise) is traced exactly along that pixel column or
+    # row, so a beam starting on a cell boundary sees the same cells as its samples. Where that
+    # coordinate drifts by less than a pixel but still crosses one, rounding decides the sample
+    # that crosses, so those beams are marched sample by sample
+    dx, dy = np.cos(angles), np.sin(angles)
+    trace_xs, trace_ys = origin_xs.copy(), origin_ys.copy()
+    march = np.zeros(angles.size, dtype=bool)
+    ends = np.array([1, max_length])
+    for trace, direction, origin in ((trace_xs, dx, origin_xs), (trace_ys, dy, origin_ys)):
+        first, last = (origin[:, None] + direction[:, None] * ends).astype(np.int64).T
+        constant = first == last
+        march |= ~constant & (np.abs(direction) * max_length < 1)
+        trace[constant] = first[constant] + 0.5
+        direction[constant] = 0
+
+    def trace(rays, skip_before):
+        return _grid_hit_lengths(padded, columns, rows, cell_size, width, height, trace_xs[rays], trace_ys[rays],
+                                 dx[rays], dy[rays], max_length, skip_before)
+
+    def blocked_samples(rays, hit_lengths):
+        # The integer samples around each exact hit length and which of them the march stops at
+        rounded = np.minimum(np.ceil(hit_lengths), max_length)
+        candidates = np.minimum(np.maximum(rounded[..., None] + np.arange(-1, 3), 1), max_length)
+        xs, ys = _sample_points(origin_xs[rays], origin_ys[rays], angles[rays], candidates)
+        inside = (xs >= 0) & (ys >= 0) & (xs < width) & (ys < height)
+        flat_cells = np.where(inside, (ys // cell_size + 1) * (columns + 2) + xs // cell_size + 1, 0)
+        stopped = padded[flat_cells] | ~inside
+        stopped[hit_lengths > max_length] = False
+        return xs, ys, stopped
+
+    rays = np.arange(angles.size)
+    skip_before = np.full(angles.size, -1.0)
+    hit_lengths = trace(rays, skip_before)
+    xs, ys, stopped = blocked_samples(rays, hit_lengths)
+    # A hit that no integer sample lands in was clipped between samples; look again beyond it
+    for _ in range(MAX_CLIP_RETRIES):
+        clipped = np.flatnonzero(~stopped.any(axis=-1) & (hit_lengths <= max_length))
+        if not clipped.size:
+            break
+        skip_before[clipped] = hit_lengths[clipped]
+        hit_lengths[clipped] = trace(clipped, skip_before[clipped])
+        xs[clipped], ys[clipped], stopped[clipped] = blocked_samples(clipped, hit_lengths[clipped])
+    # Rays that run out of walls stop at max_length, where no candidate sample is blocked
+    unresolved = ~stopped.any(axis=-1) & (hit_lengths <= max_length)
+    stopped[..., 1] |= ~stopped.any(axis=-1)
+    hit_xs, hit_ys, distances = _first_stop(xs, ys, stopped, origin_xs, origin_ys)
+
+    # Rays starting off the open area can still sample their way into it, and a few rays clip more
+    # walls than there are retries: march those sample by sample too
+    unresolved |= march | (origin_xs <= -1) | (origin_ys <= -1) | (origin_xs >= width) | (origin_ys >= height)
+    rays = np.flatnonzero(unresolved)
+    if rays.size:
+        xs, ys = _sample_points(origin_xs[rays], origin_ys[rays], angles[rays], np.arange(1, max_length + 1))
+        inside = (xs >= 0) & (ys >= 0) & (xs < width) & (ys < height)
+        flat_cells = np.where(inside, (ys // cell_size + 1) * (columns + 2) + xs // cell_size + 1, 0)
+        hit_xs[rays], hit_ys[rays], distances[rays] = _first_stop(xs, ys, padded[flat_cells] | ~inside,
+                                                                  origin_xs[rays], origin_ys[rays])
+    return hit_xs.reshape(shape), hit_ys.reshape(shape), distances.reshape(shape)
+
+
+def _grid_hit_lengths(padded, columns, rows, cell_size, width, height, origin_xs, origin_ys, dx, dy, max_length,
+                      skip_before):
+    """Exact length at which each ray first enters a wall cell (past skip_before) or leaves the open area."""
+    abs_dx, abs_dy = np.abs(dx), np.abs(dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Ray length at which the beam leaves the open area. int() truncates towards zero, so a
+        # sample only counts as off the left/top edge once it reaches -1
+        border_lengths = np.minimum(np.where(dx > 0, width - origin_xs, origin_xs + 1) / abs_dx,
+                                    np.where(dy > 0, height - origin_ys, origin_ys + 1) / abs_dy)
+        outside = (origin_xs <= -1) | (origin_ys <= -1) | (origin_xs >= width) | (origin_ys >= height)
+        border_lengths[outside] = 0
+
+        cell_xs = np.minimum(np.maximum(origin_xs // cell_size, -1), columns).astype(np.int64)
+        cell_ys = np.minimum(np.maximum(origin_ys // cell_size, -1), rows).astype(np.int64)
+        step_xs = np.where(dx > 0, 1, -1)
+        step_ys = np.where(dy > 0, columns + 2, -(columns + 2))
+        delta_xs = cell_size / abs_dx
+        delta_ys = cell_size / abs_dy
+        # Ray length at which the next vertical / horizontal cell boundary is crossed
+        next_xs = np.where(dx > 0, (cell_xs + 1) * cell_size - origin_xs, origin_xs - cell_xs * cell_size) / abs_dx
+        next_ys = np.where(dy > 0, (cell_ys + 1) * cell_size - origin_ys, origin_ys - cell_ys * cell_size) / abs_dy
+    next_xs[dx == 0] = np.inf
+    next_ys[dy == 0] = np.inf
+
+    cells = (cell_ys + 1) * (columns + 2) + cell_xs + 1
+    last_cell = len(padded) - 1
+    hit_lengths = np.where(padded[cells] & (skip_before < 0), 0.0, border_lengths)
+    # Each step crosses one cell boundary; stop once every ray is past max_length or has hit
+    for _ in range(2 * (max_length // cell_size + 2)):
+        cross_x = next_xs < next_ys
+        entry_lengths = np.where(cross_x, next_xs, next_ys)
+        if (entry_lengths >= np.minimum(hit_lengths, max_length)).all():
+            break
+        cells += np.where(cross_x, step_xs, step_ys)
+        next_xs = np.where(cross_x, next_xs + delta_xs, next_xs)
+        next_ys = np.where(cross_x, next_ys, next_ys + delta_ys)
+        in_wall = padded[np.minimum(np.maximum(cells, 0), last_cell)] & (entry_lengths > skip_before)
+        np.copyto(hit_lengths, entry_lengths, where=in_wall & (entry_lengths < hit_lengths))
+    return hit_lengths
+
+
+def cast_rays_probe(environment, origin_xs, origin_ys, angles, max_length=RADAR_MAX_LENGTH):
+    """Fallback for environments without an occupancy array: probe is_position_obstacle point by point."""
+    hit_xs = np.empty(angles.shape, dtype=np.int64)
+    hit_ys = np.empty(angles.shape, dtype=np.int64)
+    for i, (origin_x, origin_y, angle) in enumerate(zip(origin_xs.flat, origin_ys.flat, angles.flat)):
+        xs, ys = _sample_points(np.array(origin_x), np.array(origin_y), np.array(angle), np.arange(1, max_length + 1))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            if x < 0 or y < 0 or x >= environment.screen_width or y >= environment.screen_height:
+                break
+            if environment.is_position_obstacle(x, y):
+                break
+        hit_xs.flat[i] = x
+        hit_ys.flat[i] = y
+    distances = np.sqrt((hit_xs - origin_xs) ** 2 + (hit_ys - origin_ys) ** 2).astype(np.int64)
+    return hit_xs, hit_ys, distances
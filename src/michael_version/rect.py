@@ -0,0 +1,116 @@
+import math
+
+
+def _round(value):
+    # pygame rounds float coordinates assigned to a rect half away from zero
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+class Rect:
+    """Integer rectangle with the parts of the pygame.Rect interface the simulation uses.
+
+    Keeps the simulation free of pygame: the constructor truncates float arguments and the
+    position setters round them, exactly as pygame.Rect does. pygame's drawing functions and
+    pygame.Rect accept it anywhere a rect-style (x, y, width, height) sequence is allowed.
+    """
+
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        if len(args) == 2:
+            args = (*args[0], *args[1])
+        x, y, width, height = args
+        self.x, self.y, self.width, self.height = int(x), int(y), int(width), int(height)
+
+    def __repr__(self):
+        return f"<rect({self.x}, {self.y}, {self.width}, {self.height})>"
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.width, self.height)[index]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def left(self):
+        return self.x
+
+    @left.setter
+    def left(self, value):
+        self.x = _round(value)
+
+    @property
+    def top(self):
+        return self.y
+
+    @top.setter
+    def top(self, value):
+        self.y = _round(value)
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @property
+    def w(self):
+        return self.width
+
+    @property
+    def h(self):
+        return self.height
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def topleft(self):
+        return self.x, self.y
+
+    @topleft.setter
+    def topleft(self, position):
+        self.x, self.y = _round(position[0]), _round(position[1])
+
+    @property
+    def centerx(self):
+        return self.x + self.width // 2
+
+    @property
+    def centery(self):
+        return self.y + self.height // 2
+
+    @property
+    def center(self):
+        return self.centerx, self.centery
+
+    def copy(self):
+        return Rect(self.x, self.y, self.width, self.height)
+
+    def inflate(self, dx, dy):
+        """Return a copy grown by dx, dy around the same center."""
+        return Rect(self.x - int(dx / 2), self.y - int(dy / 2), self.width + dx, self.height + dy)
+
+    def colliderect(self, other):
+        """True if the two rectangles overlap with a positive area; empty rectangles never collide."""
+        x, y, width, height = other
+        if not (self.width and self.height and width and height):
+            return False
+        return (self.x < x + width and x < self.x + self.width and
+                self.y < y + height and y < self.y + self.height)
@@ -1,13 +1,73 @@
+import time
+
 import pygame
 
+from colours import WHITE
+
+
+def render_background(environment):
+    """Draw the environment's static layout once onto an off-screen surface that can be blitted every frame."""
+    background = pygame.Surface((environment.screen_width, environment.screen_height))
+    if pygame.display.get_surface() is not None:
+        background = background.convert()  # Match the display format so blits are plain copies
+    background.fill(WHITE)
+    environment.draw(background)
+    return background
+
 
 class Renderer:
     def __init__(self, screen, car, environment):
         self.screen = screen
         self.car = car
         self.environment = environment
+        self.background = None  # Built on the first render; call reset_background after the layout changes
+
+    def reset_background(self):
+        self.background = None
 
     def render(self):
-        self.environment.draw(self.screen)
+        if self.background is None:
+            self.background = render_background(self.environment)
+        self.screen.blit(self.background, (0, 0))
         self.car.draw(self.screen)
         pygame.display.flip()
+
+
+class ThrottledRenderer:
+    """Renders a CarEnvironment at most fps times per second and/or every every_steps steps.
+
+    tick() is called once per training step and skips every frame that is not due, so the
+    simulation and learning run at full speed while the window shows a snapshot of the latest
+    state. Rendering stays on the calling (main) thread because SDL display calls must.
+    """
+
+    def __init__(self, env, fps=30, every_steps=None, clock=time.perf_counter):
+        self.env = env
+        self.frame_interval = 1.0 / fps if fps else None
+        self.every_steps = every_steps
+        self.clock = clock
+        self.steps_since_frame = 0
+        self.last_frame_time = None
+        self.frames_rendered = 0
+
+    def due(self):
+        if self.last_frame_time is None:
+            return True
+        if self.every_steps is not None and self.steps_since_frame >= self.every_steps:
+            return True
+        return self.frame_interval is not None and self.clock() - self.last_frame_time >= self.frame_interval
+
+    def tick(self):
+        """Count one step and render if a frame is due; returns False once the window has been closed."""
+        self.steps_since_frame += 1
+        if not self.due():
+            return True
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        self.env.render()
+        self.steps_since_frame = 0
+        self.last_frame_time = self.clock()
+        self.frames_rendered += 1
+        return True
@@ -0,0 +1,195 @@
+import numpy as np
+import torch
+
+MAX_REDRAWS = 4  # Attempts to replace a sample that landed on a zero-priority slot
+MIN_PRIORITY = 1e-8  # Floor on sampled priorities so importance-sampling weights stay finite
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer of transitions stored in preallocated arrays."""
+
+    def __init__(self, capacity, state_size, device=None):
+        self.capacity = capacity
+        self.state_size = state_size
+        self.device = device if device is not None else torch.device("cpu")
+
+        # Everything is allocated up front so memory use stays flat for the whole run
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+
+        self.position = 0  # Next slot to write
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        """Return a stored transition, oldest first, as a (state, action, reward, next_state, done) tuple."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("replay buffer index out of range")
+        i = (self.position - self.size + index) % self.capacity
+        return self.states[i], int(self.actions[i]), float(self.rewards[i]), self.next_states[i], bool(self.dones[i])
+
+    def append(self, state, action, reward, next_state, done):
+        """Store a transition in O(1), overwriting the oldest one once the buffer is full."""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def append_batch(self, states, actions, rewards, next_states, dones):
+        """Store several transitions at once and return the slots they were written to."""
+        count = len(actions)
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return indices
+
+    def sample_indices(self, batch_size):
+        """Draw slot indices uniformly (with replacement) from the filled part of the buffer."""
+        return np.random.randint(0, self.size, size=batch_size)
+
+    def sample(self, batch_size):
+        """Sample a minibatch as (states, actions, rewards, next_states, dones) tensors."""
+        return self.get(self.sample_indices(batch_size))
+
+    def get(self, indices):
+        """Gather the transitions stored at the given slot indices as tensors on the buffer device."""
+        return (
+            torch.from_numpy(self.states[indices]).to(self.device),
+            torch.from_numpy(self.actions[indices]).to(self.device),
+            torch.from_numpy(self.rewards[indices]).to(self.device),
+            torch.from_numpy(self.next_states[indices]).to(self.device),
+            torch.from_numpy(self.dones[indices]).to(self.device),
+        )
+
+    def clear(self):
+        self.position = 0
+        self.size = 0
+
+
+class SumTree:
+    """Array-backed binary tree where every parent holds the sum of its children's priorities."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # Leaves live in [leaf_offset, leaf_offset + capacity); the root is at index 1
+        self.leaf_offset = 1
+        while self.leaf_offset < capacity:
+            self.leaf_offset *= 2
+        self.depth = self.leaf_offset.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        return self.tree[np.asarray(indices) + self.leaf_offset]
+
+    def set(self, index, priority):
+        """Set a single leaf priority, walking up to the root with plain Python scalars."""
+        node = index + self.leaf_offset
+        self.tree[node] = priority
+        node //= 2
+        while node >= 1:
+            self.tree[node] = self.tree[2 * node] + self.tree[2 * node + 1]
+            node //= 2
+
+    def update(self, indices, priorities):
+        """Set leaf priorities and refresh their ancestors in O(log n) per index."""
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaf_offset
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Return the leaf index whose cumulative priority range contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Replay buffer that samples transitions in proportion to their TD error."""
+
+    def __init__(self, capacity, state_size, device=None, alpha=0.6, beta=0.4, beta_increment=1e-4,
+                 priority_epsilon=1e-6):
+        super().__init__(capacity, state_size, device)
+        self.alpha = alpha  # How strongly priorities skew sampling (0 is uniform)
+        self.beta = beta  # Importance-sampling correction, annealed towards 1
+        self.beta_increment = beta_increment
+        self.priority_epsilon = priority_epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity)
+
+    def append(self, state, action, reward, next_state, done):
+        # New transitions get the highest priority seen so far so they are replayed at least once
+        self.tree.set(self.position, self.max_priority ** self.alpha)
+        super().append(state, action, reward, next_state, done)
+
+    def append_batch(self, states, actions, rewards, next_states, dones):
+        indices = super().append_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, np.full(len(indices), self.max_priority ** self.alpha))
+        return indices
+
+    def sample_indices(self, batch_size):
+        """Draw one index from each of batch_size equal slices of the total priority mass."""
+        segment = self.tree.total() / batch_size
+        values = (np.arange(batch_size) + np.random.rand(batch_size)) * segment
+        # Floating point drift can walk past the last filled leaf, and clamping it back can land on a
+        # zero-priority slot; redraw those from the whole priority mass a few times
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+        for _ in range(MAX_REDRAWS):
+            empty = np.flatnonzero(self.tree.get(indices) <= 0)
+            if not empty.size:
+                break
+            values = np.random.rand(empty.size) * self.tree.total()
+            indices[empty] = np.minimum(self.tree.find(values), self.size - 1)
+        return indices
+
+    def sample(self, batch_size):
+        """Sample a minibatch plus the slot indices and importance-sampling weights."""
+        indices = self.sample_indices(batch_size)
+        # Floor the priority so a zero-priority slot that survived the redraws gets a finite weight
+        priorities = np.maximum(self.tree.get(indices), MIN_PRIORITY)
+        probabilities = priorities / max(self.tree.total(), priorities.max())
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        weights = torch.from_numpy(weights.astype(np.float32)).to(self.device)
+        return (*self.get(indices), indices, weights)
+
+    def update_priorities(self, indices, td_errors):
+        """Refresh priorities from the absolute TD errors of a replayed batch."""
+        priorities = np.abs(td_errors) + self.priority_epsilon
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def clear(self):
+        super().clear()
+        self.tree = SumTree(self.capacity)
+        self.max_priority = 1.0
@@ -0,0 +1,81 @@
+class SpatialHash:
+    """Uniform grid index over axis-aligned rectangles.
+
+    Every rect is listed in each cell_size x cell_size cell it overlaps, so a query only looks at
+    the rects registered in the cells it touches. With cells about the size of a typical rect,
+    inserts and queries cost the same whether the index holds ten rects or tens of thousands.
+    Overlap follows pygame.Rect.colliderect: touching edges and empty rects never overlap.
+    """
+
+    def __init__(self, cell_size=128):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> indices of the rects overlapping that cell
+        self.rects = []  # (x, y, width, height) of every inserted rect
+        self.items = []  # What each query returns for the rect at the same index
+
+    def __len__(self):
+        return len(self.rects)
+
+    def clear(self):
+        self.cells.clear()
+        self.rects.clear()
+        self.items.clear()
+
+    def _cell_keys(self, x, y, width, height):
+        size = self.cell_size
+        for column in range(x // size, (x + width - 1) // size + 1):
+            for row in range(y // size, (y + height - 1) // size + 1):
+                yield column, row
+
+    def insert(self, rect, item=None):
+        """Add an (x, y, width, height) rect; queries return item, or the rect itself by default."""
+        x, y, width, height = rect
+        index = len(self.rects)
+        self.rects.append((x, y, width, height))
+        self.items.append(rect if item is None else item)
+        if width <= 0 or height <= 0:
+            return  # Empty rects can never be found by a query
+        cells = self.cells
+        for key in self._cell_keys(x, y, width, height):
+            if key in cells:
+                cells[key].append(index)
+            else:
+                cells[key] = [index]
+
+    def _overlapping(self, rect):
+        """Yield the indices of the rects that overlap rect, each once."""
+        x, y, width, height = rect
+        if width <= 0 or height <= 0:
+            return
+        right, bottom = x + width, y + height
+        rects, cells = self.rects, self.cells
+        seen = set()
+        for key in self._cell_keys(x, y, width, height):
+            for index in cells.get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                other_x, other_y, other_width, other_height = rects[index]
+                if x < other_x + other_width and other_x < right and y < other_y + other_height and other_y < bottom:
+                    yield index
+
+    def overlaps(self, rect):
+        """True if rect overlaps any rect in the index."""
+        return next(self._overlapping(rect), None) is not None
+
+    def query_rect(self, rect):
+        """Return the items whose rects overlap rect, in insertion order."""
+        return [self.items[index] for index in sorted(self._overlapping(rect))]
+
+    def query_point(self, x, y):
+        """Return the items whose rects contain the point, in insertion order."""
+        x, y = int(x), int(y)
+        key = (x // self.cell_size, y // self.cell_size)
+        found = []
+        for index in self.cells.get(key, ()):
+            other_x, other_y, other_width, other_height = self.rects[index]
+            if other_x <= x < other_x + other_width and other_y <= y < other_y + other_height:
+                found.append(index)
+        return [self.items[index] for index in sorted(found)]
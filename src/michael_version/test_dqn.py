@@ -41,12 +41,9 @@ def test_dqn():
         # Step through the environment
         next_state, reward, done = env.step(action)
 
-        # Accumulate reward
+        # Accumulate reward (env.step has already rendered the frame)
         total_reward += reward
 
-        # Render the environment (if visualize is enabled)
-        env.render()
-
         # Update the state
         state = next_state
 
@@ -1,13 +1,17 @@
+import functools
 import logging
+import multiprocessing
 import os
+import queue
 import sys
-import pygame
+import time as wall_time
 import torch
 from car import Car
 from car_environment import CarEnvironment
 from dqn_agent import DQNAgent
-from environment import Environment  # Assuming Environment is defined in a separate file
-from maze_environment import MazeEnvironment  # Import the MazeEnvironment class
+from environment_factory import create_environment
+from parallel_rollout import SharedTransitionQueue, SharedWeights, rollout_worker
+from vec_car_environment import VecCarEnvironment
 
 # Ensure directories exist
 os.makedirs("generated_models", exist_ok=True)
@@ -16,21 +20,41 @@ os.makedirs("generated_maps", exist_ok=True)
 # Set up logging to ensure INFO messages are shown
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
-def train_dqn(episodes, environment_type='default', visualize=False):
-    # Initialize Pygame if visualizing
+def max_decisions(action_repeat, max_substeps=2000):
+    """Steps per episode so that an episode covers max_substeps physics substeps."""
+    return -(-max_substeps // action_repeat)
+
+
+def train_dqn(episodes, environment_type='default', visualize=False, num_envs=1, num_workers=0, map_format='txt',
+              map_downsample=1, layout_bank=None, render_fps=30, render_every=None, action_repeat=1):
+    """Train a DQN agent on one environment.
+
+    When visualizing, frames are drawn at most render_fps times per second and/or every render_every
+    steps so watching does not slow training down; render_fps=None with no render_every draws every
+    step with a short delay, as before. action_repeat applies each chosen action for that many
+    physics substeps; episodes are capped at the same 2000 substeps whatever its value.
+    """
+    if num_workers > 0:
+        # Worker processes collect the experience and this process only learns
+        return train_dqn_parallel(episodes, environment_type, num_workers, layout_bank=layout_bank,
+                                  action_repeat=action_repeat)
+    if num_envs > 1:
+        # Stepping several environments together is a headless mode
+        return train_dqn_vectorized(episodes, environment_type, num_envs, layout_bank, action_repeat)
+
+    # Initialize Pygame if visualizing; headless training never imports it
     if visualize:
+        import pygame
+        from renderer import ThrottledRenderer
         pygame.init()
 
     # Initialize environment and car based on the selected environment type
-    if environment_type == 'default':
-        environment = Environment(1200, 800, obstacle_count=10)
-    elif environment_type == 'maze':
-        environment = MazeEnvironment(1200, 800, cell_size=120)
-    else:
-        raise ValueError(f"Unknown environment type: {environment_type}")
+    environment = create_environment(environment_type, layout_bank)
 
     car = Car(environment.start_x, environment.start_y, environment, visualize)
-    env = CarEnvironment(car, environment, visualize)
+    throttled = visualize and (render_fps is not None or render_every is not None)
+    env = CarEnvironment(car, environment, visualize, render_on_step=not throttled, action_repeat=action_repeat)
+    renderer = ThrottledRenderer(env, render_fps, render_every) if throttled else None
 
     state = env.get_state()
     logging.info(f"State: {state}, Shape: {len(state)}")
@@ -51,9 +75,9 @@ def train_dqn(episodes, environment_type='default', visualize=False):
 
         total_reward = 0
 
-        for time in range(2000):
+        for time in range(max_decisions(action_repeat)):
             # Handle events to allow quitting during training
-            if visualize:
+            if visualize and not throttled:
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         pygame.quit()
@@ -81,7 +105,11 @@ def train_dqn(episodes, environment_type='default', visualize=False):
                 logging.info(f"Episode {e + 1}/{episodes} at timestep {time} - Current Epsilon: {agent.epsilon:.2f}")
 
             # Render the environment if visualizing
-            if visualize:
+            if throttled:
+                if not renderer.tick():  # The window was closed
+                    pygame.quit()
+                    return
+            elif visualize:
                 env.render()
                 pygame.time.wait(10)  # Adjust the delay to control the visualization speed
 
@@ -91,20 +119,16 @@ def train_dqn(episodes, environment_type='default', visualize=False):
             torch.save(agent.model.state_dict(), f"generated_models/dqn_model_best_{environment_type}.pth")
             logging.info(f"New best model saved with reward: {total_reward}")
 
-            with open(f"generated_maps/best_map_ep{e + 1}.txt", "w") as map_file:
-                map_output = car.visualize_map_to_string()
-                map_file.write(map_output)
-                logging.info(f"Best map saved after episode {e + 1}")
+            car.save_map(f"generated_maps/best_map_ep{e + 1}.{map_format}", map_format, map_downsample)
+            logging.info(f"Best map saved after episode {e + 1}")
 
         # Save the model and map every 200 episodes, regardless of performance
         if e % 200 == 0 or e == episodes - 1:
             torch.save(agent.model.state_dict(), f"generated_models/dqn_model_{environment_type}_ep{e + 1}.pth")
             logging.info(f"Model saved after episode {e + 1}")
 
-            with open(f"generated_maps/map_ep{e + 1}.txt", "w") as map_file:
-                map_output = car.visualize_map_to_string()
-                map_file.write(map_output)
-                logging.info(f"Map saved after episode {e + 1}")
+            car.save_map(f"generated_maps/map_ep{e + 1}.{map_format}", map_format, map_downsample)
+            logging.info(f"Map saved after episode {e + 1}")
 
     logging.info("DQN training completed")
 
@@ -112,6 +136,120 @@ def train_dqn(episodes, environment_type='default', visualize=False):
     if visualize:
         pygame.quit()
 
+def train_dqn_vectorized(episodes, environment_type='default', num_envs=8, layout_bank=None, action_repeat=1):
+    """Train on num_envs environments stepped together, picking all their actions with one forward pass."""
+    vec_env = VecCarEnvironment(lambda: create_environment(environment_type, layout_bank), num_envs,
+                                max_steps=max_decisions(action_repeat), action_repeat=action_repeat)
+    action_size = 7
+    agent = DQNAgent(vec_env.state_size, action_size)
+
+    logging.info(f"Starting vectorized DQN training in {environment_type} environment with {num_envs} environments")
+
+    best_reward = -float('inf')
+    completed_episodes = 0
+    states = vec_env.reset()
+
+    while completed_episodes < episodes:
+        # Each environment explores with its own epsilon, spread below the agent's current epsilon
+        actions = agent.act(states, agent.get_env_epsilons(num_envs))
+        next_states, rewards, dones = vec_env.step(actions)
+        agent.remember_batch(states, actions, rewards, vec_env.get_next_states(next_states), dones)
+        agent.replay()
+        states = next_states
+
+        for env_index, total_reward in vec_env.finished_episodes:
+            completed_episodes += 1
+            agent.update_target_model()
+            logging.info(f"Episode {completed_episodes}/{episodes} (env {env_index}) ended with score: {total_reward}, Epsilon: {agent.epsilon:.2f}")
+
+            if total_reward > best_reward:
+                best_reward = total_reward
+                torch.save(agent.model.state_dict(), f"generated_models/dqn_model_best_{environment_type}.pth")
+                logging.info(f"New best model saved with reward: {total_reward}")
+
+            if completed_episodes % 200 == 1 or completed_episodes == episodes:
+                torch.save(agent.model.state_dict(), f"generated_models/dqn_model_{environment_type}_ep{completed_episodes}.pth")
+                logging.info(f"Model saved after episode {completed_episodes}")
+
+    logging.info("DQN training completed")
+
+
+def train_dqn_parallel(episodes, environment_type='default', num_workers=4, memory_size=100000, queue_capacity=4096,
+                       sync_interval=50, layout_bank=None, action_repeat=1):
+    """Train with num_workers rollout processes streaming transitions through shared memory to this learner."""
+    # Workers memory-map the same layout bank directory, so its pages are shared between processes
+    environment_factory = functools.partial(create_environment, environment_type, layout_bank)
+    probe_environment = environment_factory()
+    state_size = len(Car(probe_environment.start_x, probe_environment.start_y, probe_environment).get_state())
+    action_size = 7
+    agent = DQNAgent(state_size, action_size, memory_size=memory_size)
+
+    ctx = multiprocessing.get_context('spawn')
+    transition_queues = [SharedTransitionQueue(queue_capacity, state_size, ctx) for _ in range(num_workers)]
+    shared_weights = SharedWeights(agent.model, ctx)
+    shared_weights.publish(agent.model, agent.epsilon)
+    stop_event = ctx.Event()
+    episode_queue = ctx.Queue()
+
+    # Spread exploration across workers, from the learner's epsilon down to epsilon ** 8
+    epsilon_exponents = [1 + 7 * i / max(num_workers - 1, 1) for i in range(num_workers)]
+    workers = [
+        ctx.Process(target=rollout_worker,
+                    args=(i, environment_factory, transition_queues[i], shared_weights, epsilon_exponents[i],
+                          stop_event, episode_queue, i),
+                    kwargs={'action_size': action_size, 'max_steps': max_decisions(action_repeat),
+                            'action_repeat': action_repeat},
+                    daemon=True)
+        for i in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    logging.info(f"Starting parallel DQN training in {environment_type} environment with {num_workers} workers")
+
+    best_reward = -float('inf')
+    completed_episodes = 0
+    updates = 0
+
+    try:
+        while completed_episodes < episodes:
+            collected = sum(transition_queue.drain(agent.memory) for transition_queue in transition_queues)
+            if collected == 0:
+                wall_time.sleep(0.001)
+            else:
+                agent.replay()
+                updates += 1
+                if updates % sync_interval == 0:
+                    shared_weights.publish(agent.model, agent.epsilon)
+
+            while True:
+                try:
+                    worker_id, total_reward = episode_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                completed_episodes += 1
+                agent.update_target_model()
+                logging.info(f"Episode {completed_episodes}/{episodes} (worker {worker_id}) ended with score: {total_reward}, Epsilon: {agent.epsilon:.2f}")
+
+                if total_reward > best_reward:
+                    best_reward = total_reward
+                    torch.save(agent.model.state_dict(), f"generated_models/dqn_model_best_{environment_type}.pth")
+                    logging.info(f"New best model saved with reward: {total_reward}")
+
+                if completed_episodes % 200 == 1 or completed_episodes == episodes:
+                    torch.save(agent.model.state_dict(), f"generated_models/dqn_model_{environment_type}_ep{completed_episodes}.pth")
+                    logging.info(f"Model saved after episode {completed_episodes}")
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    logging.info("DQN training completed")
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         environment_type = sys.argv[1]
@@ -0,0 +1,68 @@
+import numpy as np
+
+from car import Car
+from car_environment import CarEnvironment
+
+
+class VecCarEnvironment:
+    """Steps several independent car environments together and returns stacked arrays."""
+
+    def __init__(self, environment_factory, num_envs, max_steps=2000, action_repeat=1):
+        self.num_envs = num_envs
+        self.max_steps = max_steps  # Episodes are cut off after this many steps, as in train_dqn
+        self.envs = []
+        for _ in range(num_envs):
+            environment = environment_factory()
+            car = Car(environment.start_x, environment.start_y, environment)
+            self.envs.append(CarEnvironment(car, environment, visualize=False, action_repeat=action_repeat))
+
+        self.state_size = len(self.envs[0].get_state())
+        self.step_counts = np.zeros(num_envs, dtype=np.int64)
+        self.episode_rewards = np.zeros(num_envs, dtype=np.float64)
+
+        # Terminal observations of members that were auto-reset during the last step
+        self.final_states = np.zeros((num_envs, self.state_size), dtype=np.float32)
+        self.ended = np.zeros(num_envs, dtype=bool)
+        # (env index, total reward) for every episode that finished during the last step
+        self.finished_episodes = []
+
+    def reset(self):
+        """Reset every environment and return the stacked (num_envs, state_size) observations."""
+        self.step_counts[:] = 0
+        self.episode_rewards[:] = 0
+        return np.array([env.reset() for env in self.envs], dtype=np.float32)
+
+    def step(self, actions):
+        """Apply one action per environment and return stacked states, rewards and done flags.
+
+        Members whose episode ended (crash or max_steps) are reset automatically, so the returned
+        state for them is the first state of the next episode; the terminal state is kept in
+        final_states.
+        """
+        states = np.empty((self.num_envs, self.state_size), dtype=np.float32)
+        rewards = np.empty(self.num_envs, dtype=np.float32)
+        dones = np.empty(self.num_envs, dtype=bool)
+        self.ended[:] = False
+        self.finished_episodes = []
+
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            state, reward, done = env.step(int(action))
+            rewards[i] = reward
+            dones[i] = done
+            self.step_counts[i] += 1
+            self.episode_rewards[i] += reward
+
+            if done or self.step_counts[i] >= self.max_steps:
+                self.final_states[i] = state
+                self.ended[i] = True
+                self.finished_episodes.append((i, self.episode_rewards[i]))
+                self.step_counts[i] = 0
+                self.episode_rewards[i] = 0
+                state = env.reset()
+            states[i] = state
+
+        return states, rewards, dones
+
+    def get_next_states(self, states):
+        """Return the true next states for replay, using the terminal state for members that were reset."""
+        return np.where(self.ended[:, None], self.final_states, states)
@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 import sys
@@ -19,6 +20,26 @@ def load_map_image(script_dir):
         sys.exit(1)
 
 
+def _clear_font_caches():
+    """Drops cached fonts and text, which are invalid once pygame has quit."""
+    get_font.cache_clear()
+    render_text.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name, size):
+    """Returns a shared SysFont; font discovery is slow, so each (name, size) is looked up once."""
+    if get_font.cache_info().currsize == 0:
+        pygame.register_quit(_clear_font_caches)
+    return pygame.font.SysFont(name, size)
+
+
+@functools.lru_cache(maxsize=64)
+def render_text(text, name, size, colour):
+    """Returns a rendered text surface, reused while the same text keeps being drawn."""
+    return get_font(name, size).render(text, True, colour)
+
+
 def draw_screen(screen, map_image, cars, generation, remain_cars):
     """Draws the game screen including cars and generation info."""
     screen.blit(map_image, (0, 0))
@@ -26,14 +47,11 @@ def draw_screen(screen, map_image, cars, generation, remain_cars):
         if car.get_alive():
             car.draw(screen)
 
-    generation_font = pygame.font.SysFont("Arial", 70)
-    font = pygame.font.SysFont("Arial", 30)
-
-    generation_text = generation_font.render(f"Generation : {generation}", True, (255, 255, 0))
+    generation_text = render_text(f"Generation : {generation}", "Arial", 70, (255, 255, 0))
     generation_text_rect = generation_text.get_rect(center=(screen_width / 2, 100))
     screen.blit(generation_text, generation_text_rect)
 
-    cars_text = font.render(f"Remain cars : {remain_cars}", True, (0, 0, 0))
+    cars_text = render_text(f"Remain cars : {remain_cars}", "Arial", 30, (0, 0, 0))
     cars_text_rect = cars_text.get_rect(center=(screen_width / 2, 200))
     screen.blit(cars_text, cars_text_rect)
 
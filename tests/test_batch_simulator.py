@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+import pygame
+
+from michael_version.batch_simulator import BatchCarSimulator
+from michael_version.car import Car
+from michael_version.environment import Environment
+from michael_version.maze_environment import MazeEnvironment
+
+
+class TestBatchCarSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.env = Environment(1200, 800, obstacle_count=0)
+        self.env.obstacles = [pygame.Rect(300, 80, 60, 200), pygame.Rect(150, 260, 200, 40)]
+        self.env.start_x, self.env.start_y = 100, 100
+        self.num_cars = 6
+        self.sim = BatchCarSimulator(self.env, self.num_cars)
+
+    def test_reset(self):
+        states = self.sim.reset()
+        self.assertEqual(states.shape, (self.num_cars, self.sim.state_size))
+        self.assertTrue(np.all(self.sim.x == 100))
+        self.assertTrue(self.sim.alive.all())
+
+    def test_matches_car(self):
+        # Every car should follow exactly the same trajectory as a Car given the same actions
+        self.sim.reset()
+        cars = [Car(self.env.start_x, self.env.start_y, self.env) for _ in range(self.num_cars)]
+        for car in cars:
+            car.reset()
+
+        rng = np.random.default_rng(0)
+        for _ in range(60):
+            actions = rng.integers(0, 7, self.num_cars)
+            self.sim.step(actions)
+            for i, car in enumerate(cars):
+                if not car.is_alive:
+                    continue
+                car.perform_action(int(actions[i]))
+                car.update(self.env)
+                self.assertAlmostEqual(car.x, self.sim.x[i])
+                self.assertAlmostEqual(car.y, self.sim.y[i])
+                self.assertEqual(car.angle, self.sim.angle[i])
+                self.assertEqual(car.speed, self.sim.speed[i])
+                self.assertEqual(car.is_alive, self.sim.alive[i])
+                if car.is_alive:
+                    self.assertEqual([radar[1] for radar in car.radars], self.sim.radar_distances[i].tolist())
+
+    def test_collision_kills_car(self):
+        self.sim.reset()
+        self.sim.x[0], self.sim.y[0] = 310, 100  # Center inside the first obstacle
+        states, rewards, dones = self.sim.step(np.full(self.num_cars, 4))
+        self.assertTrue(dones[0])
+        self.assertFalse(dones[1:].any())
+        self.assertLess(rewards[0], -90)
+
+    def test_novelty_reward(self):
+        sim = BatchCarSimulator(self.env, 2, visit_cell_size=10)
+        sim.reset()
+        first = sim.get_rewards()
+        second = sim.get_rewards()
+        np.testing.assert_allclose(first - second, 50.1)
+
+    def test_maze_environment(self):
+        maze = MazeEnvironment(240, 160, 40)
+        sim = BatchCarSimulator(maze, 3)
+        sim.reset()
+        states, rewards, dones = sim.step(np.array([4, 0, 6]))
+        self.assertEqual(states.shape, (3, sim.state_size))
+        self.assertEqual(rewards.shape, (3,))
+
+
+if __name__ == "__main__":
+    unittest.main()
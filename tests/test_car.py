@@ -1,8 +1,10 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+import numpy as np
 import pygame
 
-from michael_version.car import Car
+from michael_version.car import STATE_SCALE, STATE_SIZE, Car
+from michael_version.environment import Environment
 
 
 class TestCar(unittest.TestCase):
@@ -13,6 +15,7 @@ class TestCar(unittest.TestCase):
         self.environment.screen_width = 1200
         self.environment.screen_height = 800
         self.environment.is_position_obstacle = MagicMock(return_value=False)
+        self.environment.are_positions_obstacles = MagicMock(side_effect=lambda xs, ys: np.zeros(np.shape(xs), bool))
 
         # Initialize the car
         self.car = Car(100, 100, self.environment)
@@ -123,6 +126,79 @@ class TestCar(unittest.TestCase):
         reward = self.car.get_reward()
         self.assertEqual(reward, -100)
 
+    def test_trail_draws_only_new_segments(self):
+        car = Car(100, 100, self.environment, visualize=True)
+        car.speed = 2
+        screen = pygame.Surface((self.environment.screen_width, self.environment.screen_height))
+        for _ in range(5):
+            car.update(self.environment)
+
+        with patch('pygame.draw.line', wraps=pygame.draw.line) as line:
+            car.draw_trail(screen)
+            self.assertEqual(line.call_count, 4)  # Five points, four segments
+            car.update(self.environment)
+            car.draw_trail(screen)
+            self.assertEqual(line.call_count, 5)  # Only the newest segment
+        self.assertEqual(screen.get_at((106, 101))[:3], (0, 0, 0))
+
+    def test_path_limit_and_stride(self):
+        car = Car(100, 100, self.environment, path_limit=3, path_stride=2)
+        car.speed = 1
+        for _ in range(10):
+            car.update(self.environment)
+        # Positions after steps 1, 3, 5, 7 and 9 were recorded; only the newest three are kept
+        self.assertEqual([x for x, y in car.path], [105, 107, 109])
+
+    def test_get_state_buffers(self):
+        self.car.speed = 2
+        self.car.update(self.environment)
+        first = self.car.get_state()
+        self.assertEqual(first.dtype, np.float32)
+        self.assertEqual(first.shape, (STATE_SIZE,))
+        np.testing.assert_array_equal(first[2:], [distance for _, distance in self.car.radars])
+
+        # The previous state survives the next call, which writes into the other buffer
+        snapshot = first.copy()
+        self.car.speed = 3
+        second = self.car.get_state()
+        np.testing.assert_array_equal(first, snapshot)
+        self.assertEqual(second[0], 3)
+
+        out = np.empty(STATE_SIZE, dtype=np.float32)
+        self.assertIs(self.car.get_state(out, normalize=True), out)
+        np.testing.assert_allclose(out, second * STATE_SCALE)
+
+    def test_get_reward_matches_radar_sums(self):
+        environment = Environment(1200, 800, obstacle_count=0)
+        environment.obstacles = [pygame.Rect(130, 60, 40, 120), pygame.Rect(60, 150, 80, 30)]
+        car = Car(100, 100, environment)
+        car.speed = 2
+        for _ in range(3):
+            car.update(environment)
+            distances = [distance for _, distance in car.radars]
+            third = len(distances) // 3
+            left, forward, right = sum(distances[:third]), sum(distances[third:-third]), sum(distances[-third:])
+            expected = -(35 - min(distances)) * 2 if min(distances) < 35 else 0
+            expected += 0.1 + (50 if not car.map.is_visited(car.rect.centerx, car.rect.centery) else -0.1)
+            expected += 5 if min(distances) > 50 else 0
+            expected += 2 if forward >= max(left, right) else 1
+            expected -= 0 if car.is_alive else 100
+            self.assertAlmostEqual(car.get_reward(), expected)
+
+    def test_radar_hit_in_visited_cell_is_not_novel(self):
+        # The wall's edge falls inside the car's 10 px map cell, so every sweep marks that cell
+        environment = Environment(400, 300, obstacle_count=0)
+        environment.obstacles = [pygame.Rect(205, 0, 20, 300)]
+        rewards = {}
+        for resolution in (1, 10):
+            car = Car(196, 100, environment, map_resolution=resolution)
+            rewards[resolution] = []
+            for _ in range(4):
+                car.sense(environment)
+                rewards[resolution].append(car.get_reward())
+        self.assertAlmostEqual(rewards[10][0] - rewards[10][1], 50.1)  # Novelty bonus only on the first visit
+        np.testing.assert_allclose(rewards[10], rewards[1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from michael_version.car import Car
+from michael_version.car_environment import CarEnvironment
+from michael_version.environment import Environment
+from michael_version.maze_environment import MazeEnvironment
+
+
+class TestCarEnvironment(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.environment = MazeEnvironment(240, 160, 40, seed=0)
+        self.car = Car(self.environment.start_x, self.environment.start_y, self.environment)
+        self.env = CarEnvironment(self.car, self.environment, visualize=True)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_background_drawn_once_per_reset(self):
+        with patch.object(self.environment, 'draw', wraps=self.environment.draw) as draw:
+            self.env.reset()
+            for _ in range(5):
+                self.env.step(4)
+            self.assertEqual(draw.call_count, 1)
+
+            self.env.reset()
+            self.env.render()
+            self.assertEqual(draw.call_count, 2)
+
+    def test_background_shows_layout(self):
+        self.env.reset()
+        self.env.render()
+        wall = next((x, y) for y in range(self.environment.rows) for x in range(self.environment.columns)
+                    if self.environment.grid[y, x] == 1)
+        pixel = (wall[0] * 40 + 1, wall[1] * 40 + 1)
+        self.assertEqual(self.env.screen.get_at(pixel)[:3], (0, 0, 0))
+
+
+class TestActionRepeat(unittest.TestCase):
+
+    def make_env(self, action_repeat):
+        environment = Environment(400, 300, obstacle_count=0, seed=0)
+        car = Car(environment.start_x, environment.start_y, environment)
+        return CarEnvironment(car, environment, visualize=False, action_repeat=action_repeat)
+
+    def test_matches_single_steps(self):
+        single, repeated = self.make_env(1), self.make_env(3)
+        single.reset()
+        repeated.reset()
+        for action in (4, 4, 4, 0, 0, 0):
+            single.step(action)
+        for action in (4, 0):
+            state, reward, done = repeated.step(action)
+        self.assertEqual((repeated.car.x, repeated.car.y, repeated.car.angle),
+                         (single.car.x, single.car.y, single.car.angle))
+        self.assertEqual(list(state), list(single.get_state()))
+        self.assertFalse(done)
+
+    def test_rewards_summed_over_substeps(self):
+        env = self.make_env(3)
+        env.reset()
+        # The same car driven substep by substep, sweeping the radar only on the last one
+        car = Car(env.environment.start_x, env.environment.start_y, env.environment)
+        for action in (4, 4, 0, 2):
+            expected = 0
+            for substep in range(3):
+                car.perform_action(action)
+                car.update(env.environment, sense=substep == 2)
+                expected += car.get_reward()
+            _, reward, _ = env.step(action)
+            self.assertAlmostEqual(reward, expected)
+
+    def test_radar_swept_once_per_step(self):
+        env = self.make_env(4)
+        env.reset()
+        with patch.object(env.car, 'sense', wraps=env.car.sense) as sense:
+            env.step(4)
+            self.assertEqual(sense.call_count, 1)
+
+    def test_crash_ends_step_early(self):
+        def run(env):
+            env.reset()
+            done, steps = False, 0
+            while not done:
+                _, reward, done = env.step(4)
+                steps += 1
+            return steps
+
+        substeps = run(self.make_env(1))
+        env = self.make_env(8)
+        self.assertEqual(run(env), -(-substeps // 8))
+        self.assertEqual(env.car.path_steps, substeps)  # No substeps run after the crash
+        self.assertTrue(env.car.radar_scanned)
+
+    def test_rejects_zero_repeat(self):
+        with self.assertRaises(ValueError):
+            self.make_env(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+
+from michael_version.car import Car
+from michael_version.collision import sweep_environment, sweep_rects
+from michael_version.environment import Environment
+from michael_version.maze_environment import MazeEnvironment
+from michael_version.rect import Rect
+
+
+def overlaps(x, y, width, height, rects):
+    return any(x < rx + rw and rx < x + width and y < ry + rh and ry < y + height
+               for rx, ry, rw, rh in rects if rw > 0 and rh > 0)
+
+
+class TestSweepRects(unittest.TestCase):
+
+    def test_time_of_impact(self):
+        rects = [(50, 0, 10, 10)]
+        self.assertAlmostEqual(sweep_rects(0, 0, 10, 10, 80, 0, rects), 0.5)
+        self.assertAlmostEqual(sweep_rects(0, 0, 10, 10, 20, 0, rects + [(25, 5, 5, 5)]), 0.75)
+        self.assertIsNone(sweep_rects(0, 0, 10, 10, 40, 0, rects))  # Ends touching the rect
+        self.assertIsNone(sweep_rects(0, 10, 10, 10, 80, 0, rects))  # Slides along its bottom edge
+        self.assertEqual(sweep_rects(45, 5, 10, 10, 0, 0, rects), 0)  # Already overlapping
+        self.assertIsNone(sweep_rects(0, 0, 10, 10, 80, 0, [(50, 0, 0, 10)]))  # Empty rects never collide
+
+    def test_agrees_with_sampled_motion(self):
+        rng = np.random.default_rng(0)
+        for _ in range(300):
+            rects = [tuple(rect) for rect in rng.integers(0, 60, (4, 4))]
+            x, y = rng.uniform(-10, 60, 2)
+            dx, dy = rng.uniform(-40, 40, 2)
+            impact = sweep_rects(x, y, 10, 10, dx, dy, rects)
+            times = np.linspace(0, 1, 401)
+            hits = [t for t in times if overlaps(x + t * dx, y + t * dy, 10, 10, rects)]
+            if impact is None:
+                self.assertEqual(hits, [])
+            else:
+                self.assertTrue(overlaps(x + (impact + 1e-6) * dx, y + (impact + 1e-6) * dy, 10, 10, rects))
+                if hits:
+                    self.assertLessEqual(impact, hits[0])
+
+
+class TestSweepEnvironment(unittest.TestCase):
+
+    def test_screen_edges_and_obstacles(self):
+        environment = Environment(200, 100, obstacle_count=0)
+        environment.obstacles = [Rect(100, 40, 20, 20)]
+        self.assertAlmostEqual(sweep_environment(environment, (170, 10, 10, 10), 40, 0), 0.5)
+        self.assertAlmostEqual(sweep_environment(environment, (60, 45, 10, 10), 60, 0), 0.5)
+        self.assertIsNone(sweep_environment(environment, (10, 10, 10, 10), 30, 30))
+
+    def test_maze_walls_and_off_grid_cells(self):
+        maze = MazeEnvironment(200, 40, cell_size=5)
+        maze.grid = np.zeros((maze.rows, maze.columns), dtype=np.int8)
+        maze.grid[:, 10] = 1
+        self.assertAlmostEqual(sweep_environment(maze, (30, 15, 10, 10), 20, 0), 0.5)
+        self.assertIsNone(sweep_environment(maze, (60, 15, 10, 10), 20, 0))
+
+
+class TestSweptCar(unittest.TestCase):
+
+    def setUp(self):
+        # A one-cell-thick wall at x = 50..55, thinner than a step at full speed
+        self.maze = MazeEnvironment(200, 40, cell_size=5)
+        self.maze.grid = np.zeros((self.maze.rows, self.maze.columns), dtype=np.int8)
+        self.maze.grid[:, 10] = 1
+
+    def drive(self, collision_mode):
+        car = Car(30, 15, self.maze, collision_mode=collision_mode)
+        car.speed = 10
+        for _ in range(4):
+            car.update(self.maze)
+        return car
+
+    def test_center_mode_tunnels(self):
+        car = self.drive('center')
+        self.assertTrue(car.is_alive)
+        self.assertGreater(car.x, 60)
+
+    def test_swept_mode_stops_at_the_wall(self):
+        car = self.drive('swept')
+        self.assertFalse(car.is_alive)
+        self.assertEqual(car.rect.right, 50)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            Car(30, 15, self.maze, collision_mode='pixel')
+
+
+if __name__ == '__main__':
+    unittest.main()
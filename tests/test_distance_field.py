@@ -0,0 +1,130 @@
+import math
+import tempfile
+import unittest
+
+import numpy as np
+
+from michael_version.distance_field import DistanceField, distance_transform
+from michael_version.environment import Environment
+from michael_version.layout_bank import LayoutBank
+from michael_version.maze_environment import MazeEnvironment
+from michael_version.radar import cast_rays_occupancy, cast_rays_traced
+from michael_version.rect import Rect
+
+
+def brute_force(occupied):
+    ys, xs = np.nonzero(occupied)
+    grid_ys, grid_xs = np.mgrid[:occupied.shape[0], :occupied.shape[1]]
+    return np.sqrt(((grid_ys[..., None] - ys) ** 2 + (grid_xs[..., None] - xs) ** 2).min(axis=-1))
+
+
+class TestDistanceTransform(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for shape, density in (((13, 17), 0.1), ((20, 9), 0.02), ((1, 5), 0.3), ((30, 40), 0.005)):
+            occupied = rng.random(shape) < density
+            occupied[0, 0] = True
+            np.testing.assert_allclose(distance_transform(occupied), brute_force(occupied), atol=1e-5)
+
+    def test_outside_occupied(self):
+        occupied = np.zeros((5, 8), dtype=bool)
+        distances = distance_transform(occupied, outside_occupied=True)
+        self.assertEqual(distances[0, 0], 1)
+        self.assertEqual(distances[2, 3], 3)
+
+    def test_empty(self):
+        self.assertTrue(np.isinf(distance_transform(np.zeros((4, 4), dtype=bool))).all())
+        field = DistanceField(np.zeros((4, 4), dtype=bool))
+        self.assertEqual(field.distance(1, 1), math.inf)
+
+
+class TestDistanceField(unittest.TestCase):
+
+    def test_bilinear_interpolation(self):
+        occupied = np.zeros((10, 10), dtype=bool)
+        occupied[:, 0] = True
+        field = DistanceField(occupied)
+        self.assertAlmostEqual(field.distance(3.25, 4.5), 3.25, places=5)
+        self.assertAlmostEqual(field.distance(-5, 4), 0)  # Clamped to the edge
+        np.testing.assert_allclose(field.distances_at([1.5, 8.0], [2, 2]), [1.5, 8.0], atol=1e-5)
+
+    def test_resolution(self):
+        environment = Environment(400, 300, obstacle_count=0)
+        environment.obstacles = [Rect(200, 0, 10, 300)]
+        field = DistanceField.for_environment(environment, resolution=4)
+        self.assertEqual(field.distances.shape, (75, 100))
+        self.assertAlmostEqual(field.distance(100, 150), 100, places=3)
+
+    def test_maze_walls_and_outside(self):
+        environment = MazeEnvironment(400, 300, cell_size=50, seed=1)
+        field = environment.distance_field()
+        for x, y in ((10, 10), (125, 75), (399, 299), (260, 140)):
+            if environment.is_position_obstacle(x, y):
+                self.assertEqual(field.distance(x, y), 0)
+            else:
+                self.assertGreater(field.distance(x, y), 0)
+        # Distance to the screen edge counts, since everything outside the grid is a wall
+        self.assertLessEqual(field.distance(0, 150), 1)
+
+
+class TestDistanceFieldCache(unittest.TestCase):
+
+    def test_rebuilt_when_layout_changes(self):
+        environment = Environment(400, 300, obstacle_count=3, seed=0)
+        field = environment.distance_field()
+        self.assertIs(environment.distance_field(), field)
+        environment.reset()
+        self.assertIsNot(environment.distance_field(), field)
+
+        maze = MazeEnvironment(400, 300, cell_size=50, seed=0)
+        field = maze.distance_field()
+        maze.reset()
+        self.assertIsNot(maze.distance_field(), field)
+
+    def test_maze_edited_in_place(self):
+        maze = MazeEnvironment(200, 40, cell_size=5, seed=0)
+        maze.grid = np.zeros((maze.rows, maze.columns), dtype=np.int8)
+        self.assertGreater(maze.distance_field().distance(52, 20), 10)
+        maze.grid[:, 10] = 1
+        self.assertEqual(maze.distance_field().distance(52, 20), 0)
+        field = maze.distance_field()
+        self.assertIs(maze.distance_field(), field)  # Unchanged grids keep their field
+        maze.grid[2][10] = 0
+        self.assertGreater(maze.distance_field().distance(52, 12), 0)
+
+    def test_bank_layouts_are_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            bank = LayoutBank.build_obstacles(directory, 3, 400, 300, obstacle_count=3, seed=0)
+            environment = Environment(400, 300, obstacle_count=3, layout_bank=bank)
+            environment.reset(layout_index=0)
+            field = environment.distance_field()
+            environment.reset(layout_index=1)
+            environment.distance_field()
+            environment.reset(layout_index=0)
+            self.assertIs(environment.distance_field(), field)
+
+            # Editing a bank layout detaches it from the bank
+            environment.add_obstacle(Rect(0, 0, 20, 20))
+            self.assertIsNone(environment.layout_index)
+            self.assertIsNot(environment.distance_field(), field)
+
+
+class TestTracedRadar(unittest.TestCase):
+
+    def test_matches_occupancy_sampling(self):
+        environment = Environment(600, 400, obstacle_count=15, seed=4)
+        rng = np.random.default_rng(4)
+        origin_xs = rng.uniform(-20, 620, 5000)
+        origin_ys = rng.uniform(-20, 420, 5000)
+        angles = rng.uniform(-7, 7, 5000)
+        distances = environment.distance_field().distances
+        for max_length in (100, 37):
+            traced = cast_rays_traced(environment.occupancy, distances, origin_xs, origin_ys, angles, max_length)
+            sampled = cast_rays_occupancy(environment.occupancy, origin_xs, origin_ys, angles, max_length)
+            for traced_values, sampled_values in zip(traced, sampled):
+                np.testing.assert_array_equal(traced_values, sampled_values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,34 @@ class TestDQNAgent(unittest.TestCase):
         action = self.agent.act(self.sample_state)
         self.assertIn(action, range(self.action_size))
 
+    def test_act_epsilon_override(self):
+        # An explicit epsilon replaces the agent's own, for a single state as for a batch
+        state = torch.as_tensor(self.sample_state, dtype=torch.float32).unsqueeze(0)
+        with torch.no_grad():
+            greedy = self.agent.model(state).argmax().item()
+        self.assertEqual(self.agent.epsilon, 1.0)
+        self.assertEqual({self.agent.act(self.sample_state, epsilon=0.0) for _ in range(20)}, {greedy})
+
+        self.agent.epsilon = 0
+        actions = {self.agent.act(self.sample_state, epsilon=1.0) for _ in range(50)}
+        self.assertEqual(actions, set(range(self.action_size)))
+
+    def test_act_batch(self):
+        # A batch of states should get one action per state
+        self.agent.epsilon = 0
+        states = np.random.rand(5, self.state_size)
+        actions = self.agent.act(states)
+        self.assertEqual(actions.shape, (5,))
+        self.assertTrue(all(action in range(self.action_size) for action in actions))
+
+    def test_get_env_epsilons(self):
+        # Per-env epsilons should start at the agent's epsilon and decrease across environments
+        self.agent.epsilon = 0.5
+        epsilons = self.agent.get_env_epsilons(4)
+        self.assertEqual(len(epsilons), 4)
+        self.assertAlmostEqual(epsilons[0], 0.5)
+        self.assertTrue(np.all(np.diff(epsilons) < 0))
+
     def test_replay_insufficient_memory(self):
         # Test that replay doesn't run if there's not enough memory
         self.agent.replay()  # Nothing should happen
@@ -50,6 +78,35 @@ class TestDQNAgent(unittest.TestCase):
             self.agent.remember(self.sample_state, 0, 1.0, self.sample_next_state, False)
         self.agent.replay()  # Should update the model without error
 
+    def test_replay_batch_updates_model(self):
+        # A single batched update should change the model weights
+        self.agent.train_start = self.agent.batch_size
+        for _ in range(self.agent.batch_size):
+            self.agent.remember(self.sample_state, 0, 1.0, self.sample_next_state, False)
+        original_weights = {k: v.clone() for k, v in self.agent.model.state_dict().items()}
+        self.agent.replay()
+        updated_weights = self.agent.model.state_dict()
+        self.assertTrue(any(not torch.equal(original_weights[k], updated_weights[k]) for k in original_weights))
+
+    def test_replay_per_sample(self):
+        # The legacy per-sample path should still run behind the flag
+        agent = DQNAgent(self.state_size, self.action_size, batched_replay=False)
+        agent.train_start = agent.batch_size
+        for _ in range(agent.batch_size):
+            agent.remember(self.sample_state, 1, -1.0, self.sample_next_state, True)
+        agent.replay()
+        self.assertLess(agent.epsilon, 1.0)
+
+    def test_prioritized_replay(self):
+        # Prioritized replay should refresh the priorities of the replayed transitions
+        agent = DQNAgent(self.state_size, self.action_size, prioritized_replay=True)
+        agent.train_start = agent.batch_size
+        for _ in range(agent.batch_size):
+            agent.remember(self.sample_state, 0, 1.0, self.sample_next_state, False)
+        agent.replay()
+        priorities = agent.memory.tree.get(np.arange(agent.batch_size))
+        self.assertFalse(np.allclose(priorities, 1.0))
+
     def test_update_target_model(self):
         # Test that the target model updates
         original_weights = self.agent.target_model.state_dict()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pygame
 from michael_version.environment import Environment
 
@@ -52,6 +53,52 @@ class TestEnvironment(unittest.TestCase):
         self.env.obstacles.append(obstacle)
         self.assertTrue(self.env.is_position_obstacle(x, y))
 
+    def test_are_positions_obstacles(self):
+        xs = np.array([125, 10, 325.9, -0.5, 1300, 949])
+        ys = np.array([125, 10, 349.9, 120, 120, 149])
+        expected = [self.env.is_position_obstacle(x, y) for x, y in zip(xs, ys)]
+        self.assertEqual(self.env.are_positions_obstacles(xs, ys).tolist(), expected)
+        self.assertEqual(expected, [True, False, True, False, False, True])
+
+    def test_obstacle_queries(self):
+        self.assertEqual(self.env.obstacles_in_rect((120, 120, 200, 200)),
+                         [pygame.Rect(100, 100, 50, 50), pygame.Rect(300, 300, 50, 50)])
+        self.assertEqual(self.env.obstacle_at(949, 149), pygame.Rect(900, 100, 50, 50))
+        self.assertIsNone(self.env.obstacle_at(950, 149))
+        self.env.add_obstacle(pygame.Rect(0, 0, 10, 10))
+        self.assertEqual(self.env.obstacle_at(5, 5), pygame.Rect(0, 0, 10, 10))
+
+    def test_dense_obstacles_keep_their_gap(self):
+        env = Environment(600, 600, obstacle_count=300, seed=0, obstacle_size=(5, 15), min_gap=6)
+        self.assertEqual(len(env.obstacles), 300)
+        for i, obstacle in enumerate(env.obstacles):
+            grown = obstacle.inflate(6, 6)
+            self.assertFalse(any(grown.colliderect(other) for other in env.obstacles[i + 1:]))
+
+    def test_occupancy_matches_obstacles(self):
+        # The bitmap should cover exactly the pixels inside the obstacles
+        expected = sum(obstacle.width * obstacle.height for obstacle in self.env.obstacles)
+        self.assertEqual(self.env.occupancy.sum(), expected)
+        self.assertTrue(self.env.occupancy[100, 100])
+        self.assertTrue(self.env.occupancy[149, 149])
+        self.assertFalse(self.env.occupancy[150, 150])
+
+    def test_in_place_edits_update_queries(self):
+        field = self.env.distance_field()
+        self.env.obstacles[0] = pygame.Rect(500, 500, 20, 20)
+        self.assertFalse(self.env.is_position_obstacle(100, 100))
+        self.assertTrue(self.env.is_position_obstacle(510, 510))
+        self.assertEqual(self.env.obstacle_at(510, 510), pygame.Rect(500, 500, 20, 20))
+        self.assertIsNot(self.env.distance_field(), field)
+
+        removed = self.env.obstacles.pop()
+        self.assertIsNone(self.env.obstacle_at(removed.x, removed.y))
+        del self.env.obstacles[:]
+        self.assertFalse(self.env.occupancy.any())
+        self.env.obstacles.extend([pygame.Rect(0, 0, 10, 10)])
+        self.assertTrue(self.env.is_position_obstacle(5, 5))
+        self.assertEqual(self.env.distance_field().distance(5, 5), 0)
+
     def test_obstacle_placement_limit(self):
         # Ensure that the method doesn't run into an infinite loop or hang if obstacles cannot be placed
         env = Environment(self.screen_width, self.screen_height, obstacle_count=5)
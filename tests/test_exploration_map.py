@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from michael_version.exploration_map import ExplorationMap, OBSTACLE, UNKNOWN, VISITED
+
+
+class TestExplorationMap(unittest.TestCase):
+
+    def setUp(self):
+        self.map = ExplorationMap(100, 50, resolution=10)
+
+    def test_grid_shape(self):
+        self.assertEqual(self.map.grid.shape, (5, 10))
+        self.assertEqual(self.map.grid.dtype, np.uint8)
+        self.assertEqual(ExplorationMap(105, 41, 10).grid.shape, (5, 11))
+
+    def test_mark_visited(self):
+        self.assertTrue(self.map.mark_visited(12, 34))
+        self.assertFalse(self.map.mark_visited(19, 30))  # Same cell
+        self.assertTrue(self.map.is_visited(15, 35))
+        self.assertEqual(self.map.grid[3, 1], VISITED)
+        self.assertFalse(self.map.mark_visited(-1, 10))  # Off the map is ignored
+        self.assertFalse(self.map.mark_visited(100, 10))
+
+    def test_obstacle_does_not_clear_visit(self):
+        self.assertTrue(self.map.mark_visited(12, 34))
+        self.map.mark_obstacles([15], [35])
+        self.assertEqual(self.map.get(12, 34), OBSTACLE)
+        self.assertTrue(self.map.is_visited(12, 34))
+        self.assertFalse(self.map.mark_visited(12, 34))
+        self.map.clear()
+        self.assertTrue(self.map.mark_visited(12, 34))
+
+    def test_mark_obstacles(self):
+        self.map.mark_obstacles([5, 55, 200], [5, 25, 5])
+        self.assertEqual(self.map.get(5, 5), OBSTACLE)
+        self.assertEqual(self.map.get(55, 25), OBSTACLE)
+        self.assertEqual(np.count_nonzero(self.map.grid), 2)
+
+    def test_frontiers(self):
+        self.map.mark_visited(0, 0)
+        self.map.mark_obstacles([10], [0])
+        # Right neighbour is an obstacle and the left/top ones are off the map
+        self.assertEqual(self.map.frontiers(), [(0, 10)])
+
+    def test_to_string(self):
+        self.map.mark_visited(0, 0)
+        self.map.mark_obstacles([20], [10])
+        lines = self.map.to_string().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0], '.' + ' ' * 9)
+        self.assertEqual(lines[1], '  #' + ' ' * 7)
+        self.assertEqual(self.map.to_string(crop=True), '.  \n  #\n')
+
+    def test_downsampled(self):
+        self.map.mark_visited(0, 0)
+        self.map.mark_obstacles([10], [10])
+        self.map.mark_visited(95, 45)
+        small = self.map.downsampled(4)
+        self.assertEqual(small.shape, (2, 3))
+        self.assertEqual(small[0, 0], OBSTACLE)  # Obstacles win over visited cells
+        self.assertEqual(small[1, 2], VISITED)
+        self.assertEqual(self.map.to_string(downsample=4), '#  \n  .\n')
+
+    def test_save(self):
+        self.map.mark_visited(0, 0)
+        self.map.mark_obstacles([20], [10])
+        with tempfile.TemporaryDirectory() as directory:
+            text_path = os.path.join(directory, 'map.txt')
+            self.map.save(text_path)
+            with open(text_path) as map_file:
+                self.assertEqual(map_file.read(), self.map.to_string())
+
+            array_path = os.path.join(directory, 'map.npy')
+            self.map.save(array_path, 'npy', downsample=2)
+            np.testing.assert_array_equal(np.load(array_path), self.map.downsampled(2))
+
+            image_path = os.path.join(directory, 'map.png')
+            self.map.save(image_path, 'png')
+            self.assertGreater(os.path.getsize(image_path), 0)
+
+            with self.assertRaises(ValueError):
+                self.map.save(text_path, 'bmp')
+
+    def test_frontier_index_stays_in_sync(self):
+        # The incrementally maintained index must always equal a full rescan
+        exploration_map = ExplorationMap(200, 120, resolution=2)
+        index = exploration_map.track_frontiers(5, 5)
+        rng = np.random.default_rng(1)
+        for step in range(300):
+            x, y = rng.integers(0, 200), rng.integers(0, 120)
+            if step % 3:
+                exploration_map.mark_visited(x, y)
+            else:
+                exploration_map.mark_obstacles(rng.integers(0, 200, 4), rng.integers(0, 120, 4))
+            expected = {(x // 2, y // 2) for x, y in exploration_map.frontiers(5, 5)}
+            self.assertEqual(set(index), expected)
+
+            column, row = rng.uniform(0, 100), rng.uniform(0, 60)
+            nearest = index.nearest(column, row)
+            if not expected:
+                self.assertIsNone(nearest)
+                continue
+            best = min(np.hypot(c - column, r - row) for c, r in expected)
+            self.assertAlmostEqual(np.hypot(nearest[0] - column, nearest[1] - row), best)
+
+        exploration_map.clear()
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.nearest(0, 0))
+
+    def test_clear(self):
+        self.map.mark_visited(0, 0)
+        self.map.clear()
+        self.assertTrue((self.map.grid == UNKNOWN).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
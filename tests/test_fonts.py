@@ -0,0 +1,33 @@
+import unittest
+
+import pygame
+
+from michael_version.fonts import get_font, render_text
+
+
+class TestFonts(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+
+    def test_fonts_and_text_are_cached(self):
+        self.assertIs(get_font(None, 24), get_font(None, 24))
+        self.assertIsNot(get_font(None, 24), get_font(None, 30))
+
+        first = render_text("42", 24, (0, 0, 0))
+        self.assertIs(render_text("42", 24, (0, 0, 0)), first)
+        self.assertIsNot(render_text("43", 24, (0, 0, 0)), first)
+
+    def test_cache_cleared_on_quit(self):
+        font = get_font(None, 24)
+        pygame.quit()
+        self.assertEqual(get_font.cache_info().currsize, 0)
+        self.assertEqual(render_text.cache_info().currsize, 0)
+
+        pygame.init()
+        self.assertIsNot(get_font(None, 24), font)
+        self.assertGreater(render_text("7").get_width(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
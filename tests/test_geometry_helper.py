@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from michael_version.environment import Environment
+from michael_version.geometry_helper import GeometryHelper
+from michael_version.rect import Rect
+
+
+class TestGeometryHelper(unittest.TestCase):
+
+    def setUp(self):
+        self.environment = Environment(400, 300, obstacle_count=0)
+        self.environment.obstacles = [Rect(100, 100, 20, 20), Rect(300, 50, 40, 40)]
+
+    def test_calculate_distances(self):
+        points = [(0, 0), (3, 4)]
+        others = [(0, 0), (6, 8), (3, 0)]
+        distances = GeometryHelper.calculate_distances(points, others)
+        self.assertEqual(distances.shape, (2, 3))
+        for i, point in enumerate(points):
+            for j, other in enumerate(others):
+                self.assertAlmostEqual(distances[i, j], GeometryHelper.calculate_distance(point, other))
+
+    def test_min_distances_to_obstacles(self):
+        rects = [Rect(50, 60, 10, 10), Rect(310, 200, 10, 10)]
+        distances = GeometryHelper.get_min_distances_to_obstacles([rect.center for rect in rects],
+                                                                  self.environment.obstacles)
+        for rect, distance in zip(rects, distances):
+            self.assertAlmostEqual(distance, GeometryHelper.get_min_distance_to_obstacle(rect, self.environment.obstacles))
+        self.assertTrue(np.isinf(GeometryHelper.get_min_distances_to_obstacles([(0, 0)], [])).all())
+
+    def test_min_distances_to_border(self):
+        rects = [Rect(5, 100, 10, 10), Rect(200, 280, 10, 10), Rect(395, 10, 10, 10)]
+        distances = GeometryHelper.get_min_distances_to_border([tuple(rect) for rect in rects], self.environment)
+        expected = [GeometryHelper.get_min_distance_to_border(rect, self.environment) for rect in rects]
+        self.assertEqual(distances.tolist(), expected)
+
+    def test_min_distances_to_maze_obstacle(self):
+        grid = [[0, 1, 0],
+                [0, 0, 1]]
+        rects = [Rect(0, 0, 10, 10), Rect(60, 60, 10, 10)]
+        distances = GeometryHelper.get_min_distances_to_maze_obstacle([rect.center for rect in rects], grid, 40)
+        for rect, distance in zip(rects, distances):
+            self.assertAlmostEqual(distance, GeometryHelper.get_min_distance_to_maze_obstacle(rect, grid, 40))
+
+    def test_distances_to_nearest_obstacle(self):
+        distances = GeometryHelper.get_distances_to_nearest_obstacle([50, 110], [110, 130], self.environment)
+        np.testing.assert_allclose(distances, [50, 11], atol=1e-5)  # Pixels 100-119 are covered
+        self.assertAlmostEqual(GeometryHelper.get_distance_to_nearest_obstacle((50, 110), self.environment), 50,
+                               places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import warnings
+
+import gymnasium as gym
+import numpy as np
+
+from michael_version import gym_env
+from gymnasium.utils.env_checker import check_env
+
+from michael_version.gym_env import VISIT_CELL_SIZE, CarGymEnv, CarVectorEnv
+
+
+class TestCarGymEnv(unittest.TestCase):
+
+    def test_make(self):
+        env = gym.make('CarMaze-v0')
+        obs, info = env.reset(seed=0)
+        self.assertEqual(obs.shape, (26,))
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertTrue(env.observation_space.contains(obs))
+
+        obs, reward, terminated, truncated, info = env.step(env.action_space.sample())
+        self.assertTrue(env.observation_space.contains(obs))
+        self.assertIsInstance(reward, float)
+        self.assertFalse(truncated)
+        env.close()
+
+    def test_observations_in_space(self):
+        env = CarGymEnv('default')
+        env.reset(seed=1)
+        env.action_space.seed(1)
+        for _ in range(300):
+            obs, _, terminated, _, _ = env.step(env.action_space.sample())
+            self.assertTrue(env.observation_space.contains(obs))
+            if terminated:
+                env.reset()
+
+    def test_seeded_reset(self):
+        env = CarGymEnv('default')
+        env.reset(seed=3)
+        obstacles = [tuple(obstacle) for obstacle in env.environment.obstacles]
+        env.reset()
+        env.reset(seed=3)
+        self.assertEqual([tuple(obstacle) for obstacle in env.environment.obstacles], obstacles)
+
+    def test_passes_env_checker(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            check_env(gym.make('CarObstacles-v0').unwrapped)
+        self.assertFalse([w for w in caught if 'infinity' in str(w.message)])
+
+    def test_angle_wrapped(self):
+        env = CarGymEnv('default')
+        env.reset(seed=0)
+        for _ in range(70):
+            obs, _, terminated, _, _ = env.step(1)  # Keep turning left
+            if terminated:
+                break
+        self.assertGreater(env.car.angle, 180)
+        self.assertAlmostEqual(obs[1], (env.car.angle + 180) % 360 - 180, places=4)
+
+    def test_invalid_render_mode(self):
+        with self.assertRaises(ValueError):
+            CarGymEnv(render_mode='rgb_array')
+
+
+class TestCarVectorEnv(unittest.TestCase):
+
+    def test_make_vec(self):
+        if gym_env.AutoresetMode is None:
+            self.skipTest("gymnasium 0.29 has no vector entry points")
+        env = gym.make_vec('CarObstacles-v0', num_envs=3, vectorization_mode='vector_entry_point')
+        self.assertIsInstance(env.unwrapped, CarVectorEnv)
+
+    def test_step(self):
+        env = CarVectorEnv(4, 'maze')
+        obs, _ = env.reset(seed=0)
+        self.assertEqual(obs.shape, (4, 26))
+        self.assertTrue(env.observation_space.contains(obs.astype(np.float32)))
+
+        obs, rewards, terminations, truncations, infos = env.step(env.action_space.sample())
+        self.assertEqual(obs.shape, (4, 26))
+        self.assertEqual(rewards.shape, (4,))
+        self.assertEqual(terminations.shape, (4,))
+        self.assertEqual(truncations.shape, (4,))
+
+    def test_rewards_match_single_env(self):
+        single = gym.make('CarObstacles-v0')
+        if gym_env.AutoresetMode is None:
+            vector = CarVectorEnv(1, 'default')
+        else:
+            vector = gym.make_vec('CarObstacles-v0', num_envs=1, vectorization_mode='vector_entry_point')
+        single.reset(seed=2)
+        vector.reset(seed=2)
+        rng = np.random.default_rng(2)
+        for step in range(300):
+            action = 4 if step % 3 == 0 else int(rng.integers(7))
+            obs, reward, terminated, _, _ = single.step(action)
+            vector_obs, rewards, terminations, _, infos = vector.step(np.array([action]))
+            self.assertAlmostEqual(reward, rewards[0], places=5)
+            self.assertEqual(terminated, terminations[0])
+            if terminated:
+                break
+            np.testing.assert_allclose(obs, vector_obs[0])
+
+    def test_visit_grid_uses_car_sized_cells(self):
+        env = CarVectorEnv(3, 'default')
+        rows, columns = env.simulator.visited.shape[1:]
+        self.assertEqual((rows, columns), (-(-env.environment.screen_height // VISIT_CELL_SIZE),
+                                           -(-env.environment.screen_width // VISIT_CELL_SIZE)))
+
+    def test_autoreset(self):
+        env = CarVectorEnv(2, 'default', max_episode_steps=5)
+        env.reset(seed=0)
+        for _ in range(4):
+            _, _, _, _, infos = env.step(np.zeros(2, dtype=np.int64))
+        obs, _, terminations, truncations, infos = env.step(np.zeros(2, dtype=np.int64))
+
+        ended = terminations | truncations
+        self.assertTrue(ended.all())
+        self.assertTrue(infos[f'_{env.final_obs_key}'].all())
+        self.assertEqual(infos[env.final_obs_key][0].shape, (26,))
+        # Every car is back at the start with a fresh episode
+        np.testing.assert_array_equal(env.simulator.x, env.environment.start_x)
+        np.testing.assert_array_equal(env.step_counts, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pygame
+
+from michael_version.rect import Rect
+
+HEADLESS_SCRIPT = """
+import sys
+from car import Car
+from car_environment import CarEnvironment
+from train_dqn import create_environment
+
+for environment_type in ('default', 'maze'):
+    environment = create_environment(environment_type)
+    car = Car(environment.start_x, environment.start_y, environment)
+    env = CarEnvironment(car, environment, visualize=False)
+    env.reset()
+    for action in range(7):
+        env.step(action)
+print('pygame' in sys.modules)
+"""
+
+
+class TestHeadless(unittest.TestCase):
+
+    def test_training_path_never_imports_pygame(self):
+        source_dir = os.path.join(os.path.dirname(__file__), '..', 'src', 'michael_version')
+        result = subprocess.run([sys.executable, '-c', HEADLESS_SCRIPT], cwd=source_dir, capture_output=True,
+                                text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False')
+
+
+class TestRect(unittest.TestCase):
+
+    def test_matches_pygame_rect(self):
+        for args in [(1, 2, 11, 7), (-5, -5, 11, 7), (2.7, -3.2, 10.6, 9.9)]:
+            rect, expected = Rect(*args), pygame.Rect(*args)
+            self.assertEqual(tuple(rect), tuple(expected))
+            self.assertEqual((rect.right, rect.bottom, rect.center), (expected.right, expected.bottom, expected.center))
+            for dx, dy in [(10, 10), (7, -3), (-7, 3)]:
+                self.assertEqual(tuple(rect.inflate(dx, dy)), tuple(expected.inflate(dx, dy)))
+
+        for position in [(2.5, 3.5), (-2.5, -0.5), (0.49999, 1.5000001)]:
+            rect, expected = Rect(0, 0, 10, 10), pygame.Rect(0, 0, 10, 10)
+            rect.topleft = expected.topleft = position
+            self.assertEqual(rect.topleft, expected.topleft)
+
+    def test_colliderect_matches_pygame(self):
+        base = (10, 10, 20, 20)
+        for other in [(0, 0, 10, 10), (0, 0, 11, 11), (29, 29, 5, 5), (30, 10, 5, 5), (15, 15, 0, 5), (12, 12, 2, 2)]:
+            self.assertEqual(Rect(base).colliderect(Rect(other)), pygame.Rect(base).colliderect(pygame.Rect(other)))
+        self.assertTrue(Rect(base).colliderect(pygame.Rect(12, 12, 2, 2)))
+        self.assertEqual(pygame.Rect(Rect(base)), pygame.Rect(base))
+        self.assertEqual(Rect(base), pygame.Rect(base))
+
+
+if __name__ == "__main__":
+    unittest.main()
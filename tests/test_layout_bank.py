@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from michael_version.environment import Environment
+from michael_version.layout_bank import LayoutBank
+from michael_version.maze_environment import MazeEnvironment
+
+
+class TestLayoutBank(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_obstacle_bank_round_trip(self):
+        bank = LayoutBank.build_obstacles(self.directory.name, 4, 400, 300, obstacle_count=3, seed=10)
+        self.assertEqual(len(bank), 4)
+        self.assertIsInstance(LayoutBank(self.directory.name).obstacles, np.memmap)
+
+        # Layout i is the layout an environment seeded with seed + i generates
+        reference = Environment(400, 300, obstacle_count=3, seed=12)
+        environment = Environment(400, 300, obstacle_count=3, layout_bank=bank)
+        environment.reset(layout_index=2)
+        self.assertEqual(environment.obstacles, reference.obstacles)
+        self.assertEqual((environment.start_x, environment.start_y), (reference.start_x, reference.start_y))
+        np.testing.assert_array_equal(environment.occupancy, reference.occupancy)
+
+    def test_maze_bank_round_trip(self):
+        bank = LayoutBank.build_mazes(self.directory.name, 3, 400, 280, cell_size=40, seed=5)
+        reference = MazeEnvironment(400, 280, 40, seed=6)
+        environment = MazeEnvironment(400, 280, 40, layout_bank=bank)
+        environment.reset(layout_index=1)
+        np.testing.assert_array_equal(environment.grid, reference.grid)
+        self.assertEqual((environment.start_x, environment.start_y), (reference.start_x, reference.start_y))
+
+        # Random resets only ever pick stored layouts
+        for _ in range(10):
+            environment.reset()
+            np.testing.assert_array_equal(environment.grid, bank.grid(environment.layout_index))
+
+    def test_seeded_environments_are_reproducible(self):
+        first, second = Environment(400, 300, 5, seed=3), Environment(400, 300, 5, seed=3)
+        self.assertEqual(first.obstacles, second.obstacles)
+        first.reset()
+        second.reset()
+        self.assertEqual(first.obstacles, second.obstacles)
+
+    def test_mismatched_environment(self):
+        bank = LayoutBank.build_mazes(self.directory.name, 1, 400, 280, cell_size=40)
+        with self.assertRaises(ValueError):
+            MazeEnvironment(400, 280, 20, layout_bank=bank)
+        with self.assertRaises(ValueError):
+            MazeEnvironment(800, 280, 40, layout_bank=bank)
+
+
+if __name__ == "__main__":
+    unittest.main()
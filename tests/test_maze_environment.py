@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pygame
 
 from michael_version.maze_environment import MazeEnvironment
@@ -21,7 +22,7 @@ class TestMazeEnvironment(unittest.TestCase):
 
     def test_generate_maze(self):
         # Ensure the maze was generated with at least one open path from the start
-        open_cells = sum(row.count(0) for row in self.env.grid)
+        open_cells = int((self.env.grid == 0).sum())
         print(f"Open cells: {open_cells}")
         self.assertGreater(open_cells, 1)  # More than one cell should be open
 
@@ -53,6 +54,18 @@ class TestMazeEnvironment(unittest.TestCase):
         x, y = 5, 5  # Inside the first cell, which is now a path
         self.assertFalse(self.env.is_position_obstacle(x, y))
 
+    def test_are_positions_obstacles(self):
+        self.env.grid = np.array([[0, 0, 1],
+                                  [0, 1, 0]], dtype=np.int8)
+        xs = np.array([20, 90, 50, 119, -1, 20, 130])
+        ys = np.array([20, 10, 50, 79, 20, 85, 10])
+        expected = [self.env.is_position_obstacle(x, y) for x, y in zip(xs, ys)]
+        self.assertEqual(self.env.are_positions_obstacles(xs, ys).tolist(), expected)
+        self.assertEqual(expected, [False, True, True, False, True, True, True])
+        # Float coordinates are floored into cells, so -0.5 is off the grid
+        self.assertEqual(self.env.are_positions_obstacles([-0.5, 0.5, 79.9], [0.5, 0.5, 79.9]).tolist(),
+                         [True, False, True])
+
     def test_draw(self):
         # Test the drawing method
         screen = pygame.Surface((self.screen_width, self.screen_height))
@@ -66,6 +79,20 @@ class TestMazeEnvironment(unittest.TestCase):
         self.env.draw(screen)
         self.assertEqual(screen.get_at((1, 1)), pygame.Color(0, 0, 0))  # Check that the top-left corner is black
 
+    def test_draw_matches_cell_rects(self):
+        # The scaled blit must colour exactly the wall cells, as one rect per wall would
+        env = MazeEnvironment(250, 170, 20, seed=1)
+        screen = pygame.Surface((env.screen_width, env.screen_height))
+        env.draw(screen)
+
+        expected = pygame.Surface((env.screen_width, env.screen_height))
+        expected.fill((255, 255, 255))
+        for y in range(env.rows):
+            for x in range(env.columns):
+                if env.grid[y, x] == 1:
+                    pygame.draw.rect(expected, (0, 0, 0), pygame.Rect(x * 20, y * 20, 20, 20))
+        self.assertTrue((pygame.surfarray.array3d(screen) == pygame.surfarray.array3d(expected)).all())
+
 
 if __name__ == "__main__":
     unittest.main()
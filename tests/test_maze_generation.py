@@ -0,0 +1,65 @@
+import random
+import time
+import unittest
+from collections import deque
+
+import numpy as np
+
+from michael_version.maze_generation import MAZE_ALGORITHMS, generate_maze
+
+
+def reachable_cells(grid):
+    # Flood fill the open cells from the top-left room
+    rows, columns = grid.shape
+    seen = np.zeros(grid.shape, dtype=bool)
+    seen[0, 0] = True
+    queue = deque([(0, 0)])
+    while queue:
+        y, x = queue.popleft()
+        for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+            if 0 <= ny < rows and 0 <= nx < columns and not seen[ny, nx] and grid[ny, nx] == 0:
+                seen[ny, nx] = True
+                queue.append((ny, nx))
+    return int(seen.sum())
+
+
+class TestMazeGeneration(unittest.TestCase):
+
+    def test_algorithms_generate_perfect_mazes(self):
+        for algorithm in MAZE_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                grid = generate_maze(31, 20, algorithm, random.Random(3))
+                self.assertEqual(grid.shape, (20, 31))
+                self.assertEqual(grid.dtype, np.int8)
+
+                # A spanning tree over the rooms: every room open, one passage fewer than rooms
+                rooms = 16 * 10
+                self.assertTrue((grid[0::2, 0::2] == 0).all())
+                self.assertEqual(int((grid == 0).sum()), 2 * rooms - 1)
+                self.assertEqual(reachable_cells(grid), 2 * rooms - 1)
+
+    def test_seeded_generation_is_reproducible(self):
+        for algorithm in MAZE_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                first = generate_maze(25, 25, algorithm, random.Random(7))
+                second = generate_maze(25, 25, algorithm, random.Random(7))
+                np.testing.assert_array_equal(first, second)
+
+    def test_large_maze_under_a_second(self):
+        # wilson's sequential random walks are the documented exception to the target
+        for algorithm in ('backtracker', 'prim', 'kruskal'):
+            with self.subTest(algorithm=algorithm):
+                start = time.perf_counter()
+                grid = generate_maze(1000, 1000, algorithm, random.Random(0))
+                elapsed = time.perf_counter() - start
+                self.assertEqual(grid.shape, (1000, 1000))
+                self.assertEqual(int((grid == 0).sum()), 2 * 500 * 500 - 1)
+                self.assertLess(elapsed, 1.0)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            generate_maze(10, 10, 'eller')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import functools
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import torch
+
+from michael_version.car import Car
+from michael_version.dqn_agent import DQN
+from michael_version.environment import Environment
+from michael_version.parallel_rollout import SharedTransitionQueue, SharedWeights, rollout_worker
+from michael_version.replay_buffer import ReplayBuffer
+
+PARALLEL_TRAINING_SCRIPT = """
+import parallel_rollout
+import train_dqn
+
+drained, published = [], []
+drain, publish = parallel_rollout.SharedTransitionQueue.drain, parallel_rollout.SharedWeights.publish
+parallel_rollout.SharedTransitionQueue.drain = lambda self, buffer: drained.append(drain(self, buffer)) or drained[-1]
+parallel_rollout.SharedWeights.publish = lambda self, model, epsilon: published.append(publish(self, model, epsilon))
+
+train_dqn.train_dqn_parallel(2, num_workers=1, queue_capacity=256, sync_interval=1)
+print(sum(drained), len(published))
+"""
+
+
+def greedy_model(state_size, action, action_size=7):
+    """A DQN whose every output is its last bias, so it always picks action."""
+    model = DQN(state_size, action_size)
+    with torch.no_grad():
+        for parameter in model.parameters():
+            parameter.zero_()
+        model.fc3.bias[action] = 1.0
+    return model
+
+
+class TestSharedTransitionQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = multiprocessing.get_context('spawn')
+        self.queue = SharedTransitionQueue(capacity=4, state_size=3, ctx=self.ctx)
+        self.buffer = ReplayBuffer(capacity=10, state_size=3)
+
+    def test_put_and_drain(self):
+        for i in range(3):
+            self.assertTrue(self.queue.put(np.full(3, i), i, float(i), np.full(3, i + 1), i == 2))
+        self.assertEqual(self.queue.drain(self.buffer), 3)
+        self.assertEqual(len(self.buffer), 3)
+        state, action, reward, next_state, done = self.buffer[2]
+        self.assertTrue(np.array_equal(state, np.full(3, 2)))
+        self.assertEqual(action, 2)
+        self.assertTrue(done)
+
+        # Nothing new to read
+        self.assertEqual(self.queue.drain(self.buffer), 0)
+
+    def test_put_refuses_when_full(self):
+        for i in range(4):
+            self.assertTrue(self.queue.put(np.zeros(3), 0, 0.0, np.zeros(3), False))
+        self.assertFalse(self.queue.put(np.zeros(3), 0, 0.0, np.zeros(3), False))
+
+        # Draining frees the ring, including across the wrap-around
+        self.queue.drain(self.buffer)
+        self.assertTrue(self.queue.put(np.ones(3), 1, 1.0, np.ones(3), False))
+        self.assertEqual(self.queue.drain(self.buffer), 1)
+        self.assertEqual(self.buffer[-1][1], 1)
+
+
+class TestSharedWeights(unittest.TestCase):
+
+    def test_publish_and_pull(self):
+        ctx = multiprocessing.get_context('spawn')
+        learner = DQN(4, 2)
+        worker = DQN(4, 2)
+        shared_weights = SharedWeights(learner, ctx)
+        shared_weights.publish(learner, 0.5)
+
+        version, epsilon = shared_weights.pull(worker, -1)
+        self.assertEqual(version, 1)
+        self.assertEqual(epsilon, 0.5)
+        for learner_parameter, worker_parameter in zip(learner.parameters(), worker.parameters()):
+            self.assertTrue(torch.equal(learner_parameter, worker_parameter))
+
+
+class TestRolloutWorker(unittest.TestCase):
+
+    def test_worker_streams_transitions_and_follows_published_weights(self):
+        environment_factory = functools.partial(Environment, 300, 200, obstacle_count=0)
+        environment = environment_factory()
+        state_size = len(Car(environment.start_x, environment.start_y, environment).get_state())
+
+        ctx = multiprocessing.get_context('spawn')
+        transition_queue = SharedTransitionQueue(256, state_size, ctx)
+        shared_weights = SharedWeights(greedy_model(state_size, 2), ctx)
+        shared_weights.publish(greedy_model(state_size, 2), 0.0)
+        stop_event = ctx.Event()
+        episode_queue = ctx.Queue()
+        worker = ctx.Process(target=rollout_worker,
+                             args=(0, environment_factory, transition_queue, shared_weights, 1.0, stop_event,
+                                   episode_queue, 0),
+                             kwargs={'max_steps': 50, 'sync_steps': 5}, daemon=True)
+        worker.start()
+
+        def collect(buffer, until, timeout=60):
+            deadline = time.monotonic() + timeout
+            while not until() and time.monotonic() < deadline and worker.is_alive():
+                transition_queue.drain(buffer)
+                time.sleep(0.01)
+            self.assertTrue(until(), "worker stopped streaming transitions")
+
+        try:
+            # With epsilon at 0 the worker acts greedily on whatever weights it last pulled
+            first = ReplayBuffer(capacity=10_000, state_size=state_size)
+            collect(first, lambda: len(first) >= 20)
+            np.testing.assert_array_equal(first.actions[:len(first)], 2)
+
+            shared_weights.publish(greedy_model(state_size, 5), 0.0)
+            second = ReplayBuffer(capacity=10_000, state_size=state_size)
+            collect(second, lambda: np.sum(second.actions[:len(second)] == 5) >= 20)
+            # Only the steps before the worker's next sync still use the old weights
+            actions = second.actions[:len(second)]
+            np.testing.assert_array_equal(actions[np.argmax(actions == 5):], 5)
+        finally:
+            stop_event.set()
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+
+class TestTrainDqnParallel(unittest.TestCase):
+
+    def test_learner_receives_transitions_and_publishes_weights(self):
+        source_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'michael_version'))
+        env = dict(os.environ, PYTHONPATH=source_dir)
+        # Models are saved under the working directory, so run in a scratch one
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run([sys.executable, '-c', PARALLEL_TRAINING_SCRIPT], cwd=directory, env=env,
+                                    capture_output=True, text=True, check=True, timeout=120)
+        transitions, publishes = map(int, result.stdout.split())
+        self.assertGreater(transitions, 0)
+        # The initial publish plus at least one after training updates
+        self.assertGreater(publishes, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
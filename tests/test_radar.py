@@ -0,0 +1,101 @@
+import math
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pygame
+
+from michael_version.environment import Environment
+from michael_version.maze_environment import MazeEnvironment
+from michael_version.radar import RADAR_DEGREES, cast_radar, cast_rays_grid, cast_rays_probe
+
+
+def legacy_radar(environment, x0, y0, heading, degree):
+    """The original per-pixel beam march from Car.check_radar."""
+    radar_length = 0
+    x, y = x0, y0
+    angle_rad = math.radians(heading + degree)
+    while radar_length < 100:
+        radar_length += 1
+        x = int(x0 + math.cos(angle_rad) * radar_length)
+        y = int(y0 + math.sin(angle_rad) * radar_length)
+        if x < 0 or y < 0 or x >= environment.screen_width or y >= environment.screen_height:
+            break
+        if environment.is_position_obstacle(x, y):
+            break
+    return (x, y), int(math.sqrt((x - x0) ** 2 + (y - y0) ** 2))
+
+
+class TestRadar(unittest.TestCase):
+
+    def setUp(self):
+        self.env = Environment(1200, 800, obstacle_count=0)
+        self.env.obstacles = [pygame.Rect(650, 380, 40, 40), pygame.Rect(540, 300, 30, 200)]
+
+    def assert_matches_legacy(self, environment, x0, y0, heading):
+        xs, ys, distances = cast_radar(environment, x0, y0, heading)
+        self.assertEqual(len(distances), len(RADAR_DEGREES))
+        for i, degree in enumerate(RADAR_DEGREES):
+            self.assertEqual(((xs[i], ys[i]), distances[i]), legacy_radar(environment, x0, y0, heading, degree))
+
+    def test_occupancy_matches_per_pixel_march(self):
+        for heading in (0, 3, -42, 90, 187):
+            self.assert_matches_legacy(self.env, 600, 400, heading)
+        # Beams leaving the screen
+        self.assert_matches_legacy(self.env, 20, 780, 33)
+
+    def test_probe_fallback_matches_occupancy(self):
+        # An environment without an occupancy array is probed point by point
+        mock_environment = MagicMock()
+        mock_environment.screen_width = 1200
+        mock_environment.screen_height = 800
+        mock_environment.is_position_obstacle = self.env.is_position_obstacle
+        expected = cast_radar(self.env, 600, 400, 12)
+        actual = cast_radar(mock_environment, 600, 400, 12)
+        for expected_values, actual_values in zip(expected, actual):
+            self.assertTrue(np.array_equal(expected_values, actual_values))
+
+    def test_grid_traversal_hits_walls(self):
+        maze = MazeEnvironment(120, 80, 40)
+        maze.grid = [[0, 0, 1],
+                     [0, 0, 0]]
+        # Straight right from the middle of cell (0, 0) into the wall at x = 80
+        xs, ys, distances = cast_radar(maze, 20, 20, 0, degrees=[0])
+        self.assertEqual((xs[0], ys[0], distances[0]), (80, 20, 60))
+        # Straight down leaves the screen at y = 80
+        xs, ys, distances = cast_radar(maze, 20, 20, 90, degrees=[0])
+        self.assertEqual((xs[0], ys[0], distances[0]), (20, 80, 60))
+        # Straight left leaves the screen once the sample reaches x = -1
+        xs, ys, distances = cast_radar(maze, 20, 60, 180, degrees=[0])
+        self.assertEqual((xs[0], ys[0], distances[0]), (-1, 60, 21))
+
+    def test_grid_traversal_skips_corner_clips(self):
+        maze = MazeEnvironment(240, 160, 40)
+        maze.grid = np.array([[0, 1, 0, 0, 0, 1],
+                              [0, 1, 0, 1, 0, 1],
+                              [0, 0, 0, 1, 0, 1],
+                              [1, 1, 1, 1, 1, 1]], dtype=np.int8)
+        # The beam grazes the corner of the wall at (40, 80) between two samples and carries on
+        for heading, x0, y0 in ((63, 28, 56), (318, 114, 46), (93, 122, 2)):
+            self.assert_matches_legacy(maze, x0, y0, heading)
+
+    def test_grid_traversal_matches_per_pixel_march(self):
+        rng = np.random.default_rng(0)
+        for seed, cell_size, width, height in ((0, 5, 203, 97), (1, 13, 400, 300), (2, 40, 810, 590)):
+            maze = MazeEnvironment(width, height, cell_size, seed=seed)
+            walls = np.asarray(maze.grid) == 1
+            origin_xs = rng.uniform(-3, width + 3, 1000)
+            origin_ys = rng.uniform(-3, height + 3, 1000)
+            # Whole-pixel origins and axis-aligned beams start and run along cell boundaries
+            origin_xs[::2], origin_ys[::3] = np.round(origin_xs[::2]), np.round(origin_ys[::3])
+            angles = np.radians(np.where(rng.random(1000) < 0.3, rng.choice(RADAR_DEGREES, 1000),
+                                         rng.uniform(0, 360, 1000)))
+            for max_length in (100, 37):
+                traversed = cast_rays_grid(walls, cell_size, width, height, origin_xs, origin_ys, angles, max_length)
+                marched = cast_rays_probe(maze, origin_xs, origin_ys, angles, max_length)
+                for traversed_values, marched_values in zip(traversed, marched):
+                    np.testing.assert_array_equal(traversed_values, marched_values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import MagicMock
+
+import pygame
+
+from michael_version.renderer import ThrottledRenderer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestThrottledRenderer(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.env = MagicMock()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_renders_at_target_fps(self):
+        renderer = ThrottledRenderer(self.env, fps=10, clock=self.clock)
+        for _ in range(100):  # 100 steps spread over one second
+            self.assertTrue(renderer.tick())
+            self.clock.now += 0.01
+        # The first step plus one frame per elapsed 0.1 s
+        self.assertEqual(self.env.render.call_count, 10)
+        self.assertEqual(renderer.frames_rendered, 10)
+
+    def test_renders_every_n_steps(self):
+        renderer = ThrottledRenderer(self.env, fps=None, every_steps=25, clock=self.clock)
+        for _ in range(101):
+            renderer.tick()
+        self.assertEqual(self.env.render.call_count, 5)
+
+    def test_window_closed(self):
+        renderer = ThrottledRenderer(self.env, fps=10, clock=self.clock)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        self.assertFalse(renderer.tick())
+        self.env.render.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
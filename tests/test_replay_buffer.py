@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import torch
+
+from michael_version.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+
+
+class TestReplayBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.state_size = 4
+        self.buffer = ReplayBuffer(capacity=5, state_size=self.state_size)
+
+    def add_transitions(self, count):
+        for i in range(count):
+            state = np.full(self.state_size, i, dtype=np.float32)
+            self.buffer.append(state, i % 2, float(i), state + 1, i % 3 == 0)
+
+    def test_append_and_index(self):
+        self.add_transitions(3)
+        self.assertEqual(len(self.buffer), 3)
+        state, action, reward, next_state, done = self.buffer[1]
+        self.assertTrue(np.array_equal(state, np.full(self.state_size, 1)))
+        self.assertEqual(action, 1)
+        self.assertEqual(reward, 1.0)
+        self.assertTrue(np.array_equal(next_state, np.full(self.state_size, 2)))
+        self.assertFalse(done)
+
+    def test_wraps_around_when_full(self):
+        # Oldest transitions should be overwritten and the size should stay at capacity
+        self.add_transitions(8)
+        self.assertEqual(len(self.buffer), 5)
+        self.assertEqual(self.buffer[0][2], 3.0)
+        self.assertEqual(self.buffer[-1][2], 7.0)
+
+    def test_sample_returns_tensors(self):
+        self.add_transitions(5)
+        states, actions, rewards, next_states, dones = self.buffer.sample(16)
+        self.assertEqual(states.shape, (16, self.state_size))
+        self.assertEqual(states.dtype, torch.float32)
+        self.assertEqual(actions.dtype, torch.int64)
+        self.assertEqual(rewards.shape, (16,))
+        self.assertEqual(next_states.shape, (16, self.state_size))
+        self.assertEqual(dones.shape, (16,))
+        self.assertTrue(torch.equal(next_states, states + 1))
+
+
+class TestSumTree(unittest.TestCase):
+
+    def test_total_and_find(self):
+        tree = SumTree(5)
+        tree.update(np.arange(5), np.array([1.0, 2.0, 3.0, 4.0, 0.0]))
+        self.assertAlmostEqual(tree.total(), 10.0)
+        # Cumulative ranges are [0, 1], (1, 3], (3, 6], (6, 10]
+        self.assertEqual(tree.find([0.5, 1.5, 3.5, 6.5, 10.0]).tolist(), [0, 1, 2, 3, 3])
+
+    def test_set_single_leaf(self):
+        tree = SumTree(4)
+        tree.set(2, 5.0)
+        tree.set(2, 1.5)
+        self.assertAlmostEqual(tree.total(), 1.5)
+        self.assertEqual(tree.get([2])[0], 1.5)
+
+
+class TestPrioritizedReplayBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = PrioritizedReplayBuffer(capacity=8, state_size=2, beta=0.5)
+        for i in range(8):
+            self.buffer.append(np.full(2, i, dtype=np.float32), 0, float(i), np.zeros(2), False)
+
+    def test_sample_returns_indices_and_weights(self):
+        states, actions, rewards, next_states, dones, indices, weights = self.buffer.sample(4)
+        self.assertEqual(states.shape, (4, 2))
+        self.assertEqual(len(indices), 4)
+        self.assertEqual(weights.shape, (4,))
+        self.assertAlmostEqual(weights.max().item(), 1.0)
+
+    def test_high_priority_transitions_dominate(self):
+        td_errors = np.zeros(8)
+        td_errors[3] = 100.0
+        self.buffer.update_priorities(np.arange(8), td_errors)
+        indices = self.buffer.sample_indices(64)
+        self.assertGreater(np.mean(indices == 3), 0.9)
+
+    def test_priorities_refresh_from_td_errors(self):
+        self.buffer.update_priorities(np.array([1]), np.array([-2.0]))
+        expected = (2.0 + self.buffer.priority_epsilon) ** self.buffer.alpha
+        self.assertAlmostEqual(self.buffer.tree.get([1])[0], expected)
+
+    def test_mostly_empty_priorities_give_finite_weights(self):
+        buffer = PrioritizedReplayBuffer(capacity=64, state_size=2, priority_epsilon=0.0)
+        for i in range(4):
+            buffer.append(np.full(2, i, dtype=np.float32), 0, float(i), np.zeros(2), False)
+        # Only the first slot keeps any priority; the last filled slot is the clamp target
+        buffer.update_priorities(np.arange(1, 4), np.zeros(3))
+        draws = [np.full(8, 1.5)]  # The first draw overshoots the total, as floating point drift can
+        real_rand = np.random.rand
+        with mock.patch.object(np.random, "rand", side_effect=lambda n: draws.pop() if draws else real_rand(n)):
+            *_, indices, weights = buffer.sample(8)
+        np.testing.assert_array_equal(indices, 0)
+        self.assertTrue(torch.isfinite(weights).all())
+
+        buffer.update_priorities(np.arange(4), np.zeros(4))
+        *_, indices, weights = buffer.sample(8)
+        self.assertTrue(torch.isfinite(weights).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
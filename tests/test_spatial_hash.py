@@ -0,0 +1,51 @@
+import random
+import unittest
+
+import pygame
+
+from michael_version.spatial_hash import SpatialHash
+
+
+class TestSpatialHash(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.rects = [pygame.Rect(rng.randrange(-50, 1000), rng.randrange(-50, 800), rng.randrange(1, 150),
+                                  rng.randrange(1, 150)) for _ in range(300)]
+        self.index = SpatialHash(cell_size=64)
+        for rect in self.rects:
+            self.index.insert(rect)
+
+    def test_query_rect_matches_colliderect(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            query = pygame.Rect(rng.randrange(-100, 1000), rng.randrange(-100, 800), rng.randrange(0, 200),
+                                rng.randrange(0, 200))
+            expected = [rect for rect in self.rects if rect.colliderect(query)]
+            self.assertEqual(self.index.query_rect(query), expected)
+            self.assertEqual(self.index.overlaps(query), bool(expected))
+
+    def test_query_point_matches_collidepoint(self):
+        rng = random.Random(2)
+        for _ in range(200):
+            x, y = rng.randrange(-60, 1000), rng.randrange(-60, 800)
+            self.assertEqual(self.index.query_point(x, y), [rect for rect in self.rects if rect.collidepoint(x, y)])
+
+    def test_touching_and_empty_rects(self):
+        index = SpatialHash(cell_size=10)
+        index.insert((0, 0, 10, 10), 'a')
+        index.insert((5, 5, 0, 4), 'empty')
+        self.assertFalse(index.overlaps((10, 0, 5, 5)))  # Sharing an edge is not an overlap
+        self.assertEqual(index.query_rect((9, 9, 5, 5)), ['a'])
+        self.assertEqual(index.query_point(5, 5), ['a'])
+        self.assertEqual(len(index), 2)
+        index.clear()
+        self.assertEqual(index.query_point(5, 5), [])
+
+    def test_invalid_cell_size(self):
+        with self.assertRaises(ValueError):
+            SpatialHash(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
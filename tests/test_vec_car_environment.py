@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from michael_version.environment import Environment
+from michael_version.vec_car_environment import VecCarEnvironment
+
+
+class TestVecCarEnvironment(unittest.TestCase):
+
+    def setUp(self):
+        self.num_envs = 3
+        self.vec_env = VecCarEnvironment(lambda: Environment(1200, 800, obstacle_count=5), self.num_envs, max_steps=2)
+
+    def test_reset_returns_stacked_states(self):
+        states = self.vec_env.reset()
+        self.assertEqual(states.shape, (self.num_envs, self.vec_env.state_size))
+        self.assertEqual(states.dtype, np.float32)
+
+    def test_step_returns_stacked_arrays(self):
+        self.vec_env.reset()
+        states, rewards, dones = self.vec_env.step(np.full(self.num_envs, 4))
+        self.assertEqual(states.shape, (self.num_envs, self.vec_env.state_size))
+        self.assertEqual(rewards.shape, (self.num_envs,))
+        self.assertEqual(dones.shape, (self.num_envs,))
+
+    def test_auto_reset_after_max_steps(self):
+        # Every member should be reset once it reaches max_steps
+        self.vec_env.reset()
+        self.vec_env.step(np.full(self.num_envs, 4))
+        states, _, _ = self.vec_env.step(np.full(self.num_envs, 4))
+        self.assertTrue(self.vec_env.ended.all())
+        self.assertEqual(len(self.vec_env.finished_episodes), self.num_envs)
+        self.assertTrue(np.all(self.vec_env.step_counts == 0))
+
+        # Replay should see the terminal states, not the states of the next episode
+        next_states = self.vec_env.get_next_states(states)
+        self.assertTrue(np.array_equal(next_states, self.vec_env.final_states))
+
+
+if __name__ == "__main__":
+    unittest.main()